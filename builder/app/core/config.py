@@ -15,3 +15,6 @@ class Config:
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY")
     MODEL_NAME: str = os.getenv("MODEL_NAME")
     MODEL_PROVIDER: str = os.getenv("MODEL_PROVIDER")
+
+    # Bytes read of a scraped page at most; the rest of larger pages is never downloaded
+    SCRAPER_MAX_PAGE_BYTES: int = int(os.getenv("SCRAPER_MAX_PAGE_BYTES", "2000000"))
@@ -44,6 +44,8 @@ class PageScrapedData(BaseModel):
                               description="A list of all scraped hyperlinks found on the page.")
     images: list[Image] = Field(default_factory=list,
                                 description="A list of all scraped images found on the page.")
+    truncated: bool = Field(False, description="Whether the page was larger than the maximum page size, "
+                                               "only its beginning being scraped.")
 
     # Pydantic configuration to ignore extra fields if any
     class Config:
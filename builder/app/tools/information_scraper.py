@@ -1,3 +1,4 @@
+import codecs
 import time
 from typing import Set, List, Optional
 from urllib.parse import urljoin, urlparse, urlunparse
@@ -8,6 +9,7 @@ from langchain.tools import tool
 from loguru import logger
 from pydantic import ValidationError
 
+from app.core import Config
 from app.schemas import PageScrapedData, InformationScraperInput, InformationScraperOutput
 
 
@@ -18,6 +20,7 @@ class WebsiteScraper:
     Attributes:
         start_url (str): The initial URL to begin the crawl.
         limit (int): The maximum number of pages to scrape.
+        max_page_bytes (int): The maximum number of bytes read of a page.
         base_netloc (str): The domain name (netloc) of the start_url, used
                            to ensure the crawler stays on the same site.
         urls_to_visit (List[str]): A queue of URLs to be scraped.
@@ -26,16 +29,19 @@ class WebsiteScraper:
                                                   data from all scraped pages.
     """
 
-    def __init__(self, start_url: str, limit: int = 10):
+    def __init__(self, start_url: str, limit: int = 10, max_page_bytes: int = Config.SCRAPER_MAX_PAGE_BYTES):
         """
         Initializes the WebsiteScraper.
 
         Args:
             start_url: The URL to begin crawling.
             limit: The total number of pages to scrape.
+            max_page_bytes: The maximum number of bytes read of a page; the
+                            rest of larger pages is never downloaded.
         """
         self.start_url = self.normalize_url(start_url)
         self.limit = limit
+        self.max_page_bytes = max_page_bytes
 
         # Get the "netloc" (e.g., 'books.toscrape.com') to stay on the same site
         try:
@@ -89,11 +95,49 @@ class WebsiteScraper:
             logger.error(f"Could not normalize URL '{url}': {e}")
             return url  # Return original URL on unexpected error
 
+    @staticmethod
+    def read_text(response: requests.Response, max_bytes: int) -> tuple[str, bool]:
+        """Reads the body of a streamed response as text, up to a number of bytes.
+
+        The body is decoded as it arrives, with the charset of the
+        Content-Type header or UTF-8, so a page cut in the middle of a
+        multibyte character still decodes.
+
+        Args:
+            response: A response requested with `stream=True`.
+            max_bytes: The maximum number of bytes to read.
+
+        Returns:
+            The text read, and whether the body was cut at `max_bytes`.
+        """
+        # Without a declared charset, requests assumes ISO-8859-1 for text, while pages are nearly always UTF-8
+        encoding = response.encoding if 'charset' in response.headers.get('Content-Type', '').lower() else 'utf-8'
+        try:
+            decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+        except LookupError:
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+        chunks = []
+        bytes_read = 0
+        truncated = False
+        for chunk in response.iter_content(chunk_size=65536):
+            if bytes_read + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - bytes_read]
+                truncated = True
+            bytes_read += len(chunk)
+            chunks.append(decoder.decode(chunk))
+            if truncated:
+                break
+        chunks.append(decoder.decode(b'', final=True))
+        return ''.join(chunks), truncated
+
     def scrape_page_data(self, url: str) -> Optional[PageScrapedData]:
         """Scrapes a single page and returns validated Pydantic model.
 
         Fetches the HTML for the given URL, parses it, extracts data,
-        and validates it against the PageData schema.
+        and validates it against the PageData schema. The Content-Type
+        header is checked before the body is downloaded, and only the first
+        `max_page_bytes` of a page are read.
 
         Args:
             url: The URL of the page to scrape.
@@ -109,11 +153,19 @@ class WebsiteScraper:
 
         # --- Step 1: Fetch the Page ---
         try:
-            # Make the HTTP GET request with a 10-second timeout
-            response = requests.get(url, headers=headers, timeout=10)
+            # Make the HTTP GET request with a 10-second timeout, streamed to read the headers first
+            with requests.get(url, headers=headers, timeout=10, stream=True) as response:
+                # Raise an HTTPError for bad responses (4xx or 5xx)
+                response.raise_for_status()
+
+                # Skip images, PDFs, videos... without downloading them
+                if 'text/html' not in response.headers.get('Content-Type', ''):
+                    logger.info(f"Skipping non-HTML content at {url}")
+                    return None
 
-            # Raise an HTTPError for bad responses (4xx or 5xx)
-            response.raise_for_status()
+                html, truncated = self.read_text(response, self.max_page_bytes)
+                if truncated:
+                    logger.warning(f"Page {url} is larger than {self.max_page_bytes} bytes, only its beginning is scraped.")
 
         # --- Robust Error Handling for Requests ---
         except requests.exceptions.HTTPError as e:
@@ -133,7 +185,7 @@ class WebsiteScraper:
         # --- Step 2: Parse the HTML ---
         try:
             # Parse the HTML content
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
 
             # Initialize a plain dictionary to hold raw data
             page_dict_data = {}
@@ -142,6 +194,7 @@ class WebsiteScraper:
 
             # Get URL (from the input arg, as it's the reliable source)
             page_dict_data["url"] = url
+            page_dict_data["truncated"] = truncated
 
             # Get Title
             page_dict_data["title"] = soup.title.string.strip() if soup.title and soup.title.string else None
@@ -1,14 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app import crud, models, schemas
 from app.agents import create_compiled_state_graph
 from app.api import api_router
-from app.core import Config, Base, engine, get_db
+from app.core import Config, Base, engine, get_db, init_db
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    yield
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(api_router)
 
 if Config.DEBUG:
@@ -1 +1 @@
-from app.agents.workflow import create_compiled_state_graph
+from app.agents.workflow import create_compiled_state_graph, create_compiled_batch_graph
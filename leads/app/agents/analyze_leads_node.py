@@ -1,6 +1,7 @@
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableParallel, RunnableLambda
+from langgraph.config import get_stream_writer
 from loguru import logger
 
 from app.core import Config
@@ -8,9 +9,11 @@ from app.schemas import (
     ContactScraperInput, ContactScraperOutput,
     VisualAnalysisInput, VisualAnalysisOutput
 )
+from app.schemas.batch import BatchState
 from app.schemas.lead import Lead
 from app.schemas.state import State
 from app.tools import contact_scraper, visual_analysis
+from app.tools.crawl_engine import get_crawl_engine
 
 # --- Constants and Configuration ---
 
@@ -56,7 +59,11 @@ def get_contact_info(lead: Lead) -> ContactScraperOutput:
         # Prepare and invoke the contact scraper tool.
         scraper_input = ContactScraperInput(url=lead.website).model_dump()
         result = contact_scraper.invoke(scraper_input)
-        logger.debug(f"Successfully scraped contact info for {lead.name}.")
+        # The crawl deadline bounds this, so slow leads do not hold the batch up for longer
+        logger.info(
+            f"Scraped contact info for {lead.name} in {result.crawl_seconds:.2f}s"
+            f"{' (deadline reached, partial results)' if result.deadline_reached else ''}."
+        )
         return result
     except Exception:
         # Log any exception during the scraping process and return a default
@@ -174,6 +181,38 @@ def analyze_lead(lead: Lead) -> Lead:
         return lead.model_copy()
 
 
+def _analyze_leads(leads: list[Lead]) -> list[Lead]:
+    """
+    Runs `analyze_lead` on a list of leads in parallel.
+
+    Every lead is emitted as a `lead_analyzed` event as soon as its analysis
+    finishes, when the graph is run with `stream_mode="custom"`. The fetch
+    metrics of the crawl engine shared by the contact scrapers are logged
+    for the batch.
+
+    Args:
+        leads: The leads to analyze.
+
+    Returns:
+        The analyzed leads, in the same order.
+    """
+    # Create a runnable lambda to apply the `analyze_lead` function.
+    runnable = RunnableLambda(analyze_lead)
+
+    # Execute the analysis for all leads in a batch.
+    # `.batch_as_completed()` processes the list in parallel like `.batch()`,
+    # but hands back each lead as soon as it is done.
+    writer = get_stream_writer()
+    fetch_metrics = get_crawl_engine().metrics
+    fetch_metrics_before = fetch_metrics.snapshot()
+    batch_results: list[Lead] = list(leads)
+    for index, analyzed_lead in runnable.batch_as_completed(leads):
+        batch_results[index] = analyzed_lead
+        writer({"event": "lead_analyzed", "lead": analyzed_lead})
+    logger.info("Contact scraping fetches for {} leads: {}", len(leads), fetch_metrics.since(fetch_metrics_before))
+    return batch_results
+
+
 # --- Main Node Function ---
 
 def analyze_leads_node(state: State) -> State:
@@ -182,7 +221,9 @@ def analyze_leads_node(state: State) -> State:
 
     This node takes a list of leads from the current state, runs the `analyze_lead`
     function on each of them in a batch, and updates the state with the
-    enriched lead information.
+    enriched lead information. When the graph is run with `stream_mode="custom"`,
+    every lead is emitted as a `lead_analyzed` event as soon as its analysis
+    finishes.
 
     Args:
         state: The current application state containing the list of leads.
@@ -196,12 +237,7 @@ def analyze_leads_node(state: State) -> State:
 
     logger.info("Starting analysis for a batch of %d leads.", len(state.leads))
     try:
-        # Create a runnable lambda to apply the `analyze_lead` function.
-        runnable = RunnableLambda(analyze_lead)
-
-        # Execute the analysis for all leads in the state in a batch.
-        # The `.batch()` method efficiently processes the list.
-        batch_results: list[Lead] = runnable.batch(state.leads)
+        batch_results = _analyze_leads(state.leads)
         logger.info("Finished batch analysis of leads.")
 
         # Return a new state object with the updated leads list.
@@ -210,3 +246,34 @@ def analyze_leads_node(state: State) -> State:
         logger.exception("A critical error occurred during the batch lead analysis.")
         # Return the original state to prevent data loss.
         return state.model_copy()
+
+
+def analyze_batch_leads_node(state: BatchState) -> BatchState:
+    """
+    Analyzes the leads of every search in a batch as a single parallel batch.
+
+    Args:
+        state: The batch state containing one State per search.
+
+    Returns:
+        An updated batch state with the analyzed leads.
+    """
+    leads = [lead for search_state in state.states for lead in search_state.leads]
+    if not leads:
+        logger.warning("No leads to analyze. Skipping batch analysis node.")
+        return state.model_copy()
+
+    logger.info("Starting analysis for {} leads across {} searches.", len(leads), len(state.states))
+    try:
+        analyzed_leads = iter(_analyze_leads(leads))
+        logger.info("Finished batch analysis of leads.")
+
+        # Hand the analyzed leads back to their searches, in the order they were taken out.
+        states = [
+            search_state.model_copy(update={"leads": [next(analyzed_leads) for _ in search_state.leads]})
+            for search_state in state.states
+        ]
+        return state.model_copy(update={"states": states})
+    except Exception:
+        logger.exception("A critical error occurred during the batch lead analysis.")
+        return state.model_copy()
@@ -1,115 +1,171 @@
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
 from loguru import logger
 
-from app.schemas import GoogleMapsSearchOutput, GoogleMapsSearchInput
+from app.schemas import PlaceResult
+from app.schemas.batch import BatchState
 from app.schemas.lead import Lead
 from app.schemas.state import State
-from app.tools import google_maps_search
+from app.tools import stream_google_maps_search, stream_google_maps_batch_search
+from app.tools.google_maps_search import GoogleMapsClient, GoogleMapsClientError
 
 
-def generate_leads_node(state: State) -> State:
+def _place_result_to_lead(result: PlaceResult) -> Lead:
+    """Converts a Google Maps search result into a Lead object.
+
+    Args:
+        result: A single business returned by the Google Maps search.
+
+    Returns:
+        A Lead object populated with the business information.
+    """
+    return Lead(
+        place_id=result.place_id,
+        name=result.name,
+        address=result.address,
+        phone_number=result.phone_number,
+        website=result.website,
+        rating=result.rating,
+        total_ratings=result.total_ratings,
+        category=result.category,
+        price_level=result.price_level,
+        is_open=result.is_open,
+        lat=result.lat,
+        lng=result.lng
+    )
+
+
+def generate_leads_node(state: State, config: RunnableConfig) -> State:
     """Generates business leads by searching Google Maps.
 
     This function takes the current state, which includes search parameters
     like city, business type, and radius, and uses them to query the
-    Google Maps search tool. It processes the results, converts them into
-    a list of Lead objects, and updates the state with these leads.
+    Google Maps search. Businesses are consumed as a stream: each one is
+    converted into a Lead object as soon as it qualifies and, when the graph
+    is run with `stream_mode="custom"`, emitted as a `lead_generated` event.
     It includes robust error handling for the API call and data processing.
 
     Args:
         state: An object containing the current application state, including
                all necessary parameters for the Google Maps search.
+        config: The run configuration. Set `refresh_search` in its
+                `configurable` section to bypass the search result cache.
 
     Returns:
         An updated State object. If the search is successful, the state's
         'leads' attribute will be populated with a list of Lead objects.
-        If an error occurs, the original state is returned, potentially
-        with an error message if the state schema supports it.
+        If an error occurs before any lead is found, the original state is
+        returned; leads found before a mid-search error are kept.
     """
     logger.info(
         f"Starting lead generation for business type '{state.business_type}' in {state.city}."
     )
+    writer = get_stream_writer()
+    updated_leads: list[Lead] = []
 
     try:
-        # Step 1: Prepare the input for the Google Maps search tool
-        # using the parameters from the current state.
-        search_input = GoogleMapsSearchInput(
-            city=state.city,
-            business_type=state.business_type,
-            radius=state.radius,
-            min_rating=state.min_rating,
-            max_results=state.max_results,
-        ).model_dump()
+        # Stream the search using the parameters from the current state, and
+        # emit every lead as soon as it is generated.
+        for result in stream_google_maps_search(
+                city=state.city,
+                business_type=state.business_type,
+                radius=state.radius,
+                min_rating=state.min_rating,
+                max_results=state.max_results,
+                exclude_websites=False,
+                refresh=config.get("configurable", {}).get("refresh_search", False),
+        ):
+            lead = _place_result_to_lead(result)
+            updated_leads.append(lead)
+            writer({"event": "lead_generated", "lead": lead})
 
-        # Step 2: Invoke the external tool/API to perform the search.
-        # This is wrapped in a try-except block to catch any exceptions
-        # during the API call, such as network issues or timeouts.
-        google_maps_search_result: GoogleMapsSearchOutput = google_maps_search.invoke(
-            search_input
-        )
-        logger.debug("Received response from Google Maps search API.")
-
-    except Exception as e:
-        # Catch any unexpected exceptions during the API call.
-        logger.exception(
-            f"An unexpected error occurred while calling the google_maps_search tool: {e}"
-        )
-        # Return the original state without modification, preventing a crash.
+    except GoogleMapsClientError as e:
+        # Handle cases where the search was made but the API returned an error.
+        logger.error(f"Google Maps search failed: {e}")
+        if not updated_leads:
+            return state.model_copy()
+    except (TypeError, AttributeError, KeyError) as e:
+        # Catch potential errors during the creation of Lead objects,
+        # which could happen if the API response format is unexpected.
+        logger.exception(f"Error processing search results into Lead objects: {e}")
+        # Return original state to avoid propagating corrupted data.
         return state.model_copy()
-
-    # Step 3: Process the response from the search tool.
-    # Check if the result object exists and if the status is 'success'.
-    if google_maps_search_result and google_maps_search_result.status == "success":
-        if not google_maps_search_result.results:
-            logger.warning(
-                "Google Maps search was successful but returned no results for the given criteria."
-            )
-            # If there are no results, update the state with an empty list.
-            return state.model_copy(update={"leads": []})
-
-        try:
-            # Use a list comprehension to iterate through the raw results
-            # and create a list of structured Lead objects.
-            # This ensures the data conforms to our application's schema.
-            updated_leads: list[Lead] = [
-                Lead(
-                    place_id=result.place_id,
-                    name=result.name,
-                    address=result.address,
-                    phone_number=result.phone_number,
-                    website=result.website,
-                    rating=result.rating,
-                    total_ratings=result.total_ratings,
-                    category=result.category,
-                    price_level=result.price_level,
-                    is_open=result.is_open,
-                    lat=result.lat,
-                    lng=result.lng
-                ) for result in google_maps_search_result.results
-            ]
-            logger.info(
-                "Successfully generated %d leads.", len(updated_leads)
-            )
-
-            # Return a copy of the state, updated with the new list of leads.
-            return state.model_copy(update={"leads": updated_leads})
-
-        except (TypeError, AttributeError, KeyError) as e:
-            # Catch potential errors during the creation of Lead objects,
-            # which could happen if the API response format is unexpected.
-            logger.exception(f"Error processing search results into Lead objects: {e}")
-            # Return original state to avoid propagating corrupted data.
+    except Exception as e:
+        # Catch any unexpected exceptions during the search, such as
+        # network issues or timeouts, preventing a crash.
+        logger.exception(f"An unexpected error occurred during the Google Maps search: {e}")
+        if not updated_leads:
             return state.model_copy()
 
-    else:
-        # Handle cases where the API call was made but returned a failure status.
-        error_message = (
-            google_maps_search_result.error
-            if google_maps_search_result and google_maps_search_result.error
-            else "Unknown error from the search tool."
+    if not updated_leads:
+        logger.warning(
+            "Google Maps search was successful but returned no results for the given criteria."
         )
-        logger.error(
-            f"Google Maps search tool returned a failure status: {error_message}"
+        return state.model_copy(update={"leads": []})
+
+    logger.info("Successfully generated {} leads.", len(updated_leads))
+
+    # Return a copy of the state, updated with the new list of leads.
+    return state.model_copy(update={"leads": updated_leads})
+
+
+def generate_batch_leads_node(state: BatchState) -> BatchState:
+    """Generates business leads for every combination of cities and business types.
+
+    All searches run as one batch, so overlapping searches never produce the
+    same lead twice and the batch shares a single result budget. Each lead is
+    assigned to the (city, business_type) search that found it first and,
+    when the graph is run with `stream_mode="custom"`, emitted as a
+    `lead_generated` event tagged with that search.
+
+    Args:
+        state: The batch state, with the cities, business types and filters.
+
+    Returns:
+        An updated BatchState with one State per city and business type. Leads
+        found before an error are kept.
+    """
+    logger.info(
+        f"Starting batch lead generation for {len(state.business_types)} business types "
+        f"in {len(state.cities)} cities."
+    )
+    writer = get_stream_writer()
+    leads_by_search: dict[tuple[str, str], list[Lead]] = {}
+
+    try:
+        for (city, business_type), result in stream_google_maps_batch_search(
+                cities=state.cities,
+                business_types=state.business_types,
+                radius=state.radius,
+                min_rating=state.min_rating,
+                max_results=state.max_results,
+                max_total_results=state.max_total_results,
+                exclude_websites=False,
+        ):
+            lead = _place_result_to_lead(result)
+            leads_by_search.setdefault((city, business_type), []).append(lead)
+            writer({"event": "lead_generated", "city": city, "business_type": business_type, "lead": lead})
+
+    except GoogleMapsClientError as e:
+        logger.error(f"Google Maps batch search failed: {e}")
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred during the Google Maps batch search: {e}")
+
+    cities, business_types = GoogleMapsClient.plan_batch(state.cities, state.business_types)
+    states = [
+        State(
+            city=city,
+            business_type=business_type,
+            radius=state.radius,
+            min_rating=state.min_rating,
+            max_results=state.max_results,
+            leads=leads_by_search.get((city, business_type), [])
         )
-        # Return the original state. In a real-world scenario, you might want
-        # to add the error message to the state if the schema allows it.
-        return state.model_copy()
+        for city in cities
+        for business_type in business_types
+    ]
+
+    logger.info(
+        "Generated {} leads across {} searches.", sum(len(leads) for leads in leads_by_search.values()), len(states)
+    )
+    return state.model_copy(update={"states": states})
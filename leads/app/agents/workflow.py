@@ -1,8 +1,9 @@
 from langgraph.graph import StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
-from app.agents.analyze_leads_node import analyze_leads_node
-from app.agents.lead_generator_node import generate_leads_node
+from app.agents.analyze_leads_node import analyze_leads_node, analyze_batch_leads_node
+from app.agents.lead_generator_node import generate_leads_node, generate_batch_leads_node
+from app.schemas.batch import BatchState
 from app.schemas.state import State
 
 
@@ -20,6 +21,18 @@ def create_compiled_state_graph() -> CompiledStateGraph:
     return app
 
 
+def create_compiled_batch_graph() -> CompiledStateGraph:
+    workflow = StateGraph(BatchState)
+    workflow.add_node("generate_batch_leads", generate_batch_leads_node)
+    workflow.add_node("analyze_batch_leads", analyze_batch_leads_node)
+
+    workflow.set_entry_point("generate_batch_leads")
+    workflow.add_edge("generate_batch_leads", "analyze_batch_leads")
+    workflow.set_finish_point("analyze_batch_leads")
+
+    return workflow.compile()
+
+
 #
 #
 # async def run_workflow(state: State) -> State:
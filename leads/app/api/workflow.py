@@ -1,22 +1,32 @@
+import json
 import uuid
+from typing import Iterator
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from loguru import logger
 from sqlalchemy.orm import Session
 
 from app import crud
 from app import schemas
-from app.agents import create_compiled_state_graph
-from app.core import get_db
+from app.agents import create_compiled_state_graph, create_compiled_batch_graph
+from app.core import SessionLocal, get_db
+from app.tools import plan_google_maps_search
 
 router = APIRouter()
 
 
-@router.post("/create-workflow", response_model=schemas.Workflow)
-def create_workflow(init_state_data: schemas.StateCreate, db: Session = Depends(get_db)):
-    workflow = create_compiled_state_graph()
+def _save_workflow(db: Session, init_state_data: schemas.StateCreate, final_state_data: dict):
+    """Persists the initial and final states of a graph run, with their leads.
 
-    final_state_data = workflow.invoke(init_state_data)
+    Args:
+        db: The database session.
+        init_state_data: The state the graph was started with.
+        final_state_data: The state the graph finished with.
 
+    Returns:
+        The created workflow, linking the two persisted states.
+    """
     # Create Pydantic models from the results
     initial_state = schemas.State(**init_state_data.model_dump())
     final_state = schemas.State(**final_state_data)
@@ -56,6 +66,106 @@ def create_workflow(init_state_data: schemas.StateCreate, db: Session = Depends(
     return crud.create_workflow(db, workflow=workflow_create)
 
 
+def _ndjson(payload: dict) -> str:
+    return json.dumps(payload) + "\n"
+
+
+@router.post("/create-workflow", response_model=schemas.Workflow)
+def create_workflow(init_state_data: schemas.StateCreate, refresh: bool = False, db: Session = Depends(get_db)):
+    workflow = create_compiled_state_graph()
+
+    final_state_data = workflow.invoke(init_state_data, config={"configurable": {"refresh_search": refresh}})
+
+    return _save_workflow(db, init_state_data, final_state_data)
+
+
+@router.post("/create-workflow-stream")
+def create_workflow_stream(init_state_data: schemas.StateCreate, refresh: bool = False):
+    """Runs the workflow and streams its progress as newline-delimited JSON.
+
+    Every lead is sent as a `lead_generated` event as soon as it qualifies in
+    the Google Maps search, and again as a `lead_analyzed` event once its
+    analysis has finished. When the run completes, the workflow is persisted
+    and sent as a final `workflow_created` event. If the run fails, an `error`
+    event is sent instead and nothing is persisted.
+
+    Searches identical to a recent one replay its cached results unless
+    `refresh` is set.
+    """
+    workflow = create_compiled_state_graph()
+
+    def event_stream() -> Iterator[str]:
+        final_state_data = None
+        try:
+            for mode, chunk in workflow.stream(
+                    init_state_data,
+                    config={"configurable": {"refresh_search": refresh}},
+                    stream_mode=["custom", "values"]
+            ):
+                if mode == "values":
+                    # The last values chunk is the final state of the run.
+                    final_state_data = chunk
+                    continue
+                yield _ndjson({"event": chunk["event"], "lead": chunk["lead"].model_dump(mode="json")})
+        except Exception as e:
+            logger.exception(f"Streaming workflow failed: {e}")
+            yield _ndjson({"event": "error", "detail": str(e)})
+            return
+
+        # The request-scoped session is not guaranteed to outlive the response
+        # body, so the workflow is saved with a session owned by the stream.
+        db = SessionLocal()
+        try:
+            db_workflow = _save_workflow(db, init_state_data, final_state_data)
+            workflow_out = schemas.Workflow.model_validate(db_workflow)
+            yield _ndjson({"event": "workflow_created", "workflow": workflow_out.model_dump(mode="json")})
+        except Exception as e:
+            logger.exception(f"Failed to save streamed workflow: {e}")
+            yield _ndjson({"event": "error", "detail": str(e)})
+        finally:
+            db.close()
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
+@router.post("/plan-workflow", response_model=schemas.SearchPlan)
+def plan_workflow(init_state_data: schemas.StateCreate):
+    """Dry run of a workflow's Google Maps search.
+
+    Plans the search the workflow would run and estimates its API requests,
+    cost and wall time for every feasible mode (Text Search only, Nearby
+    Search only, both, or tiled), without making any request.
+    """
+    return plan_google_maps_search(
+        city=init_state_data.city,
+        business_type=init_state_data.business_type,
+        radius=init_state_data.radius,
+        max_results=init_state_data.max_results,
+        exclude_websites=False,
+    )
+
+
+@router.post("/create-batch-workflow", response_model=list[schemas.Workflow])
+def create_batch_workflow(batch_data: schemas.BatchStateCreate, db: Session = Depends(get_db)):
+    """Runs one workflow for every combination of cities and business types.
+
+    The searches run concurrently as a single batch, which deduplicates leads
+    across them, and all the resulting workflows are saved in one transaction.
+    """
+    workflow = create_compiled_batch_graph()
+
+    final_batch_data = schemas.BatchState(**workflow.invoke(batch_data))
+
+    state_pairs = [
+        (
+            schemas.StateCreate(**final_state.model_dump(exclude={'leads', 'id'})),
+            schemas.StateCreate(**final_state.model_dump(exclude={'leads', 'id'}), leads=final_state.leads)
+        )
+        for final_state in final_batch_data.states
+    ]
+    return crud.create_workflows_from_states(db, state_pairs)
+
+
 @router.get("/read-workflow/{workflow_id}", response_model=schemas.Workflow)
 def read_workflow(workflow_id: uuid.UUID, db: Session = Depends(get_db)):
     return crud.read_workflow(db, workflow_id)
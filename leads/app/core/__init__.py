@@ -1,2 +1,2 @@
 from app.core.config import Config
-from app.core.database import Base, engine, get_db
+from app.core.database import Base, SessionLocal, engine, get_db, init_db
@@ -13,6 +13,60 @@ class Config:
     POSTGRES_URL: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
     GOOGLE_MAPS_API_KEY: str = os.getenv("GOOGLE_MAPS_API_KEY")
+    # Path to a recorded fixture; when set, Google Maps requests are served offline by
+    # benchmarks.google_maps_fake.FakeGoogleMapsClient; run from the leads directory.
+    GOOGLE_MAPS_FAKE_FIXTURE: str = os.getenv("GOOGLE_MAPS_FAKE_FIXTURE")
+    GOOGLE_MAPS_SEARCH_STRATEGY: str = os.getenv("GOOGLE_MAPS_SEARCH_STRATEGY", "details")
+    GOOGLE_MAPS_DETAILS_CONCURRENCY: int = int(os.getenv("GOOGLE_MAPS_DETAILS_CONCURRENCY", "8"))
+    GOOGLE_MAPS_TILED_SEARCH: bool = os.getenv("GOOGLE_MAPS_TILED_SEARCH") == "true"
+    GOOGLE_MAPS_TILE_RADIUS: int = int(os.getenv("GOOGLE_MAPS_TILE_RADIUS", "5000"))
+    GOOGLE_MAPS_MIN_TILE_RADIUS: int = int(os.getenv("GOOGLE_MAPS_MIN_TILE_RADIUS", "500"))
+    GOOGLE_MAPS_TILE_CONCURRENCY: int = int(os.getenv("GOOGLE_MAPS_TILE_CONCURRENCY", "4"))
+    # Requests per second per endpoint, shared by all workers; "*" applies to endpoints without their own limit
+    GOOGLE_MAPS_RATE_LIMITS: str = os.getenv("GOOGLE_MAPS_RATE_LIMITS", "*=50")
+    # Tokens taken from the shared rate limit buckets per database round trip
+    GOOGLE_MAPS_RATE_LIMIT_LEASE: int = int(os.getenv("GOOGLE_MAPS_RATE_LIMIT_LEASE", "5"))
+    GOOGLE_MAPS_QUOTA_RETRIES: int = int(os.getenv("GOOGLE_MAPS_QUOTA_RETRIES", "6"))
+    GOOGLE_MAPS_BATCH_CONCURRENCY: int = int(os.getenv("GOOGLE_MAPS_BATCH_CONCURRENCY", "4"))
+    # Connections kept alive per Google host, shared by the threads of the searches
+    GOOGLE_MAPS_HTTP_MAX_CONNECTIONS: int = int(os.getenv("GOOGLE_MAPS_HTTP_MAX_CONNECTIONS", "20"))
+    # Skip places stored as leads within KNOWN_LEAD_TTL_SECONDS before paying for their details; "false" to disable
+    GOOGLE_MAPS_SKIP_KNOWN_LEADS: bool = os.getenv("GOOGLE_MAPS_SKIP_KNOWN_LEADS", "true") == "true"
+    KNOWN_LEAD_TTL_SECONDS: int = int(os.getenv("KNOWN_LEAD_TTL_SECONDS", str(30 * 24 * 60 * 60)))
+    # Share of candidates assumed to pass the search filters for business types without history
+    SEARCH_PASS_RATE_PRIOR: float = float(os.getenv("SEARCH_PASS_RATE_PRIOR", "0.25"))
+    SEARCH_MAX_OVER_FETCH: float = float(os.getenv("SEARCH_MAX_OVER_FETCH", "10"))
+    # Set to 0 to disable the search result cache
+    SEARCH_RESULT_CACHE_TTL_SECONDS: int = int(os.getenv("SEARCH_RESULT_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+    # How long a worker waits for an identical search running elsewhere before running it itself
+    SEARCH_LOCK_TIMEOUT_SECONDS: int = int(os.getenv("SEARCH_LOCK_TIMEOUT_SECONDS", "60"))
+    GEOCODE_CACHE_TTL_SECONDS: int = int(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 60 * 60)))
+    # Lead websites found dead, parked or redirecting to social media are skipped for this long; 0 to disable
+    DEAD_DOMAIN_CACHE_TTL_SECONDS: int = int(os.getenv("DEAD_DOMAIN_CACHE_TTL_SECONDS", str(3 * 24 * 60 * 60)))
+    PLACE_DETAILS_STABLE_TTL_SECONDS: int = int(os.getenv("PLACE_DETAILS_STABLE_TTL_SECONDS", str(30 * 24 * 60 * 60)))
+    PLACE_DETAILS_VOLATILE_TTL_SECONDS: int = int(os.getenv("PLACE_DETAILS_VOLATILE_TTL_SECONDS", str(24 * 60 * 60)))
+
+    # Contact scraping: crawls of the process share one connection pool
+    CONTACT_SCRAPER_MAX_CONNECTIONS: int = int(os.getenv("CONTACT_SCRAPER_MAX_CONNECTIONS", "50"))
+    CONTACT_SCRAPER_MAX_CONNECTIONS_PER_HOST: int = int(os.getenv("CONTACT_SCRAPER_MAX_CONNECTIONS_PER_HOST", "4"))
+    CONTACT_SCRAPER_REQUEST_TIMEOUT: int = int(os.getenv("CONTACT_SCRAPER_REQUEST_TIMEOUT", "10"))
+    CONTACT_SCRAPER_DEADLINE_SECONDS: int = int(os.getenv("CONTACT_SCRAPER_DEADLINE_SECONDS", "60"))
+    # Bytes read of a page at most; the rest of larger pages is never downloaded
+    CONTACT_SCRAPER_MAX_PAGE_BYTES: int = int(os.getenv("CONTACT_SCRAPER_MAX_PAGE_BYTES", "2000000"))
+    # Politeness: minimum delay between requests to a host, and concurrent requests to a server shared by many hosts
+    CONTACT_SCRAPER_HOST_DELAY_SECONDS: float = float(os.getenv("CONTACT_SCRAPER_HOST_DELAY_SECONDS", "0.1"))
+    CONTACT_SCRAPER_MAX_CONNECTIONS_PER_ADDRESS: int = int(os.getenv("CONTACT_SCRAPER_MAX_CONNECTIONS_PER_ADDRESS", "16"))
+    CONTACT_SCRAPER_DNS_TTL_SECONDS: int = int(os.getenv("CONTACT_SCRAPER_DNS_TTL_SECONDS", "300"))
+    # Goals ending a crawl early once met, e.g. "own_email,phone"; empty to always spend the whole budget
+    CONTACT_SCRAPER_GOALS: str = os.getenv("CONTACT_SCRAPER_GOALS", "own_email,phone")
+    # End a crawl once a business declares its phone number and email as structured data (JSON-LD, microdata, hCard)
+    CONTACT_SCRAPER_TRUST_STRUCTURED_DATA: bool = os.getenv("CONTACT_SCRAPER_TRUST_STRUCTURED_DATA", "true") == "true"
+    # Obey robots.txt, and pick the pages to crawl from the sitemaps rather than by following links
+    CONTACT_SCRAPER_USE_SITEMAPS: bool = os.getenv("CONTACT_SCRAPER_USE_SITEMAPS", "true") == "true"
+    # BeautifulSoup parser of the crawled pages, e.g. "lxml"; empty for lxml when installed, html.parser otherwise
+    CONTACT_SCRAPER_HTML_PARSER: str = os.getenv("CONTACT_SCRAPER_HTML_PARSER", "")
+    # Region of phone numbers written without a country code, e.g. "US" or "GB"; numbers are normalized to E.164
+    CONTACT_SCRAPER_DEFAULT_REGION: str = os.getenv("CONTACT_SCRAPER_DEFAULT_REGION", "US")
 
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY")
     MODEL_NAME: str = os.getenv("MODEL_NAME")
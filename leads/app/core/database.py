@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.core.config import Config
@@ -18,3 +18,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def init_db():
+    """
+    Creates the tables of the models imported so far, and adds the columns
+    introduced after their tables were first created.
+
+    Called on application startup rather than at import, so importing the
+    app does not need a reachable database.
+    """
+    Base.metadata.create_all(bind=engine)
+
+    # create_all does not add columns to existing tables. Leads stored before `created_at` existed are left
+    # without one, so they are never taken for recent ones.
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE lead ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ"))
+        connection.execute(text("ALTER TABLE lead ALTER COLUMN created_at SET DEFAULT now()"))
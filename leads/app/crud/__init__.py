@@ -1,3 +1,15 @@
-from app.crud.lead import create_lead, read_lead, read_lead_by_place_id, read_all_leads, update_lead, delete_lead
+from app.crud.api_rate_limit import take_rate_limit_tokens
+from app.crud.dead_domain_cache import read_dead_domain_cache, upsert_dead_domain_cache
+from app.crud.geocode_cache import read_geocode_cache, upsert_geocode_cache
+from app.crud.lead import (
+    create_lead, read_lead, read_lead_by_place_id, read_recent_lead_place_ids, read_all_leads, update_lead, delete_lead
+)
+from app.crud.place_details_cache import read_place_details_cache_many, upsert_place_details_cache_many
+from app.crud.search_pass_rate import read_search_pass_rate, record_search_pass_rate
+from app.crud.search_result_cache import (
+    read_search_result_cache, upsert_search_result_cache, try_lock_search, unlock_search
+)
 from app.crud.state import create_state, read_state, read_all_states, update_state, delete_state
-from app.crud.workflow import create_workflow, read_workflow, read_all_workflows, update_workflow, delete_workflow
+from app.crud.workflow import (
+    create_workflow, create_workflows_from_states, read_workflow, read_all_workflows, update_workflow, delete_workflow
+)
@@ -0,0 +1,57 @@
+from loguru import logger
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def take_rate_limit_tokens(db: Session, endpoint: str, rate: float, burst: float, count: int = 1) -> tuple[int, float]:
+    """Takes up to `count` tokens from the shared bucket of an endpoint.
+
+    The bucket row is locked with `SELECT ... FOR UPDATE` for the duration of
+    the transaction, so concurrent workers take tokens one lease at a time.
+    The row is only inserted, full, the first time the endpoint is limited.
+    Tokens are refilled at `rate` per second, up to `burst`, measured with
+    the database clock so that every worker agrees on the elapsed time.
+
+    Args:
+        db: The SQLAlchemy database session.
+        endpoint: The API endpoint the bucket belongs to.
+        rate: The number of tokens added per second.
+        burst: The maximum number of tokens in the bucket.
+        count: The maximum number of tokens to take. Fewer are taken when the bucket holds fewer.
+
+    Returns:
+        The number of tokens taken, and when none was, the number of seconds until one is available.
+    """
+    bucket_query = (
+        select(models.ApiRateLimit, func.clock_timestamp())
+        .where(models.ApiRateLimit.endpoint == endpoint)
+        .with_for_update()
+    )
+    try:
+        row = db.execute(bucket_query).first()
+        if row is None:
+            db.execute(
+                insert(models.ApiRateLimit)
+                .values(endpoint=endpoint, tokens=burst, updated_at=func.clock_timestamp())
+                .on_conflict_do_nothing(index_elements=[models.ApiRateLimit.endpoint])
+            )
+            row = db.execute(bucket_query).one()
+
+        bucket, now = row
+        elapsed = max(0.0, (now - bucket.updated_at).total_seconds())
+        tokens = min(burst, bucket.tokens + elapsed * rate)
+
+        taken = min(count, int(tokens))
+        wait = 0.0 if taken else (1 - tokens) / rate
+
+        bucket.tokens = tokens - taken
+        bucket.updated_at = now
+        db.commit()
+        return taken, wait
+    except Exception as e:
+        logger.error(f"Failed to take rate limit tokens for {endpoint}. Rolling back transaction. Error: {e}")
+        db.rollback()
+        raise
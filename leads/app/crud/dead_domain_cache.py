@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def read_dead_domain_cache(db: Session, domain: str, max_age: timedelta) -> models.DeadDomainCache | None:
+    """Retrieves the recorded failure of a domain if it is younger than `max_age`.
+
+    Args:
+        db: The SQLAlchemy database session.
+        domain: The normalized domain used as the cache key.
+        max_age: The maximum age of an entry for it to be considered fresh.
+
+    Returns:
+        The DeadDomainCache model instance if a fresh entry exists, otherwise None.
+    """
+    logger.debug(f"Fetching dead domain cache entry for: {domain}")
+    cutoff = datetime.now(timezone.utc) - max_age
+    return (
+        db.query(models.DeadDomainCache)
+        .filter(models.DeadDomainCache.domain == domain, models.DeadDomainCache.checked_at >= cutoff)
+        .first()
+    )
+
+
+def upsert_dead_domain_cache(db: Session, domain: str, failure: str, detail: Optional[str] = None) -> None:
+    """Inserts or refreshes the recorded failure of a domain.
+
+    The upsert is done with `ON CONFLICT DO UPDATE` so the contact scraper
+    and the screenshotter recording the same domain do not fail on the
+    primary key.
+
+    Args:
+        db: The SQLAlchemy database session.
+        domain: The normalized domain used as the cache key.
+        failure: The failure class, e.g. "dns_failure".
+        detail: Optional description of the failure.
+    """
+    logger.debug(f"Storing dead domain cache entry for: {domain} ({failure})")
+    statement = insert(models.DeadDomainCache).values(domain=domain, failure=failure, detail=detail)
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.DeadDomainCache.domain],
+        set_={
+            "failure": statement.excluded.failure,
+            "detail": statement.excluded.detail,
+            "checked_at": datetime.now(timezone.utc)
+        }
+    )
+    try:
+        db.execute(statement)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to store dead domain cache entry for {domain}. Rolling back transaction. Error: {e}")
+        db.rollback()
+        raise
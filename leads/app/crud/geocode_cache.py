@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def read_geocode_cache(db: Session, query: str, max_age: timedelta) -> models.GeocodeCache | None:
+    """Retrieves a cached geocode result if it is younger than `max_age`.
+
+    Args:
+        db: The SQLAlchemy database session.
+        query: The normalized city string used as the cache key.
+        max_age: The maximum age of an entry for it to be considered fresh.
+
+    Returns:
+        The GeocodeCache model instance if a fresh entry exists, otherwise None.
+    """
+    logger.debug(f"Fetching geocode cache entry for: {query}")
+    cutoff = datetime.now(timezone.utc) - max_age
+    return (
+        db.query(models.GeocodeCache)
+        .filter(models.GeocodeCache.query == query, models.GeocodeCache.fetched_at >= cutoff)
+        .first()
+    )
+
+
+def upsert_geocode_cache(db: Session, query: str, lat: float, lng: float) -> None:
+    """Inserts or refreshes a geocode cache entry.
+
+    The upsert is done with `ON CONFLICT DO UPDATE` so concurrent workers
+    geocoding the same city do not fail on the primary key.
+
+    Args:
+        db: The SQLAlchemy database session.
+        query: The normalized city string used as the cache key.
+        lat: The latitude of the location.
+        lng: The longitude of the location.
+    """
+    logger.debug(f"Storing geocode cache entry for: {query}")
+    statement = insert(models.GeocodeCache).values(query=query, lat=lat, lng=lng)
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.GeocodeCache.query],
+        set_={"lat": statement.excluded.lat, "lng": statement.excluded.lng, "fetched_at": datetime.now(timezone.utc)}
+    )
+    try:
+        db.execute(statement)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to store geocode cache entry for {query}. Rolling back transaction. Error: {e}")
+        db.rollback()
+        raise
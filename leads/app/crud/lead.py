@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime, timedelta, timezone
 
 from loguru import logger
 from sqlalchemy.orm import Session
@@ -97,6 +98,33 @@ def read_all_leads_by_place_id(db: Session, place_id: str) -> list[models.Lead]
     return db.query(models.Lead).filter(models.Lead.place_id == place_id).all()
 
 
+def read_recent_lead_place_ids(db: Session, place_ids: list[str], max_age: timedelta) -> set[str]:
+    """Finds which of several Google Place IDs were stored as leads recently.
+
+    The lookup is a single query on the indexed `place_id` column.
+
+    Args:
+        db: The SQLAlchemy database session.
+        place_ids: The Google Place IDs to look up.
+        max_age: The maximum age of a lead for its place to be returned.
+
+    Returns:
+        The subset of `place_ids` with a lead younger than `max_age`.
+    """
+    if not place_ids:
+        return set()
+
+    logger.debug(f"Looking up recent leads for {len(place_ids)} place IDs.")
+    cutoff = datetime.now(timezone.utc) - max_age
+    rows = (
+        db.query(models.Lead.place_id)
+        .filter(models.Lead.place_id.in_(place_ids), models.Lead.created_at >= cutoff)
+        .distinct()
+        .all()
+    )
+    return {place_id for place_id, in rows}
+
+
 def read_all_leads(db: Session, skip: int = 0, limit: int = 100) -> list[models.Lead]:
     """Retrieves a list of leads from the database with pagination.
 
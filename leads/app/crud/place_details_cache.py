@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Any
+
+from loguru import logger
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def read_place_details_cache_many(db: Session, place_ids: list[str]) -> list[models.PlaceDetailsCache]:
+    """Retrieves the cached details for several places in a single query.
+
+    Args:
+        db: The SQLAlchemy database session.
+        place_ids: The Google Place IDs to look up.
+
+    Returns:
+        A list of PlaceDetailsCache model instances for the IDs found in the cache.
+    """
+    if not place_ids:
+        return []
+
+    logger.debug(f"Fetching place details cache entries for {len(place_ids)} places.")
+    return db.query(models.PlaceDetailsCache).filter(models.PlaceDetailsCache.place_id.in_(place_ids)).all()
+
+
+def upsert_place_details_cache_many(
+        db: Session,
+        entries: list[tuple[str, dict[str, Any], datetime, datetime]]
+) -> None:
+    """Inserts or refreshes several place details cache entries in one statement.
+
+    Args:
+        db: The SQLAlchemy database session.
+        entries: Tuples of (place_id, details, stable_fetched_at, volatile_fetched_at).
+    """
+    if not entries:
+        return
+
+    logger.debug(f"Storing {len(entries)} place details cache entries.")
+    statement = insert(models.PlaceDetailsCache).values([
+        {
+            "place_id": place_id,
+            "details": details,
+            "stable_fetched_at": stable_fetched_at,
+            "volatile_fetched_at": volatile_fetched_at,
+        }
+        for place_id, details, stable_fetched_at, volatile_fetched_at in entries
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.PlaceDetailsCache.place_id],
+        set_={
+            "details": statement.excluded.details,
+            "stable_fetched_at": statement.excluded.stable_fetched_at,
+            "volatile_fetched_at": statement.excluded.volatile_fetched_at,
+        }
+    )
+    try:
+        db.execute(statement)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to store place details cache entries. Rolling back transaction. Error: {e}")
+        db.rollback()
+        raise
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+
+from loguru import logger
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def read_search_pass_rate(db: Session, category: str, exclude_websites: bool) -> models.SearchPassRate | None:
+    """Retrieves the recorded filter pass rate of a search category.
+
+    Args:
+        db: The SQLAlchemy database session.
+        category: The normalized business type, "" for searches without one.
+        exclude_websites: Whether the searches excluded businesses with a website.
+
+    Returns:
+        The SearchPassRate model instance if one was recorded, otherwise None.
+    """
+    logger.debug(f"Fetching search pass rate for: {category!r} (exclude_websites={exclude_websites})")
+    return db.get(models.SearchPassRate, (category, exclude_websites))
+
+
+def record_search_pass_rate(
+        db: Session,
+        category: str,
+        exclude_websites: bool,
+        examined: int,
+        qualified: int,
+        decay: float
+) -> None:
+    """Adds the outcome of a search to the pass rate of its category.
+
+    The counts already recorded are multiplied by `decay` first, in the same
+    statement, so recent searches weigh more and concurrent workers never
+    overwrite each other's updates.
+
+    Args:
+        db: The SQLAlchemy database session.
+        category: The normalized business type, "" for searches without one.
+        exclude_websites: Whether the search excluded businesses with a website.
+        examined: The candidates whose qualification the search decided.
+        qualified: The examined candidates that passed every filter.
+        decay: The weight, between 0 and 1, kept by the counts already recorded.
+    """
+    table = models.SearchPassRate.__table__
+    statement = insert(models.SearchPassRate).values(
+        category=category, exclude_websites=exclude_websites, examined=examined, qualified=qualified
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.SearchPassRate.category, models.SearchPassRate.exclude_websites],
+        set_={
+            "examined": table.c.examined * decay + statement.excluded.examined,
+            "qualified": table.c.qualified * decay + statement.excluded.qualified,
+            "updated_at": datetime.now(timezone.utc),
+        }
+    )
+    try:
+        db.execute(statement)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to record search pass rate for {category!r}. Rolling back transaction. Error: {e}")
+        db.rollback()
+        raise
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import Connection, select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def read_search_result_cache(db: Session, key: str, max_age: timedelta) -> models.SearchResultCache | None:
+    """Retrieves the cached output of a search if it is younger than `max_age`.
+
+    Args:
+        db: The SQLAlchemy database session.
+        key: The hash of the normalized search parameters.
+        max_age: The maximum age of an entry for it to be considered fresh.
+
+    Returns:
+        The SearchResultCache model instance if a fresh entry exists, otherwise None.
+    """
+    logger.debug(f"Fetching search result cache entry for: {key}")
+    cutoff = datetime.now(timezone.utc) - max_age
+    return (
+        db.query(models.SearchResultCache)
+        .filter(models.SearchResultCache.key == key, models.SearchResultCache.fetched_at >= cutoff)
+        .first()
+    )
+
+
+def upsert_search_result_cache(db: Session, key: str, params: dict[str, Any], output: dict[str, Any]) -> None:
+    """Inserts or refreshes the cached output of a search.
+
+    Args:
+        db: The SQLAlchemy database session.
+        key: The hash of the normalized search parameters.
+        params: The normalized search parameters.
+        output: The search output, as JSON.
+    """
+    logger.debug(f"Storing search result cache entry for: {key}")
+    statement = insert(models.SearchResultCache).values(key=key, params=params, output=output)
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.SearchResultCache.key],
+        set_={"output": statement.excluded.output, "fetched_at": datetime.now(timezone.utc)}
+    )
+    try:
+        db.execute(statement)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to store search result cache entry for {key}. Rolling back transaction. Error: {e}")
+        db.rollback()
+        raise
+
+
+def _search_lock_id(key: str) -> int:
+    # Advisory locks take a signed 64-bit key; the cache key is a hex digest.
+    return int(key[:16], 16) - (1 << 63)
+
+
+def try_lock_search(connection: Connection, key: str) -> bool:
+    """Takes the advisory lock of a search on this connection, if no other connection holds it.
+
+    Advisory locks belong to the Postgres connection that took them, across
+    transactions, so the lock is taken on a dedicated connection rather than
+    a session, which hands its connection back to the pool on commit. It is
+    held until `unlock_search` is called on the same connection, so workers
+    running the same search wait for each other instead of all calling the API.
+
+    Args:
+        connection: The database connection that will hold the lock, kept open until the unlock.
+        key: The hash of the normalized search parameters.
+
+    Returns:
+        Whether the lock was taken. It is never waited for.
+    """
+    locked = connection.execute(select(func.pg_try_advisory_lock(_search_lock_id(key)))).scalar()
+    # Ends the transaction only: the connection, and the lock with it, stay with the caller.
+    connection.commit()
+    return bool(locked)
+
+
+def unlock_search(connection: Connection, key: str) -> None:
+    """Releases the advisory lock of a search taken with `try_lock_search`.
+
+    Args:
+        connection: The database connection holding the lock.
+        key: The hash of the normalized search parameters.
+    """
+    released = connection.execute(select(func.pg_advisory_unlock(_search_lock_id(key)))).scalar()
+    connection.commit()
+    if not released:
+        logger.warning(f"The search lock of {key} was not held by this connection.")
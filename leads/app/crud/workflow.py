@@ -36,6 +36,51 @@ def create_workflow(db: Session, workflow: schemas.WorkflowCreate) -> models.Wor
         raise
 
 
+def create_workflows_from_states(
+        db: Session,
+        state_pairs: list[tuple[schemas.StateCreate, schemas.StateCreate]]
+) -> list[models.Workflow]:
+    """Creates several workflows, with their states and leads, in one transaction.
+
+    Args:
+        db: The SQLAlchemy database session.
+        state_pairs: Tuples of (initial state, final state), each carrying its leads.
+
+    Returns:
+        The newly created and persisted Workflow model instances, in order.
+    """
+    logger.info(f"Attempting to create {len(state_pairs)} workflows.")
+
+    def build_state(state: schemas.StateCreate) -> models.State:
+        return models.State(
+            **state.model_dump(exclude={'leads'}),
+            leads=[
+                models.Lead(
+                    **lead.model_dump(exclude={'id', 'state_id', 'screenshots'}),
+                    screenshots=[models.CapturedScreenshot(**screenshot.model_dump()) for screenshot in lead.screenshots]
+                )
+                for lead in state.leads
+            ]
+        )
+
+    try:
+        db_workflows = [
+            models.Workflow(initial_state=build_state(initial_state), final_state=build_state(final_state))
+            for initial_state, final_state in state_pairs
+        ]
+
+        # Everything is added through the relationships and committed at once.
+        db.add_all(db_workflows)
+        db.commit()
+
+        logger.info(f"Successfully created {len(db_workflows)} workflows.")
+        return db_workflows
+    except Exception as e:
+        logger.error(f"Failed to create workflows. Rolling back transaction. Error: {e}", exc_info=True)
+        db.rollback()
+        raise
+
+
 def read_workflow(db: Session, workflow_db_id: uuid.UUID) -> models.Workflow | None:
     """Retrieves a single workflow from the database by its UUID.
 
@@ -1,4 +1,10 @@
+from app.models.api_rate_limit import ApiRateLimit
+from app.models.dead_domain_cache import DeadDomainCache
+from app.models.geocode_cache import GeocodeCache
 from app.models.lead import Lead
+from app.models.place_details_cache import PlaceDetailsCache
+from app.models.search_pass_rate import SearchPassRate
+from app.models.search_result_cache import SearchResultCache
 from app.models.state import State
 from app.models.visual_analysis import CapturedScreenshot
 from app.models.workflow import Workflow
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core import Base
+
+
+# --- API Rate Limit Model ---
+class ApiRateLimit(Base):
+    __tablename__ = "api_rate_limit"
+
+    # One token bucket per API endpoint, shared by every worker process
+    endpoint: Mapped[str] = mapped_column(String, primary_key=True)
+    tokens: Mapped[float]
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core import Base
+
+
+# --- Dead Domain Cache Model ---
+class DeadDomainCache(Base):
+    __tablename__ = "dead_domain_cache"
+
+    # Lowercased host name of a lead's website, without "www."
+    domain: Mapped[str] = mapped_column(String, primary_key=True)
+    # Failure class: dns_failure, connection_refused, parked or social_redirect
+    failure: Mapped[str]
+    # What the failure was, e.g. the social media page the website redirects to
+    detail: Mapped[Optional[str]]
+    checked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import String, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core import Base
+
+
+# --- Geocode Cache Model ---
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+
+    # Normalized city string used as the lookup key
+    query: Mapped[str] = mapped_column(String, primary_key=True)
+    lat: Mapped[float]
+    lng: Mapped[float]
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
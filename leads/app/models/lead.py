@@ -1,7 +1,8 @@
 import uuid
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey, String, JSON, Text
+from sqlalchemy import ForeignKey, String, JSON, Text, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -36,6 +37,9 @@ class Lead(Base):
     # Use Text for potentially long reviews
     website_review: Mapped[Optional[str]] = mapped_column(Text)
 
+    # When the lead was stored, used to skip recently found places in new searches
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
     # --- Relationships ---
 
     # 1-to-Many: A Lead has many Screenshots
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import String, DateTime, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core import Base
+
+
+# --- Place Details Cache Model ---
+class PlaceDetailsCache(Base):
+    __tablename__ = "place_details_cache"
+
+    place_id: Mapped[str] = mapped_column(String, primary_key=True)
+    # Subset of the place details response that the search pipeline reads
+    details: Mapped[dict[str, Any]] = mapped_column(JSON)
+
+    # Stable fields (name, address, website...) and volatile fields (rating, opening hours...)
+    # expire independently, so each group keeps its own timestamp.
+    stable_fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    volatile_fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
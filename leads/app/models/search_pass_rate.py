@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import String, Boolean, Float, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core import Base
+
+
+# --- Search Pass Rate Model ---
+class SearchPassRate(Base):
+    __tablename__ = "search_pass_rate"
+
+    # Normalized business type, "" for searches without one
+    category: Mapped[str] = mapped_column(String, primary_key=True)
+    exclude_websites: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    # Exponentially decayed counts of the candidates examined and of those that qualified
+    examined: Mapped[float] = mapped_column(Float, default=0.0)
+    qualified: Mapped[float] = mapped_column(Float, default=0.0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import String, DateTime, JSON, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core import Base
+
+
+# --- Search Result Cache Model ---
+class SearchResultCache(Base):
+    __tablename__ = "search_result_cache"
+
+    # Hash of the normalized search parameters
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    params: Mapped[dict[str, Any]] = mapped_column(JSON)
+    # The GoogleMapsSearchOutput of the search, as JSON
+    output: Mapped[dict[str, Any]] = mapped_column(JSON)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
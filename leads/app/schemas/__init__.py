@@ -1,5 +1,7 @@
+from app.schemas.batch import BatchState, BatchStateCreate
 from app.schemas.contact_scraper import ContactScraperInput, ContactScraperOutput
-from app.schemas.google_maps_search import GoogleMapsSearchInput, GoogleMapsSearchOutput, PlaceResult, SearchMetadata
+from app.schemas.google_maps_search import GoogleMapsSearchInput, GoogleMapsSearchOutput, PlaceResult, SearchMetadata, \
+    SearchStats, SearchPlan, SearchPlanEstimate
 from app.schemas.lead import Lead, LeadCreate, LeadUpdate
 from app.schemas.state import State, StateCreate, StateUpdate
 from app.schemas.visual_analysis import VisualAnalysisInput, VisualAnalysisOutput, CapturedScreenshot
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.state import State
+
+
+class BatchStateBase(BaseModel):
+    cities: list[str] = Field(..., min_length=1, description="Cities to search in.")
+    business_types: list[str] = Field(..., min_length=1, description="Business types to search for in every city.")
+    radius: int = Field(50000, description="Radius in meters for each search.")
+    min_rating: float = Field(0.0, description="Minimum rating for businesses.")
+    max_results: int = Field(10, description="Maximum number of results for each city and business type.")
+    max_total_results: Optional[int] = Field(
+        None, description="Maximum number of results across the whole batch. Defaults to max_results per search."
+    )
+
+
+class BatchStateCreate(BatchStateBase):
+    pass
+
+
+class BatchState(BatchStateBase):
+    states: list[State] = Field(default_factory=list, description="One state per city and business type, with its leads.")
@@ -11,3 +11,17 @@ class ContactScraperOutput(BaseModel):
     phone_numbers: list[str] = Field(default_factory=list, description="A list of unique phone numbers found.")
     social_media: list[str] = Field(default_factory=list,
                                     description="A list of unique social media profile links found.")
+    pages_crawled: int | None = Field(None, description="Number of pages the crawl fetched.")
+    pages_budget: int | None = Field(None, description="Number of pages the crawl was allowed to fetch.")
+    pages_truncated: int | None = Field(None, description="Number of pages cut at the maximum page size.")
+    sitemap_pages: int | None = Field(None, description="Number of contact pages picked from the website's "
+                                                        "sitemaps, if it has any.")
+    crawl_seconds: float | None = Field(None, description="Wall-clock duration of the crawl in seconds.")
+    deadline_reached: bool | None = Field(None, description="Whether the crawl was stopped at its deadline, "
+                                                            "its results being partial.")
+    dead_domain: str | None = Field(None, description="Why the website was not crawled, if it is dead, parked or "
+                                                      "redirects to social media: dns_failure, connection_refused, "
+                                                      "parked or social_redirect.")
+    goals_met: bool | None = Field(None, description="Whether the crawl ended on its completion goals, if it had any.")
+    structured_data: bool | None = Field(None, description="Whether the website declared contacts as structured data "
+                                                           "(JSON-LD, microdata or hCard).")
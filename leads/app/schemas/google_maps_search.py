@@ -1,4 +1,8 @@
-from pydantic import BaseModel, Field
+import threading
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class GoogleMapsSearchInput(BaseModel):
@@ -7,6 +11,17 @@ class GoogleMapsSearchInput(BaseModel):
     radius: int = Field(50000, description="Radius in meters for search.")
     min_rating: float = Field(0.0, description="Minimum rating for businesses.")
     max_results: int = Field(10, description="Maximum number of results to return.")
+    cache_only: bool = Field(False, description="Serve place details from the cache only, without calling the API.")
+    strategy: Literal["details", "inline"] | None = Field(
+        None, description="Search strategy: per-place details calls, or fields inline in the search response."
+    )
+    tiled: bool | None = Field(
+        None, description="Allow splitting the search area into tiles to get past the per-query result cap."
+    )
+    skip_known: bool | None = Field(
+        None, description="Skip places that were already stored as leads recently."
+    )
+    refresh: bool = Field(False, description="Run the search again instead of serving cached results.")
 
 
 class PlaceResult(BaseModel):
@@ -25,6 +40,81 @@ class PlaceResult(BaseModel):
     lng: float = Field(..., description="Longitude of the location.")
 
 
+class SearchStats(BaseModel):
+    candidates_prefiltered: int = Field(0, description="Candidates dropped using the search response fields alone.")
+    candidates_known: int = Field(0, description="Candidates skipped because they were stored as leads recently.")
+    candidates_examined: int = Field(0, description="Candidates whose qualification was decided, however it was.")
+    candidates_qualified: int = Field(0, description="Examined candidates that passed every filter.")
+    details_requested: int = Field(0, description="Number of place details lookups issued.")
+    details_used: int = Field(0, description="Number of place details responses that produced a result.")
+    cache_hits: int = Field(0, description="Place details served fresh from the cache.")
+    cache_refreshes: int = Field(0, description="Cached place details whose volatile fields were refetched.")
+    cache_misses: int = Field(0, description="Place details not found in the cache.")
+    cache_stale_hits: int = Field(0, description="Stale place details served in cache-only mode.")
+    api_calls: int = Field(0, description="Total number of Google Maps API requests made.")
+    api_calls_by_endpoint: dict[str, int] = Field(default_factory=dict, description="API requests per endpoint.")
+    bytes_received: int = Field(0, description="Approximate size of the decoded API responses in bytes.")
+    quota_retries: int = Field(0, description="Requests retried after a quota error.")
+    rate_limit_wait_seconds: float = Field(0.0, description="Time spent waiting on the shared rate limiter.")
+    tiles_searched: int = Field(0, description="Number of tiles searched in tiled mode.")
+    tiles_subdivided: int = Field(0, description="Number of tiles that hit the result cap and were subdivided.")
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def record_api_call(self, endpoint: str, response_bytes: int) -> None:
+        """Records one API request. Safe to call from concurrent worker threads."""
+        with self._lock:
+            self.api_calls += 1
+            self.api_calls_by_endpoint[endpoint] = self.api_calls_by_endpoint.get(endpoint, 0) + 1
+            self.bytes_received += response_bytes
+
+    def record_quota_retry(self) -> None:
+        """Records one request retried after a quota error."""
+        with self._lock:
+            self.quota_retries += 1
+
+    def record_rate_limit_wait(self, seconds: float) -> None:
+        """Records time spent waiting on the rate limiter."""
+        with self._lock:
+            self.rate_limit_wait_seconds += seconds
+
+    def record_tile(self, subdivided: bool) -> None:
+        """Records one searched tile. Safe to call from concurrent worker threads."""
+        with self._lock:
+            self.tiles_searched += 1
+            if subdivided:
+                self.tiles_subdivided += 1
+
+
+class SearchPlanEstimate(BaseModel):
+    mode: Literal["text", "nearby", "both", "tiled"] = Field(..., description="The searches run.")
+    text_fetch_limit: int = Field(..., description="Candidates requested from each Text Search, 0 if not run.")
+    nearby_fetch_limit: int = Field(..., description="Candidates requested from each Nearby Search, 0 if not run.")
+    tiles: int = Field(1, description="Number of tiles the search circle is split into.")
+    search_calls: int = Field(..., description="Estimated Text and Nearby Search requests.")
+    details_calls: int = Field(..., description="Estimated place details requests, ignoring the details cache.")
+    geocode_calls: int = Field(..., description="Geocoding requests, ignoring the geocode cache.")
+    total_calls: int = Field(..., description="Estimated API requests in total.")
+    estimated_cost_usd: float = Field(..., description="Estimated cost of the requests at list prices.")
+    estimated_seconds: float = Field(..., description="Estimated wall time of the search.")
+    candidate_capacity: int = Field(..., description="Most unique candidates the searches can return.")
+    sufficient: bool = Field(..., description="Whether the capacity covers the candidates needed.")
+
+
+class SearchPlan(BaseModel):
+    city: str | None = Field(None, description="City name the search is planned for.")
+    business_type: str | None = Field(..., description="Business type the search is planned for.")
+    max_results: int = Field(..., description="Maximum number of results requested.")
+    strategy: Literal["details", "inline"] = Field(..., description="The search strategy.")
+    pass_rate: float = Field(..., description="Expected share of examined candidates passing the filters.")
+    pass_rate_samples: float = Field(..., description="Weight of the recorded history behind the pass rate.")
+    over_fetch_factor: float = Field(..., description="Candidates fetched per result requested.")
+    candidates_needed: int = Field(..., description="Unique candidates to fetch to fill max_results.")
+    mode: Literal["text", "nearby", "both", "tiled"] = Field(..., description="The chosen searches.")
+    estimate: SearchPlanEstimate = Field(..., description="The estimate of the chosen searches.")
+    options: list[SearchPlanEstimate] = Field(..., description="The estimates of every feasible mode.")
+
+
 class SearchMetadata(BaseModel):
     city: str = Field(..., description="City name searched for.")
     business_type: str | None = Field(..., description="Business type searched for.")
@@ -33,6 +123,8 @@ class SearchMetadata(BaseModel):
     max_results: int = Field(..., description="Maximum number of results returned.")
     exclude_websites: bool = Field(..., description="Whether websites were excluded from results.")
     api_available: bool = Field(..., description="Whether the API is available.")
+    stats: SearchStats | None = Field(None, description="API usage statistics for the search.")
+    cached_at: datetime | None = Field(None, description="When the results were cached, if served from the search cache.")
 
 
 class GoogleMapsSearchOutput(BaseModel):
@@ -1,3 +1,4 @@
 from app.tools.contact_scraper import contact_scraper
-from app.tools.google_maps_search import google_maps_search, google_maps_high_rated_search, google_maps_nearby_search
+from app.tools.google_maps_search import google_maps_search, google_maps_high_rated_search, google_maps_nearby_search, \
+    stream_google_maps_search, stream_google_maps_batch_search, plan_google_maps_search
 from app.tools.visual_analysis import visual_analysis
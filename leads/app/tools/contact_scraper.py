@@ -1,12 +1,29 @@
+import asyncio
+import heapq
+import importlib.util
 import re
+import time
+from functools import cache
+from itertools import count
+from typing import Optional
 from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
 
-import requests
+import httpx
 from bs4 import BeautifulSoup
 from langchain_core.tools import tool
 from loguru import logger
 
+from app.core import Config
 from app.schemas import ContactScraperOutput, ContactScraperInput
+from app.tools.crawl_engine import CrawlEngine, get_crawl_engine
+from app.tools.domain_cache import (
+    PARKED, SOCIAL_REDIRECT, NegativeDomainCache, classify_connection_error, get_negative_domain_cache, is_parked_page,
+    on_host
+)
+from app.tools.phone_numbers import iter_phone_numbers, normalize_phone_number, phone_region
+from app.tools.sitemaps import parse_robots, parse_sitemap
+from app.tools.structured_data import EMAIL_REGEX, StructuredContacts, extract_structured_contacts
 
 
 class WebsiteUnreachableError(Exception):
@@ -14,14 +31,53 @@ class WebsiteUnreachableError(Exception):
     pass
 
 
+class DeadWebsiteError(WebsiteUnreachableError):
+    """Custom exception for websites that are parked, or only redirect to a social media page."""
+    pass
+
+
 class ScrapingError(Exception):
     """Custom exception for errors that occur during scraping."""
     pass
 
 
-class GlobalTimeoutLimitReached(Exception):
-    """Custom exception for when the global timeout limit is exceeded."""
-    pass
+def parse_crawl_goals(spec: str) -> dict[str, int]:
+    """
+    Parses crawl completion goals of the form "own_email,phone=1".
+
+    Args:
+        spec: Comma separated goals, each optionally followed by `=count`
+              (1 by default). See `ContactScraper.GOALS` for the goal names.
+
+    Returns:
+        A mapping of goal name to the count required.
+
+    Raises:
+        ValueError: If a goal is unknown or its count is not positive.
+    """
+    goals = {}
+    for pair in filter(None, (part.strip() for part in (spec or "").split(","))):
+        name, separator, required = pair.partition("=")
+        name = name.strip()
+        if name not in ContactScraper.GOALS or (separator and int(required) <= 0):
+            raise ValueError(f"Invalid crawl goal: {pair!r}")
+        goals[name] = int(required) if separator else 1
+    return goals
+
+
+@cache
+def default_html_parser() -> str:
+    """
+    Picks the BeautifulSoup parser of the scrapers: CONTACT_SCRAPER_HTML_PARSER
+    if set, otherwise lxml when it is installed, as it parses several times
+    faster than the built-in html.parser.
+
+    Returns:
+        The name of the parser, as passed to BeautifulSoup.
+    """
+    if Config.CONTACT_SCRAPER_HTML_PARSER:
+        return Config.CONTACT_SCRAPER_HTML_PARSER
+    return 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
 
 
 class ContactScraper:
@@ -44,12 +100,101 @@ class ContactScraper:
         '.css', '.js', '.xml', '.json'
     )
 
-    def __init__(self, url: str, max_links: int) -> None:
+    # Link keywords (in the URL path or the anchor text) of pages likely to hold contact details, with their weight
+    HIGH_YIELD_KEYWORDS = {
+        'contact': 10.0, 'kontakt': 10.0, 'impressum': 9.0, 'imprint': 9.0, 'get-in-touch': 8.0, 'find-us': 6.0,
+        'about': 6.0, 'team': 5.0, 'staff': 5.0, 'people': 4.0, 'location': 4.0, 'legal': 3.0, 'support': 3.0,
+    }
+    # Link keywords of pages that rarely hold contact details but often lead to many more such pages
+    LOW_YIELD_KEYWORDS = (
+        'blog', 'news', 'post', 'tag', 'category', 'archive', 'page', 'product', 'shop', 'cart', 'checkout',
+        'login', 'account', 'search', 'feed', 'wp-',
+    )
+    # Crawl completion goals: what they count
+    GOALS = {
+        'email': "emails",
+        'own_email': "emails on the website's own domain",
+        'phone': "phone numbers",
+        'social': "social media links",
+    }
+
+    # Domains of the social media profiles collected
+    SOCIAL_MEDIA_DOMAINS = (
+        'linkedin.com', 'twitter.com', 'facebook.com',
+        'instagram.com', 'github.com', 'youtube.com'
+    )
+
+    # Containers whose links are site-wide navigation, where contact pages are usually linked from
+    BOILERPLATE_CONTAINERS = ('footer', 'header', 'nav')
+
+    # Kinds of links, as classified by `_classify_href`
+    HREF_MAILTO = 'mailto'
+    HREF_TEL = 'tel'
+    HREF_SOCIAL = 'social'
+    HREF_INTERNAL = 'internal'
+    HREF_IGNORED = 'ignored'
+
+    # robots.txt files are read up to 500 KB, as by search engines, and at most MAX_SITEMAPS sitemaps per crawl,
+    # sitemap indexes included
+    MAX_ROBOTS_BYTES = 500_000
+    MAX_SITEMAPS = 3
+    MAX_SITEMAP_BYTES = 5_000_000
+    # Sitemaps of an index listing posts, products or archives rather than the pages of the business, read last
+    LOW_YIELD_SITEMAP_KEYWORDS = (
+        'post', 'product', 'category', 'tag', 'author', 'blog', 'news', 'archive', 'image', 'video',
+    )
+
+    # Patterns are compiled once, not on every page
+    # Dated paths are blog or news archives
+    DATED_PATH_REGEX = re.compile(r'/\d{4}/\d{1,2}/')
+
+    def __init__(
+            self,
+            url: str,
+            max_links: int,
+            deadline: float = 60.0,
+            engine: Optional[CrawlEngine] = None,
+            goals: Optional[dict[str, int]] = None,
+            trust_structured_data: bool = True,
+            html_parser: Optional[str] = None,
+            default_region: Optional[str] = None,
+            max_page_bytes: int = 2_000_000,
+            use_sitemaps: bool = True,
+            domain_cache: Optional[NegativeDomainCache] = None
+    ) -> None:
         """
         Initializes the ContactScraper with a starting URL.
 
         Args:
             url (str): The URL of the website to scrape.
+            max_links (int): The maximum number of links to follow from the starting URL.
+            deadline (float): The wall-clock budget of the whole crawl in seconds. Requests
+                              time out at the deadline at the latest, and the crawl returns
+                              what it found so far when it passes.
+            engine (CrawlEngine | None): The engine running the crawl. Defaults to the
+                                         engine shared by the process.
+            goals (dict[str, int] | None): Completion goals, as returned by `parse_crawl_goals`.
+                                           The crawl ends as soon as all of them are met.
+                                           Without goals, it runs until its budget is spent.
+            trust_structured_data (bool): Whether to end the crawl, and skip matching the page
+                                          text, once a business declares its phone number and
+                                          email as structured data (JSON-LD, microdata or hCard).
+            html_parser (str | None): The BeautifulSoup parser of the pages, e.g. 'lxml'.
+                                      Defaults to `default_html_parser()`.
+            default_region (str | None): The region of phone numbers written without a country
+                                         code, e.g. 'US'. Defaults to CONTACT_SCRAPER_DEFAULT_REGION.
+            max_page_bytes (int): The maximum number of bytes read of a page; larger pages
+                                  are cut, and counted in `pages_truncated`.
+            use_sitemaps (bool): Whether to read the robots.txt of the website, obeying its
+                                 disallow rules and crawl delay, and to pick the pages to
+                                 crawl from its sitemaps rather than by following links.
+            domain_cache (NegativeDomainCache | None): The cache of dead websites. Websites it
+                                                       knows are skipped, and those found dead,
+                                                       parked or redirecting to social media
+                                                       are recorded in it.
+
+        Raises:
+            ValueError: If the region is not supported.
         """
         if not urlparse(url).scheme:
             url = f"https://{url}"
@@ -58,25 +203,91 @@ class ContactScraper:
         self.start_url = url
         self.max_links = max_links
 
+        self.deadline = deadline
+        self.goals = goals or {}
+        self.trust_structured_data = trust_structured_data
+        self.html_parser = html_parser or default_html_parser()
+        self.default_region = default_region or Config.CONTACT_SCRAPER_DEFAULT_REGION
+        phone_region(self.default_region)
+        self.max_page_bytes = max_page_bytes
+        self.use_sitemaps = use_sitemaps
+        self.domain_cache = domain_cache
+        self.engine = engine or get_crawl_engine()
+
         parsed_url = urlparse(self.start_url)
         self.domain = parsed_url.netloc
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
         self.visited_urls = set()
+        # Pages whose fetch completed; fetches cancelled when the crawl ends are not counted
+        self.pages_fetched = 0
+        self.pages_truncated = 0
+        # Heap of (-score, discovery order, depth, url), so the most promising page is crawled first
+        self.frontier: list[tuple[float, int, int, str]] = []
+        self.frontier_scores: dict[str, float] = {}
+        self._discovery = count()
+        self._parsing: Optional[asyncio.Future] = None
+        # The rules of the website's robots.txt, once read
+        self.robots: Optional[RobotFileParser] = None
+        # Whether the links of crawled pages are followed; not when the pages come from the sitemaps
+        self.link_discovery = True
+        # Number of pages picked from the sitemaps, if any
+        self.sitemap_pages: Optional[int] = None
         self.contacts = {
             "emails": set(),
             "phone_numbers": set(),
             "social_media": set()
         }
-        self.timeout_count = 0
-        self.max_timeouts = 5
+        # Whether any page declared contacts as structured data, and whether they were complete
+        self.structured_data_found = False
+        self.structured_data_complete = False
+        # Event loop time the crawl must end by, once started
+        self._deadline_at: Optional[float] = None
+        self.deadline_reached = False
+        # Why the website is not worth crawling, if it is dead, parked or redirects to social media
+        self.dead_domain: Optional[str] = None
+
+    def _request_timeout(self) -> float:
+        """The timeout of a request: the engine's timeout, or the time left before the deadline if shorter."""
+        if self._deadline_at is None:
+            return self.engine.timeout
+        remaining = self._deadline_at - asyncio.get_running_loop().time()
+        return max(0.0, min(self.engine.timeout, remaining))
+
+    async def _record_dead_domain(self, failure: str, detail: str) -> None:
+        """Records the website in the domain cache as dead, parked or redirecting to social media."""
+        self.dead_domain = failure
+        if self.domain_cache is not None:
+            # The database is not queried from the engine's event loop, which runs every crawl
+            await asyncio.to_thread(self.domain_cache.record, self.start_url, failure, detail)
+
+    async def _check_start_page(self, final_url: str, html: str) -> None:
+        """
+        Checks that the start page belongs to the business: neither a parked
+        domain, nor a redirect to a social media page, which is kept as the
+        business's profile.
+
+        Args:
+            final_url (str): The URL of the start page, after redirects.
+            html (str): The HTML content of the start page.
 
-    def _fetch_html(self, url: str) -> str | None:
+        Raises:
+            DeadWebsiteError: If the website is parked or redirects to social media.
+        """
+        if on_host(final_url, self.SOCIAL_MEDIA_DOMAINS) and not on_host(self.start_url, self.SOCIAL_MEDIA_DOMAINS):
+            self.contacts["social_media"].add(final_url)
+            await self._record_dead_domain(SOCIAL_REDIRECT, final_url)
+            raise DeadWebsiteError(f"{self.start_url} redirects to {final_url}.")
+        if is_parked_page(final_url, html):
+            await self._record_dead_domain(PARKED, final_url)
+            raise DeadWebsiteError(f"{self.start_url} is a parked domain.")
+
+    async def _fetch_html(self, url: str) -> str | None:
         """
         Fetches the HTML content of a given URL.
 
+        The content type is checked before the body is downloaded, and pages
+        larger than `max_page_bytes` are cut, the contacts of their beginning
+        still being scraped.
+
         Args:
             url (str): The URL to fetch the HTML from.
 
@@ -85,161 +296,494 @@ class ContactScraper:
 
         Raises:
             WebsiteUnreachableError: If the initial URL cannot be reached.
+            DeadWebsiteError: If the website is parked or redirects to social media.
         """
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
-            if 'text/html' not in response.headers.get('Content-Type', ''):
+            # Raises an HTTPStatusError for bad responses (4xx or 5xx)
+            page = await self.engine.fetch_text(
+                url, timeout=self._request_timeout(), max_bytes=self.max_page_bytes
+            )
+            if page is None:
                 logger.debug(f"Skipping non-HTML content at {url}")
                 return None
-            return response.text
-        except requests.exceptions.Timeout as e:
-            self.timeout_count += 1
-            logger.warning(f"Timeout fetching {url}. Total timeouts: {self.timeout_count}/{self.max_timeouts}")
-            if self.timeout_count >= self.max_timeouts:
-                raise GlobalTimeoutLimitReached(f"Global timeout limit of {self.max_timeouts} reached.") from e
+            if page.truncated:
+                self.pages_truncated += 1
+                logger.warning(f"Page {url} is larger than {self.max_page_bytes} bytes, only its beginning is scraped.")
+            if url == self.start_url:
+                await self._check_start_page(page.url, page.text)
+            return page.text
+        except httpx.TimeoutException:
+            logger.warning(f"Timeout fetching {url}.")
             return None
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Could not fetch URL {url}: {e}")
             if url == self.start_url:
+                failure = classify_connection_error(e)
+                if failure:
+                    await self._record_dead_domain(failure, str(e))
                 raise WebsiteUnreachableError(f"The initial URL {url} is unreachable.") from e
             return None
 
-    def _extract_emails(self, soup: BeautifulSoup, page_text: str) -> None:
+    async def _fetch_site_file(self, url: str, content_types: tuple[str, ...], max_bytes: int) -> str | None:
         """
-        Extracts email addresses from page text and mailto links.
+        Fetches a file describing the website, i.e. its robots.txt or a sitemap.
 
         Args:
-            soup (BeautifulSoup): The BeautifulSoup object of the page.
-            page_text (str): The pre-extracted text content of the page.
-        """
-        email_regex = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+            url (str): The URL of the file.
+            content_types (tuple[str, ...]): The content types the file may have. Catch-all
+                                             pages answering for missing files are skipped.
+            max_bytes (int): The maximum number of bytes to read.
 
-        # 1. Find in all page text (using the provided text)
-        emails_in_text = re.findall(email_regex, page_text)
-        for email in emails_in_text:
-            self.contacts["emails"].add(email)
+        Returns:
+            str | None: The content of the file, or None if it is missing or cannot be fetched.
+        """
+        try:
+            page = await self.engine.fetch_text(
+                url, timeout=self._request_timeout(), max_bytes=max_bytes, content_types=content_types
+            )
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not fetch {url}: {e}")
+            return None
+        return page.text if page else None
 
-        # 2. Find in 'mailto:' links
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
+    async def _read_robots(self) -> None:
+        """
+        Reads the robots.txt of the website. Its disallow rules apply to every
+        page of the crawl, and its crawl delay to every request to the host.
+        A website without a robots.txt, or whose robots.txt cannot be
+        fetched, allows everything.
+        """
+        text = await self._fetch_site_file(
+            urljoin(self.start_url, '/robots.txt'), ('text/plain',), self.MAX_ROBOTS_BYTES
+        )
+        self.robots = parse_robots(text or '')
+        delay = self.robots.crawl_delay(self.engine.user_agent)
+        if delay:
+            logger.info(f"robots.txt of {self.start_url} asks for {delay}s between requests.")
+            self.engine.set_host_delay(self.start_url, float(delay))
+
+    def _allowed(self, url: str) -> bool:
+        """Checks whether the website's robots.txt allows crawling a page. Always true before it is read."""
+        return self.robots is None or self.robots.can_fetch(self.engine.user_agent, url)
+
+    def _is_low_yield_sitemap(self, url: str) -> bool:
+        name = urlparse(url).path.rsplit('/', 1)[-1].lower()
+        return any(keyword in name for keyword in self.LOW_YIELD_SITEMAP_KEYWORDS)
+
+    async def _seed_from_sitemaps(self) -> dict[str, float]:
+        """
+        Picks the pages of the crawl from the website's sitemaps: those listed
+        in its robots.txt, or /sitemap.xml. Sitemap indexes are followed,
+        sitemaps of the business's own pages before those of its posts or
+        products, which are only read when there are no others.
 
-            # Filter out irrelevant links before processing
-            path = urlparse(href).path.lower()
+        Only the pages whose path has a contact keyword (contact, about, team,
+        impressum...) are kept. The frontier is left untouched, as the start
+        page may be parsed meanwhile; see `_apply_sitemap_pages`.
 
-            if any(path.endswith(ext) for ext in self.IGNORED_EXTENSIONS):
-                continue
+        Returns:
+            dict[str, float]: The score of each page picked, empty without sitemaps or contact pages.
+        """
+        queue = list(self.robots.site_maps() or []) if self.robots else []
+        queue = queue or [urljoin(self.start_url, '/sitemap.xml')]
+        candidates: dict[str, float] = {}
+        sitemaps_read = 0
+        while queue and sitemaps_read < self.MAX_SITEMAPS:
+            if candidates and self._is_low_yield_sitemap(queue[0]):
+                break
+            sitemap_url = queue.pop(0)
+            sitemaps_read += 1
+            text = await self._fetch_site_file(sitemap_url, ('xml',), self.MAX_SITEMAP_BYTES)
+            entries = parse_sitemap(text or '')
+            queue.extend(entries.sitemaps)
+            # Stable, so sitemaps keep the order of their index
+            queue.sort(key=self._is_low_yield_sitemap)
+            for loc in entries.pages:
+                kind, page_url = self._classify_href(sitemap_url, loc)
+                if kind != self.HREF_INTERNAL:
+                    continue
+                score = self._score_link(page_url, '', False, 1, 0)
+                if score > 0:
+                    candidates[page_url] = max(score, candidates.get(page_url, score))
 
-            if href.startswith('mailto:'):
-                # Extract email from href, remove 'mailto:' and potential query params
-                email = href.replace('mailto:', '', 1).split('?')[0]
-                if re.fullmatch(email_regex, email):
-                    self.contacts["emails"].add(email)
+        return candidates
 
-    def _extract_phone_numbers(self, soup: BeautifulSoup, page_text: str) -> None:
+    def _apply_sitemap_pages(self, candidates: dict[str, float]) -> None:
         """
-        Extracts phone numbers from page text and 'tel:' links using regex.
-        This regex is designed to find various common phone number formats.
+        Replaces the frontier with the pages picked from the sitemaps, and
+        stops following links, so the budget is not spent reaching them
+        through the navigation. Without such pages the crawl keeps
+        discovering links.
+
+        Called on the event loop between two parses, never while a page is
+        parsed in its worker thread, as parsing adds links to the frontier.
 
         Args:
-            soup (BeautifulSoup): The BeautifulSoup object of the page.
-            page_text (str): The pre-extracted text content of the page.
-        """
-        # 1. Find in all page text (using the provided text)
-        phone_regex = r'(\+?\d{1,3}[-.\s]?)?(\(?\d{3}\)?[-.\s]?)?[\d\s.-]{7,10}'
-        phone_numbers_in_text = re.findall(phone_regex, page_text)
-        for match in phone_numbers_in_text:
-            phone_number = "".join(match).strip()
-            # Validate to avoid matching random numbers, ensuring at least 7 digits
-            if len(re.sub(r'\D', '', phone_number)) >= 7:
-                self.contacts["phone_numbers"].add(phone_number)
-
-        # 2. Find in 'tel:' links
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
+            candidates (dict[str, float]): The pages picked by `_seed_from_sitemaps`, with their score.
+        """
+        if not candidates:
+            logger.info(f"No contact pages in the sitemaps of {self.start_url}; following links instead.")
+            return
+
+        # Links of the start page, found while the sitemaps were read, are dropped
+        self.link_discovery = False
+        self.sitemap_pages = len(candidates)
+        self.frontier.clear()
+        self.frontier_scores.clear()
+        for page_url, score in candidates.items():
+            self._enqueue(page_url, score, 1)
+        logger.info(f"Crawling {len(candidates)} pages of the sitemaps of {self.start_url}.")
 
-            # Filter out irrelevant links before processing
-            path = urlparse(href).path.lower()
+    def _extract_from_text(self, page_text: str) -> None:
+        """
+        Extracts email addresses and phone numbers from the text of a page.
+        Phone numbers are validated and normalized to E.164, so the same
+        number written differently is only kept once.
 
-            if any(path.endswith(ext) for ext in self.IGNORED_EXTENSIONS):
-                continue
+        Args:
+            page_text (str): The text content of the page.
+        """
+        for email in EMAIL_REGEX.findall(page_text):
+            self.contacts["emails"].add(email)
 
-            if href.startswith('tel:'):
-                phone_number = href.replace('tel:', '', 1).strip()
-                self.contacts["phone_numbers"].add(phone_number)
+        self.contacts["phone_numbers"].update(iter_phone_numbers(page_text, self.default_region))
 
-    def _extract_social_media(self, soup: BeautifulSoup) -> None:
+    def _add_phone_number(self, phone_number: str) -> None:
         """
-        Extracts social media links from the parsed HTML.
+        Adds a phone number the website declares as one, in a 'tel:' link or
+        in structured data: normalized to E.164 when valid, as written otherwise.
 
         Args:
-            soup (BeautifulSoup): The BeautifulSoup object of the page.
+            phone_number (str): The phone number as written.
         """
-        social_media_patterns = [
-            'linkedin.com', 'twitter.com', 'facebook.com',
-            'instagram.com', 'github.com', 'youtube.com'
-        ]
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-
-            # Filter out irrelevant links before processing
-            path = urlparse(href).path.lower()
+        phone_number = phone_number.strip()
+        if phone_number:
+            self.contacts["phone_numbers"].add(normalize_phone_number(phone_number, self.default_region) or phone_number)
 
-            if any(path.endswith(ext) for ext in self.IGNORED_EXTENSIONS):
-                continue
+    def _classify_href(self, page_url: str, href: str) -> tuple[str, str]:
+        """
+        Classifies the target of a link.
 
-            if any(pattern in href for pattern in social_media_patterns):
-                self.contacts["social_media"].add(href)
+        Args:
+            page_url (str): The URL of the page holding the link.
+            href (str): The href of the link.
 
-    def _crawl(self, url: str) -> None:
+        Returns:
+            tuple[str, str]: The kind of link, one of the `HREF_*` constants, and its value:
+                             the email of a mailto link, the phone number of a tel link,
+                             the URL without fragment of an internal page, or the href.
         """
-        Recursively crawls a website starting from the given URL.
+        if href.startswith('mailto:'):
+            # Remove 'mailto:' and potential query params
+            email = href[len('mailto:'):].split('?')[0]
+            return (self.HREF_MAILTO, email) if EMAIL_REGEX.fullmatch(email) else (self.HREF_IGNORED, href)
+        if href.startswith('tel:'):
+            return self.HREF_TEL, href[len('tel:'):].strip()
+
+        parsed_link = urlparse(urljoin(page_url, href))
+        if parsed_link.path.lower().endswith(self.IGNORED_EXTENSIONS):
+            return self.HREF_IGNORED, href
+        if any(pattern in href for pattern in self.SOCIAL_MEDIA_DOMAINS):
+            return self.HREF_SOCIAL, href
+        if parsed_link.scheme not in ('http', 'https') or parsed_link.netloc != self.domain:
+            return self.HREF_IGNORED, href
+
+        # Reconstruct link without fragments
+        clean_link = f"{parsed_link.scheme}://{parsed_link.netloc}{parsed_link.path}"
+        if parsed_link.query:
+            clean_link += f"?{parsed_link.query}"
+        return self.HREF_INTERNAL, clean_link
+
+    def _add_structured_contacts(self, structured: StructuredContacts) -> None:
+        """
+        Adds the contacts a page declares as structured data.
 
         Args:
-            url (str): The URL to crawl.
+            structured (StructuredContacts): The structured data contacts of the page.
         """
-        if url in self.visited_urls or urlparse(url).netloc != self.domain:
+        if not structured:
             return
+        self.structured_data_found = True
+        self.contacts["emails"].update(structured.emails)
+        for phone_number in structured.phone_numbers:
+            self._add_phone_number(phone_number)
+        self.contacts["social_media"].update(
+            link for link in structured.links if any(pattern in link for pattern in self.SOCIAL_MEDIA_DOMAINS)
+        )
+
+    @classmethod
+    def _in_boilerplate(cls, a_tag, known: dict[int, bool]) -> bool:
+        """
+        Checks whether a link sits in the footer, header or navigation of its page.
 
-        if len(self.visited_urls) > self.max_links:
-            return
+        Args:
+            a_tag: The link.
+            known (dict[int, bool]): The answers for the elements of the page checked so far,
+                                     by element id, so links sharing ancestors do not walk
+                                     them again. Updated in place.
+        """
+        walked = []
+        result = False
+        for parent in a_tag.parents:
+            if id(parent) in known:
+                result = known[id(parent)]
+                break
+            walked.append(id(parent))
+            if parent.name in cls.BOILERPLATE_CONTAINERS:
+                result = True
+                break
+            markers = ' '.join([parent.get('id') or '', *(parent.get('class') or [])]).lower() if parent.attrs else ''
+            if any(container in markers for container in cls.BOILERPLATE_CONTAINERS):
+                result = True
+                break
+        for element in walked:
+            known[element] = result
+        return result
+
+    @classmethod
+    def _score_link(cls, url: str, anchor_text: str, in_boilerplate: bool, depth: int, contact_links: int) -> float:
+        """
+        Scores how likely a linked page is to hold contact details.
 
-        logger.info(f"Scraping: {url}")
-        self.visited_urls.add(url)
+        Args:
+            url (str): The absolute URL of the linked page.
+            anchor_text (str): The text of the link.
+            in_boilerplate (bool): Whether the link is in the footer, header or navigation.
+            depth (int): The number of links followed from the start page to reach the page.
+            contact_links (int): The number of 'tel:' and 'mailto:' links on the linking page.
 
-        html = self._fetch_html(url)
-        if not html:
+        Returns:
+            float: The score of the page; pages with higher scores are crawled first.
+        """
+        parsed = urlparse(url)
+        path = parsed.path.lower()
+        text = anchor_text.lower()
+
+        score = max(
+            (weight for keyword, weight in cls.HIGH_YIELD_KEYWORDS.items() if keyword in path or keyword in text),
+            default=0.0
+        )
+        if any(keyword in path for keyword in cls.LOW_YIELD_KEYWORDS):
+            score -= 4.0
+        if cls.DATED_PATH_REGEX.search(path):
+            score -= 4.0
+        if parsed.query:
+            score -= 2.0
+        if in_boilerplate:
+            score += 3.0
+        # Pages dense in contact links tend to link to other contact-rich pages, e.g. per-location pages.
+        score += min(contact_links, 5) * 0.5
+        return score - depth
+
+    def _enqueue(self, url: str, score: float, depth: int) -> None:
+        """
+        Adds a page to the frontier, or raises its priority if it was queued with a lower score.
+        Pages the website's robots.txt disallows are never queued.
+        """
+        if url in self.visited_urls or score <= self.frontier_scores.get(url, float('-inf')):
+            return
+        if not self._allowed(url):
+            logger.debug(f"robots.txt disallows {url}")
             return
+        self.frontier_scores[url] = score
+        heapq.heappush(self.frontier, (-score, next(self._discovery), depth, url))
+
+    def _extract_links(self, url: str, soup: BeautifulSoup, depth: int) -> None:
+        """
+        Walks the links of a crawled page once: collects its mailto, tel and
+        social media links, and adds its same-domain links to the frontier.
+
+        Args:
+            url (str): The URL of the crawled page.
+            soup (BeautifulSoup): The BeautifulSoup object of the page.
+            depth (int): The depth of the crawled page.
+        """
+        internal_links = []
+        contact_links = 0
+        for a_tag in soup.find_all('a', href=True):
+            kind, value = self._classify_href(url, a_tag['href'])
+            if kind == self.HREF_MAILTO:
+                self.contacts["emails"].add(value)
+                contact_links += 1
+            elif kind == self.HREF_TEL:
+                self._add_phone_number(value)
+                contact_links += 1
+            elif kind == self.HREF_SOCIAL:
+                self.contacts["social_media"].add(value)
+            elif kind == self.HREF_INTERNAL and self.link_discovery and value not in self.visited_urls:
+                internal_links.append((a_tag, value))
+
+        # Links are scored once the page's count of contact links is known
+        boilerplate: dict[int, bool] = {}
+        for a_tag, link in internal_links:
+            score = self._score_link(
+                link, a_tag.get_text(' ', strip=True), self._in_boilerplate(a_tag, boilerplate), depth + 1,
+                contact_links
+            )
+            self._enqueue(link, score, depth + 1)
+
+    def _is_own_email(self, email: str) -> bool:
+        """Checks whether an email address is on the website's domain or one of its subdomains."""
+        site_domain = self.domain.split(':')[0].lower().removeprefix('www.')
+        email_domain = email.rpartition('@')[2].lower()
+        return (
+            email_domain == site_domain
+            or email_domain.endswith(f".{site_domain}")
+            or site_domain.endswith(f".{email_domain}")
+        )
+
+    def _goal_progress(self, goal: str) -> int:
+        if goal == 'own_email':
+            return sum(1 for email in self.contacts["emails"] if self._is_own_email(email))
+        if goal == 'email':
+            return len(self.contacts["emails"])
+        if goal == 'phone':
+            return len(self.contacts["phone_numbers"])
+        return len(self.contacts["social_media"])
+
+    def _goals_met(self) -> bool:
+        """Checks whether every completion goal is met. Never true without goals."""
+        return bool(self.goals) and all(
+            self._goal_progress(goal) >= required for goal, required in self.goals.items()
+        )
+
+    def _scrape_page(self, url: str, html: str, depth: int) -> None:
+        """
+        Extracts the contact details of a fetched page and queues its links.
 
+        Args:
+            url (str): The URL of the page.
+            html (str): The HTML content of the page.
+            depth (int): The depth of the page.
+        """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            page_text = soup.get_text()  # Get text once to avoid errors and improve performance
+            soup = BeautifulSoup(html, self.html_parser)
+
+            # Structured data first: what the business declares about itself beats pattern matching.
+            structured = extract_structured_contacts(soup)
+            self._add_structured_contacts(structured)
+            complete = self.trust_structured_data and structured.complete
+
+            # With the phone and email declared, the costly regex pass over the page text is skipped.
+            if not complete:
+                self._extract_from_text(soup.get_text())
+            self._extract_links(url, soup, depth)
+            self.structured_data_complete |= complete
+        except Exception as e:
+            logger.error(f"Error while parsing {url}: {e}")
+            raise ScrapingError(f"Failed to parse content from {url}") from e
 
-            # Pass both soup object and page_text string to extraction methods
-            self._extract_emails(soup, page_text)
-            self._extract_phone_numbers(soup, page_text)
-            self._extract_social_media(soup)
+    async def _crawl(self, url: str) -> None:
+        """
+        Crawls a website starting from the given URL, most promising pages first.
 
-            for a_tag in soup.find_all('a', href=True):
-                link = a_tag['href']
+        Pages are taken from a priority frontier instead of being followed
+        recursively, so deep sites cannot exhaust the stack, and the
+        `max_links` budget is spent on the pages most likely to hold contact
+        details (contact, about and team pages, links from the footer or
+        navigation, pages linked from contact-rich pages) before blog
+        archives and other deep listings.
 
-                # Filter out irrelevant links before processing
-                path = urlparse(link).path.lower()
+        The crawl ends as soon as the completion goals are met, or a
+        business declares its phone number and email as structured data,
+        cancelling the fetches still in flight.
 
-                if any(path.endswith(ext) for ext in self.IGNORED_EXTENSIONS):
-                    continue
+        Up to the engine's per-host limit of pages are fetched concurrently,
+        always the best scored ones of the frontier. Pages are parsed in a
+        worker thread, so parsing never stalls the other crawls of the engine.
 
-                absolute_link = urljoin(url, link)
-                parsed_link = urlparse(absolute_link)
-                # Reconstruct link without fragments
-                clean_link = f"{parsed_link.scheme}://{parsed_link.netloc}{parsed_link.path}"
-                if parsed_link.query:
-                    clean_link += f"?{parsed_link.query}"
+        With `use_sitemaps`, the robots.txt of the website is read first, and
+        its sitemaps while the start page is fetched; see `_seed_from_sitemaps`.
 
-                self._crawl(clean_link)
-        except Exception as e:
-            logger.error(f"Error while parsing {url}: {e}")
-            raise ScrapingError(f"Failed to parse content from {url}") from e
+        Args:
+            url (str): The URL to start crawling from.
+        """
+        fetches: dict[asyncio.Task, tuple[str, int]] = {}
+        seeding: Optional[asyncio.Future] = None
+
+        try:
+            if self.use_sitemaps:
+                await self._read_robots()
+                if not self._allowed(url):
+                    logger.warning(f"robots.txt of {self.start_url} disallows crawling it.")
+                    return
+                seeding = asyncio.ensure_future(self._seed_from_sitemaps())
+            self._enqueue(url, float('inf'), 0)
+
+            while True:
+                # The sitemap pages are applied here, never while a page is being parsed
+                if seeding is not None and seeding.done():
+                    self._apply_sitemap_pages(seeding.result())
+                    seeding = None
+
+                # While the sitemaps are read, only the start page is fetched
+                while (
+                        self.frontier and len(fetches) < self.engine.max_connections_per_host
+                        and len(self.visited_urls) <= self.max_links
+                        and (seeding is None or not self.visited_urls)
+                ):
+                    _, _, depth, page_url = heapq.heappop(self.frontier)
+                    if page_url in self.visited_urls:
+                        # A stale entry of a page queued again with a higher score
+                        continue
+
+                    logger.info(f"Scraping: {page_url}")
+                    self.visited_urls.add(page_url)
+                    fetches[asyncio.create_task(self._fetch_html(page_url))] = (page_url, depth)
+
+                pending = [*fetches, *([seeding] if seeding is not None else [])]
+                if not pending:
+                    return
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fetch in done:
+                    if fetch is seeding:
+                        continue
+                    page_url, depth = fetches.pop(fetch)
+                    html = fetch.result()
+                    self.pages_fetched += 1
+                    if html:
+                        # Shielded, so a page being parsed when the deadline hits is completed, not abandoned.
+                        self._parsing = asyncio.ensure_future(
+                            asyncio.to_thread(self._scrape_page, page_url, html, depth)
+                        )
+                        await asyncio.shield(self._parsing)
+                        if self._goals_met():
+                            logger.info(
+                                f"Crawl goals {self.goals} met for {self.start_url} after "
+                                f"{self.pages_fetched} of {self.max_links + 1} pages."
+                            )
+                            return
+                        if self.structured_data_complete:
+                            logger.info(
+                                f"Structured data of {page_url} declares the business's contacts; ending the crawl "
+                                f"of {self.start_url} after {self.pages_fetched} of {self.max_links + 1} pages."
+                            )
+                            return
+        finally:
+            for fetch in fetches:
+                fetch.cancel()
+            if seeding is not None:
+                seeding.cancel()
+
+    async def _crawl_until_deadline(self) -> None:
+        """
+        Runs the crawl, stopping it with the results found so far once the
+        deadline passes. The deadline bounds the whole crawl, robots.txt and
+        sitemaps included, whatever the number of slow or hanging requests.
+        """
+        self._deadline_at = asyncio.get_running_loop().time() + self.deadline
+        try:
+            async with asyncio.timeout_at(self._deadline_at):
+                await self._crawl(self.start_url)
+        except TimeoutError:
+            self.deadline_reached = True
+            if self._parsing is not None:
+                await asyncio.wait([self._parsing])
+            logger.warning(
+                f"Crawl deadline of {self.deadline}s reached for {self.start_url} after "
+                f"{len(self.visited_urls)} pages. Returning what has been found so far."
+            )
 
     def run(self) -> ContactScraperOutput:
         """
@@ -247,18 +791,31 @@ class ContactScraper:
         and returns the collected contact information.
 
         Returns:
-            dict: A dictionary containing sets of emails, phone numbers,
-                  and social media links.
+            ContactScraperOutput: The emails, phone numbers and social media
+                                  links found, with the pages crawled out of
+                                  the budget.
         """
         logger.info(f"Starting scrape for {self.start_url}")
-        try:
-            self._crawl(self.start_url)
-        except GlobalTimeoutLimitReached as e:
-            logger.critical(f"{e} Aborting crawl. Returning what has been found so far.")
-        except (WebsiteUnreachableError, ScrapingError) as e:
-            logger.critical(f"A critical error occurred: {e}")
-
-        logger.success("Scraping finished.")
+        start = time.perf_counter()
+        known_failure = self.domain_cache.read(self.start_url) if self.domain_cache is not None else None
+        if known_failure:
+            self.dead_domain, detail = known_failure
+            logger.info(f"Skipping {self.start_url}: its domain is known to be dead ({self.dead_domain}).")
+            if self.dead_domain == SOCIAL_REDIRECT and detail:
+                self.contacts["social_media"].add(detail)
+        else:
+            try:
+                self.engine.run(self._crawl_until_deadline())
+            except DeadWebsiteError as e:
+                logger.warning(f"{e} Not crawling it.")
+            except (WebsiteUnreachableError, ScrapingError) as e:
+                logger.critical(f"A critical error occurred: {e}")
+        crawl_seconds = time.perf_counter() - start
+
+        logger.success(
+            f"Scraping of {self.start_url} finished in {crawl_seconds:.2f}s "
+            f"({self.pages_fetched} pages{', deadline reached' if self.deadline_reached else ''})."
+        )
         # Convert sets to lists for easier use (e.g., JSON serialization)
         final_contacts = {
             "emails": list(self.contacts["emails"]),
@@ -266,7 +823,19 @@ class ContactScraper:
             "social_media": list(self.contacts["social_media"])
         }
         logger.success(f"Found: {final_contacts}")
-        return ContactScraperOutput(**final_contacts)
+        return ContactScraperOutput(
+            **final_contacts,
+            # The start page plus `max_links` links
+            pages_budget=self.max_links + 1,
+            pages_crawled=self.pages_fetched,
+            pages_truncated=self.pages_truncated,
+            sitemap_pages=self.sitemap_pages,
+            crawl_seconds=crawl_seconds,
+            deadline_reached=self.deadline_reached,
+            dead_domain=self.dead_domain,
+            goals_met=self._goals_met() if self.goals else None,
+            structured_data=self.structured_data_found
+        )
 
 
 @tool(args_schema=ContactScraperInput)
@@ -277,6 +846,14 @@ def contact_scraper(url: str, max_links: int) -> ContactScraperOutput:
     all accessible pages within the same domain for contact details such as
     email addresses, phone numbers, and links to social media profiles.
     The collected information is deduplicated and returned in a structured format.
+    Crawls run concurrently on the shared crawl engine and stop at the
+    configured deadline with what they found so far, or as soon as the
+    configured completion goals are met. Contacts the website declares as
+    structured data (schema.org JSON-LD or microdata, hCard) are read first,
+    and end the crawl when they include both a phone number and an email.
+    The website's robots.txt is obeyed, and its contact pages are picked
+    from its sitemaps when it has any. Websites found dead, parked or
+    redirecting to social media are remembered, and skipped on later runs.
 
     Args:
         url (str): The base URL or domain name of the website to scrape.
@@ -285,7 +862,16 @@ def contact_scraper(url: str, max_links: int) -> ContactScraperOutput:
         ContactInfo: An object containing lists of found emails,
                      phone numbers, and social media links.
     """
-    scraper = ContactScraper(url, max_links)
+    scraper = ContactScraper(
+        url,
+        max_links,
+        deadline=Config.CONTACT_SCRAPER_DEADLINE_SECONDS,
+        goals=parse_crawl_goals(Config.CONTACT_SCRAPER_GOALS),
+        trust_structured_data=Config.CONTACT_SCRAPER_TRUST_STRUCTURED_DATA,
+        max_page_bytes=Config.CONTACT_SCRAPER_MAX_PAGE_BYTES,
+        use_sitemaps=Config.CONTACT_SCRAPER_USE_SITEMAPS,
+        domain_cache=get_negative_domain_cache()
+    )
     contact_info = scraper.run()
     return contact_info
 
@@ -0,0 +1,590 @@
+import asyncio
+import codecs
+import ipaddress
+import socket
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Coroutine, Iterable, Optional, TypeVar
+from urllib.parse import urlparse
+
+import httpcore
+import httpx
+from loguru import logger
+
+from app.core import Config
+
+T = TypeVar("T")
+
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/91.0.4472.124 Safari/537.36"
+)
+
+
+class FetchMetrics:
+    """
+    Counters of the fetches of a crawl engine, across all its crawls.
+
+    Updated from the engine's event loop and read from any thread with
+    `snapshot`, e.g. before and after a batch of leads, with `since` giving
+    the activity in between.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {
+            "requests": 0,
+            "responses_2xx": 0,
+            "responses_3xx": 0,
+            "responses_4xx": 0,
+            "responses_5xx": 0,
+            "errors_timeout": 0,
+            "errors_connect": 0,
+            "errors_other": 0,
+            "bytes_received": 0,
+            # Responses whose body was not read as their content type was not wanted, or was cut at the byte budget
+            "responses_skipped": 0,
+            "responses_truncated": 0,
+            # Time spent in requests, and waiting for a free slot or the politeness delay of their host
+            "fetch_seconds": 0.0,
+            "host_wait_seconds": 0.0,
+            "dns_hits": 0,
+            "dns_misses": 0,
+            "dns_failures": 0,
+        }
+
+    def add(self, **increments: float) -> None:
+        """Adds to counters, e.g. `add(requests=1, fetch_seconds=0.2)`."""
+        with self._lock:
+            for name, increment in increments.items():
+                self._counters[name] = self._counters.get(name, 0) + increment
+
+    def snapshot(self) -> dict[str, float]:
+        """Returns a copy of the counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def since(self, snapshot: dict[str, float]) -> dict[str, float]:
+        """Returns the increments of the counters since a previous snapshot."""
+        return {name: value - snapshot.get(name, 0) for name, value in self.snapshot().items()}
+
+
+class DnsCache:
+    """
+    Caches host name resolutions of a crawl engine, so the many requests of a
+    crawl, and the crawls of leads sharing a host, resolve it once.
+
+    Failed resolutions are cached too, for a shorter time, so a dead domain
+    does not make every page of its crawl wait for the resolver again.
+    Concurrent resolutions of the same host share one lookup. Only used from
+    the engine's event loop.
+    """
+
+    def __init__(self, metrics: FetchMetrics, ttl: float = 300.0, negative_ttl: float = 30.0) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            metrics: The metrics to count hits, misses and failures in.
+            ttl: Seconds a resolution is reused for.
+            negative_ttl: Seconds a failed resolution is remembered for.
+        """
+        self.metrics = metrics
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # host -> (expires at, addresses, or the error of a failed resolution)
+        self._entries: dict[str, tuple[float, list[str] | OSError]] = {}
+        self._lookups: dict[str, asyncio.Future] = {}
+
+    async def _lookup(self, host: str) -> list[str] | OSError:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        except OSError as e:
+            self._entries[host] = (time.monotonic() + self.negative_ttl, e)
+            return e
+        # Deduplicated, in the order of preference of the resolver
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._entries[host] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    async def resolve(self, host: str) -> list[str]:
+        """
+        Resolves a host name to its addresses. IP addresses resolve to themselves.
+
+        Args:
+            host: The host name.
+
+        Returns:
+            The addresses of the host, most preferred first.
+
+        Raises:
+            OSError: If the host cannot be resolved.
+        """
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        entry = self._entries.get(host)
+        if entry is not None and entry[0] > time.monotonic():
+            self.metrics.add(dns_hits=1)
+            result = entry[1]
+        else:
+            lookup = self._lookups.get(host)
+            if lookup is None:
+                self.metrics.add(dns_misses=1)
+                lookup = self._lookups[host] = asyncio.ensure_future(self._lookup(host))
+                lookup.add_done_callback(lambda _: self._lookups.pop(host, None))
+            else:
+                self.metrics.add(dns_hits=1)
+            result = await asyncio.shield(lookup)
+
+        if isinstance(result, OSError):
+            self.metrics.add(dns_failures=1)
+            # A new error of the same type, e.g. socket.gaierror, as the cached one may be raised again
+            raise type(result)(*result.args)
+        return result
+
+
+class _CachedDnsNetworkBackend(httpcore.AsyncNetworkBackend):
+    """An httpcore network backend connecting to the addresses of a DNS cache, in order."""
+
+    def __init__(self, dns_cache: DnsCache) -> None:
+        self.dns_cache = dns_cache
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+            self,
+            host: str,
+            port: int,
+            timeout: Optional[float] = None,
+            local_address: Optional[str] = None,
+            socket_options: Optional[Iterable[Any]] = None
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self.dns_cache.resolve(host)
+        except OSError as e:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {e}") from e
+
+        error = None
+        for address in addresses:
+            try:
+                # TLS still verifies and sends the host name, not the address
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(
+            self,
+            path: str,
+            timeout: Optional[float] = None,
+            socket_options: Optional[Iterable[Any]] = None
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _CachedDnsTransport(httpx.AsyncHTTPTransport):
+    """
+    An httpx transport resolving host names through a DNS cache.
+
+    httpx has no public hook for name resolution, so the connection pool of
+    the transport is replaced by one with a resolving network backend,
+    configured like httpx configures its own. The pool is a private
+    attribute of httpx 0.28, which pyproject.toml pins for this reason.
+    Proxies from the environment are unaffected: the client sends their
+    requests through transports of its own.
+    """
+
+    def __init__(
+            self,
+            dns_cache: DnsCache,
+            limits: httpx.Limits,
+            verify: bool = True,
+            trust_env: bool = True,
+            http1: bool = True,
+            http2: bool = False,
+            retries: int = 0
+    ) -> None:
+        super().__init__(
+            verify=verify, trust_env=trust_env, http1=http1, http2=http2, limits=limits, retries=retries
+        )
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(verify=verify, trust_env=trust_env),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=http1,
+            http2=http2,
+            retries=retries,
+            network_backend=_CachedDnsNetworkBackend(dns_cache),
+        )
+
+
+class FetchedText:
+    """The text of a fetched page, read and decoded up to a byte budget."""
+
+    def __init__(self, url: str, status_code: int, content_type: str, text: str, bytes_read: int,
+                 truncated: bool) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.content_type = content_type
+        self.text = text
+        self.bytes_read = bytes_read
+        # Whether the body was cut at the byte budget, so `text` is only its beginning
+        self.truncated = truncated
+
+
+def _text_decoder(response: httpx.Response) -> codecs.IncrementalDecoder:
+    """An incremental decoder for the charset of a response, UTF-8 when it declares none or an unknown one."""
+    encoding = response.charset_encoding or "utf-8"
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = "utf-8"
+    return codecs.getincrementaldecoder(encoding)(errors="replace")
+
+
+class _AddressState:
+    """Request slots of an IP address, with the number of requests holding or waiting for one."""
+
+    def __init__(self, slots: int) -> None:
+        self.slots = asyncio.Semaphore(slots)
+        self.users = 0
+        self.last_used_at = time.monotonic()
+
+    def is_idle(self, now: float, expiry: float) -> bool:
+        """Whether no request has used the slots for `expiry` seconds, so they can be dropped."""
+        return not self.users and now - self.last_used_at > expiry
+
+
+class _HostState(_AddressState):
+    """Politeness state of a host: its free request slots and when its next request may start."""
+
+    def __init__(self, slots: int) -> None:
+        super().__init__(slots)
+        self.next_request_at = 0.0
+        # The crawl delay the host asks for in its robots.txt, if longer than the engine's delay
+        self.delay: Optional[float] = None
+
+    def is_idle(self, now: float, expiry: float) -> bool:
+        return super().is_idle(now, expiry) and self.next_request_at <= now
+
+
+class CrawlEngine:
+    """
+    Runs the website crawls of the process concurrently on one background event loop.
+
+    Crawls are coroutines submitted from any thread with `run`, which blocks
+    the calling thread until its crawl finishes. Their requests share one
+    pooled httpx client, which keeps connections alive between requests and
+    resolves host names through a shared DNS cache, so the number of open
+    connections is capped for the whole process and TLS handshakes and DNS
+    lookups are not repeated.
+
+    Requests are polite to the sites crawled, however many crawls target
+    them: at most `max_connections_per_host` requests go to the same host at
+    once, and consecutive requests to it start at least `host_delay` seconds
+    apart. As leads on the same hosting provider often share a server, at
+    most `max_connections_per_address` requests go to the same IP address
+    at once, whatever their host. Every fetch is counted in `metrics`.
+    """
+
+    def __init__(
+            self,
+            max_connections: int = 50,
+            max_connections_per_host: int = 4,
+            timeout: float = 10.0,
+            user_agent: str = _USER_AGENT,
+            transport: Optional[httpx.AsyncBaseTransport] = None,
+            host_delay: float = 0.0,
+            max_connections_per_address: int = 16,
+            dns_ttl: float = 300.0,
+            keepalive_expiry: float = 30.0,
+            idle_host_expiry: float = 300.0
+    ) -> None:
+        """
+        Initializes the crawl engine. The event loop starts with the first crawl.
+
+        Args:
+            max_connections: The maximum number of open connections across all crawls.
+            max_connections_per_host: The maximum number of concurrent requests to a host.
+            timeout: The default timeout of each request in seconds.
+            user_agent: The User-Agent header sent with every request.
+            transport: Optional httpx transport to send the requests through, e.g. for tests.
+                       Host names are then not resolved by the engine, and the per address
+                       limit applies to hosts.
+            host_delay: The minimum number of seconds between the starts of two requests to a host.
+            max_connections_per_address: The maximum number of concurrent requests to an IP address.
+            dns_ttl: The number of seconds host name resolutions are cached for.
+            keepalive_expiry: The number of seconds an idle connection is kept open for.
+            idle_host_expiry: The number of seconds the politeness state of a host or an
+                              address no request went to is kept for. A host whose state
+                              was dropped gets the engine's `host_delay` until its robots.txt
+                              is read again.
+        """
+        self.max_connections = max(1, max_connections)
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.transport = transport
+        self.host_delay = max(0.0, host_delay)
+        self.max_connections_per_address = max(1, max_connections_per_address)
+        self.keepalive_expiry = keepalive_expiry
+        self.idle_host_expiry = idle_host_expiry
+
+        self.metrics = FetchMetrics()
+        self.dns_cache = DnsCache(self.metrics, ttl=dns_ttl)
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        # Only touched from the event loop
+        self._hosts: dict[str, _HostState] = {}
+        self._addresses: dict[str, _AddressState] = {}
+        self._next_eviction_at = 0.0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="crawl-engine", daemon=True).start()
+                self._loop = loop
+                logger.info("Crawl engine event loop started.")
+            return self._loop
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """
+        Runs a crawl on the engine's event loop and waits for its result.
+
+        Must not be called from the engine's own event loop.
+
+        Args:
+            coroutine: The crawl to run.
+
+        Returns:
+            The result of the crawl.
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+        try:
+            return future.result()
+        except BaseException:
+            # An interrupted caller must not leave its crawl running in the background.
+            future.cancel()
+            raise
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry
+            )
+            self._client = httpx.AsyncClient(
+                limits=limits,
+                timeout=self.timeout,
+                headers={"User-Agent": self.user_agent},
+                follow_redirects=True,
+                transport=self.transport or _CachedDnsTransport(self.dns_cache, limits),
+            )
+        return self._client
+
+    async def _address_of(self, host: str) -> str:
+        """The IP address requests to a host go to, or the host itself when the engine does not resolve names."""
+        if self.transport is not None:
+            return host
+        try:
+            return (await self.dns_cache.resolve(host))[0]
+        except OSError as e:
+            raise httpx.ConnectError(f"Could not resolve {host}: {e}") from e
+
+    def _host_state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.max_connections_per_host)
+        return state
+
+    def _evict_idle_hosts(self) -> None:
+        """Drops the state of the hosts and addresses no request went to lately, at most once per expiry."""
+        now = time.monotonic()
+        if now < self._next_eviction_at:
+            return
+        self._next_eviction_at = now + self.idle_host_expiry
+        for states in (self._hosts, self._addresses):
+            for key in [key for key, state in states.items() if state.is_idle(now, self.idle_host_expiry)]:
+                del states[key]
+
+    def set_host_delay(self, url: str, delay: float) -> None:
+        """
+        Sets the minimum delay between requests to the host of a URL, e.g. the
+        crawl delay of its robots.txt. Delays shorter than the engine's
+        `host_delay` do not shorten it. Must be called from the engine's event loop.
+
+        Args:
+            url: A URL of the host.
+            delay: The minimum number of seconds between the starts of two requests to the host.
+        """
+        self._host_state(urlparse(url).netloc.lower()).delay = delay if delay > self.host_delay else None
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str) -> AsyncIterator[None]:
+        """Waits for a free slot of the host and address of a URL, and for the politeness delay of the host."""
+        parsed_url = urlparse(url)
+        host = parsed_url.netloc.lower()
+        state = self._host_state(host)
+
+        state.users += 1
+        try:
+            async with state.slots:
+                address = await self._address_of(parsed_url.hostname or host)
+                address_state = self._addresses.get(address)
+                if address_state is None:
+                    address_state = self._addresses[address] = _AddressState(self.max_connections_per_address)
+
+                address_state.users += 1
+                try:
+                    async with address_state.slots:
+                        # Reserved before sleeping, so requests waiting together start `host_delay` apart.
+                        now = time.monotonic()
+                        start_at = max(now, state.next_request_at)
+                        state.next_request_at = start_at + (state.delay or self.host_delay)
+                        if start_at > now:
+                            await asyncio.sleep(start_at - now)
+                        yield
+                finally:
+                    address_state.users -= 1
+                    address_state.last_used_at = time.monotonic()
+        finally:
+            state.users -= 1
+            state.last_used_at = time.monotonic()
+            self._evict_idle_hosts()
+
+    @asynccontextmanager
+    async def _stream(self, url: str, timeout: Optional[float]) -> AsyncIterator[httpx.Response]:
+        """Opens a request to a URL in a slot of its host, with its body left unread, and counts it in the metrics."""
+        queued_at = started_at = time.monotonic()
+        try:
+            async with self._host_slot(url):
+                started_at = time.monotonic()
+                self.metrics.add(requests=1, host_wait_seconds=started_at - queued_at)
+                async with self._get_client().stream(
+                        "GET", url, timeout=self.timeout if timeout is None else timeout
+                ) as response:
+                    self.metrics.add(**{f"responses_{response.status_code // 100}xx": 1})
+                    yield response
+        except httpx.HTTPError as e:
+            if isinstance(e, httpx.TimeoutException):
+                error = "errors_timeout"
+            elif isinstance(e, httpx.ConnectError):
+                # Including host names that cannot be resolved
+                error = "errors_connect"
+            else:
+                error = "errors_other"
+            self.metrics.add(**{error: 1})
+            raise
+        finally:
+            self.metrics.add(fetch_seconds=time.monotonic() - started_at)
+
+    async def fetch(self, url: str, timeout: Optional[float] = None) -> httpx.Response:
+        """
+        Fetches a URL, waiting for a free slot of its host first.
+
+        Args:
+            url: The URL to fetch.
+            timeout: The timeout of the request in seconds. Defaults to the engine timeout.
+
+        Returns:
+            The response, after redirects, with its body read.
+
+        Raises:
+            httpx.TimeoutException: If the request timed out.
+            httpx.HTTPError: If the request failed, e.g. its host could not be resolved.
+        """
+        async with self._stream(url, timeout) as response:
+            await response.aread()
+            self.metrics.add(bytes_received=len(response.content))
+        return response
+
+    async def fetch_text(
+            self,
+            url: str,
+            timeout: Optional[float] = None,
+            max_bytes: int = 2_000_000,
+            content_types: tuple[str, ...] = ("text/html",)
+    ) -> Optional[FetchedText]:
+        """
+        Fetches the text of a URL, streaming its body so that nothing unwanted is downloaded.
+
+        The status and content type are checked on the headers, before any
+        of the body is read: error responses and unwanted content, e.g. a
+        video linked without a file extension, are never downloaded. The
+        body is decoded as it arrives and cut at `max_bytes`, so a giant
+        page never takes more memory than the budget.
+
+        Args:
+            url: The URL to fetch.
+            timeout: The timeout of the request in seconds. Defaults to the engine timeout.
+            max_bytes: The maximum number of bytes of the body to read, after decompression.
+            content_types: The content types to read, matched against the Content-Type header.
+
+        Returns:
+            The text of the page, or None if its content type is not wanted.
+
+        Raises:
+            httpx.TimeoutException: If the request timed out.
+            httpx.HTTPStatusError: If the response is an error (4xx or 5xx).
+            httpx.HTTPError: If the request failed, e.g. its host could not be resolved.
+        """
+        async with self._stream(url, timeout) as response:
+            content_type = response.headers.get("Content-Type", "")
+            if not response.is_error:
+                if not any(wanted in content_type for wanted in content_types):
+                    self.metrics.add(responses_skipped=1)
+                    return None
+                decoder = _text_decoder(response)
+                parts, bytes_read, truncated = [], 0, False
+                async for chunk in response.aiter_bytes():
+                    if bytes_read + len(chunk) > max_bytes:
+                        chunk = chunk[:max_bytes - bytes_read]
+                        truncated = True
+                    bytes_read += len(chunk)
+                    parts.append(decoder.decode(chunk))
+                    if truncated:
+                        break
+                parts.append(decoder.decode(b"", final=True))
+                self.metrics.add(bytes_received=bytes_read, responses_truncated=int(truncated))
+                return FetchedText(str(response.url), response.status_code, content_type, "".join(parts),
+                                   bytes_read, truncated)
+
+        # Raised once the connection is released, as the body of an error is not needed
+        response.raise_for_status()
+
+
+_crawl_engine_instance: Optional[CrawlEngine] = None
+_crawl_engine_lock = threading.Lock()
+
+
+def get_crawl_engine() -> CrawlEngine:
+    """
+    Acts as a singleton factory for the CrawlEngine shared by every scraper of the process.
+
+    Returns:
+        The crawl engine.
+    """
+    global _crawl_engine_instance
+    with _crawl_engine_lock:
+        if _crawl_engine_instance is None:
+            _crawl_engine_instance = CrawlEngine(
+                max_connections=Config.CONTACT_SCRAPER_MAX_CONNECTIONS,
+                max_connections_per_host=Config.CONTACT_SCRAPER_MAX_CONNECTIONS_PER_HOST,
+                timeout=Config.CONTACT_SCRAPER_REQUEST_TIMEOUT,
+                host_delay=Config.CONTACT_SCRAPER_HOST_DELAY_SECONDS,
+                max_connections_per_address=Config.CONTACT_SCRAPER_MAX_CONNECTIONS_PER_ADDRESS,
+                dns_ttl=Config.CONTACT_SCRAPER_DNS_TTL_SECONDS,
+            )
+        return _crawl_engine_instance
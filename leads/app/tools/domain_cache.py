@@ -0,0 +1,183 @@
+import socket
+from datetime import timedelta
+from functools import cache
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core import Config, SessionLocal
+
+# Failure classes of dead lead websites
+DNS_FAILURE = 'dns_failure'
+CONNECTION_REFUSED = 'connection_refused'
+PARKED = 'parked'
+SOCIAL_REDIRECT = 'social_redirect'
+
+# Browser error codes of the same failures, in the navigation errors of the screenshotter
+_BROWSER_ERRORS = {
+    'net::ERR_NAME_NOT_RESOLVED': DNS_FAILURE,
+    'net::ERR_CONNECTION_REFUSED': CONNECTION_REFUSED,
+}
+
+# Domain marketplaces and parking services that parked domains redirect to
+PARKING_HOSTS = (
+    'sedo.com', 'dan.com', 'afternic.com', 'hugedomains.com', 'parkingcrew.net', 'bodis.com', 'above.com',
+    'undeveloped.com',
+)
+# Phrases and scripts of parking pages, lowercased
+PARKED_PAGE_MARKERS = (
+    'this domain is for sale', 'this domain may be for sale', 'buy this domain', 'domain is parked',
+    'this web page is parked', 'parked free', 'this domain has expired', 'sedoparking.com', 'parkingcrew.net',
+    'bodis.com', 'hugedomains.com', 'afternic.com',
+)
+# Parking pages are small; larger pages mentioning these phrases are real websites
+_MAX_PARKED_PAGE_CHARS = 100_000
+
+
+def website_domain(url: str) -> str:
+    """
+    Normalizes the domain of a website, the key of its cache entry.
+
+    Args:
+        url: The URL of the website, with or without a scheme.
+
+    Returns:
+        The lowercased host name, without "www.", e.g. "joes-pizza.com".
+    """
+    parsed = urlparse(url if '://' in url else f"https://{url}")
+    return (parsed.hostname or '').removeprefix('www.')
+
+
+def on_host(url: str, hosts: tuple[str, ...]) -> bool:
+    """Checks whether a URL is on one of the hosts or their subdomains."""
+    host = urlparse(url).hostname or ''
+    return any(host == candidate or host.endswith(f".{candidate}") for candidate in hosts)
+
+
+def classify_connection_error(error: BaseException) -> Optional[str]:
+    """
+    Tells whether an error means a website is dead: its domain does not
+    resolve, or its server refuses connections. Timeouts and other errors,
+    which may be transient, are not classified.
+
+    Args:
+        error: An httpx error, whose causes are inspected, or a browser navigation error.
+
+    Returns:
+        DNS_FAILURE, CONNECTION_REFUSED, or None.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, socket.gaierror):
+            return DNS_FAILURE
+        if isinstance(error, ConnectionRefusedError):
+            return CONNECTION_REFUSED
+        for code, failure in _BROWSER_ERRORS.items():
+            if code in str(error):
+                return failure
+        error = error.__cause__ or error.__context__
+    return None
+
+
+def is_parked_page(url: str, html: str) -> bool:
+    """
+    Tells whether a website's homepage is a domain parking or for-sale page.
+
+    Args:
+        url: The URL of the page, after redirects.
+        html: The HTML of the page.
+
+    Returns:
+        Whether the page is on a parking service, or is small and reads like a parking page.
+    """
+    if on_host(url, PARKING_HOSTS):
+        return True
+    if len(html) > _MAX_PARKED_PAGE_CHARS:
+        return False
+    html = html.lower()
+    return any(marker in html for marker in PARKED_PAGE_MARKERS)
+
+
+class NegativeDomainCache:
+    """
+    A cache of the lead websites that are not worth visiting: dead (their
+    domain does not resolve, or their server refuses connections), parked,
+    or redirecting to a social media page.
+
+    Failures are stored in the `dead_domain_cache` table by domain and
+    served until they are older than the TTL, so the contact scraper and the
+    screenshotter skip the website without waiting on it again, across runs
+    and workers.
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]], ttl: int) -> None:
+        """
+        Initializes the negative domain cache.
+
+        Args:
+            session_factory: Optional factory for database sessions holding the cache.
+                             Nothing is cached when omitted.
+            ttl: How long, in seconds, a failure is remembered. Caching is disabled when 0.
+        """
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl)
+
+    @property
+    def enabled(self) -> bool:
+        return self.session_factory is not None and self.ttl > timedelta(0)
+
+    def read(self, url: str) -> Optional[tuple[str, Optional[str]]]:
+        """
+        Returns the recorded failure of a website's domain, if a fresh one exists.
+
+        Cache failures are logged and treated as misses.
+
+        Args:
+            url: The URL of the website.
+
+        Returns:
+            The failure class and its detail, e.g. the social media page the
+            website redirects to, or None on a miss.
+        """
+        domain = website_domain(url)
+        if not self.enabled or not domain:
+            return None
+
+        try:
+            with self.session_factory() as db:
+                entry = crud.read_dead_domain_cache(db, domain, self.ttl)
+                return (entry.failure, entry.detail) if entry else None
+        except SQLAlchemyError as e:
+            logger.warning(f"Dead domain cache lookup failed for {domain}: {e}")
+            return None
+
+    def record(self, url: str, failure: str, detail: Optional[str] = None) -> None:
+        """
+        Records the failure of a website's domain.
+
+        Args:
+            url: The URL of the website.
+            failure: The failure class, e.g. DNS_FAILURE.
+            detail: Optional description of the failure.
+        """
+        domain = website_domain(url)
+        if not self.enabled or not domain:
+            return
+
+        logger.info(f"Recording {domain} as a dead domain: {failure}")
+        try:
+            with self.session_factory() as db:
+                crud.upsert_dead_domain_cache(db, domain, failure, detail)
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not cache the failure of {domain}: {e}")
+
+
+@cache
+def get_negative_domain_cache() -> NegativeDomainCache:
+    """Returns the negative domain cache shared by the contact scraper and the screenshotter."""
+    return NegativeDomainCache(session_factory=SessionLocal, ttl=Config.DEAD_DOMAIN_CACHE_TTL_SECONDS)
@@ -1,13 +1,34 @@
+import heapq
+import json
+import math
+import queue
+import random
+import re
+import threading
 import time
-from typing import Any, Optional, Callable
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from itertools import count
+from typing import Any, Optional, Callable, Iterable, Iterator, Generator
 
 import googlemaps
-from googlemaps.exceptions import ApiError, HTTPError, Timeout, TransportError
+import requests
+from googlemaps.exceptions import ApiError, HTTPError, Timeout
 from langchain_core.tools import tool
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
-from app.core import Config
-from app.schemas import GoogleMapsSearchInput, GoogleMapsSearchOutput, SearchMetadata, PlaceResult
+from app import crud
+from app.core import Config, SessionLocal
+from app.schemas import GoogleMapsSearchInput, GoogleMapsSearchOutput, SearchMetadata, PlaceResult, SearchStats, \
+    SearchPlan
+from app.tools.rate_limiter import TokenBucketRateLimiter, parse_rate_limits
+from app.tools.search_cache import SearchCache
+from app.tools.search_planner import SearchPlanner
 
 
 # --- Custom Exception Classes ---
@@ -27,6 +48,156 @@ class LocationNotFoundError(GoogleMapsClientError):
     pass
 
 
+class _CandidatePool:
+    """
+    The bookkeeping of a place results stream.
+
+    The pool deduplicates and pre-filters the places of incoming result pages,
+    keeps the remaining candidates in a priority queue, applies the result
+    limits and collects the details to write back to the cache. It performs
+    no I/O; the cache and API requests are left to the stream.
+    """
+
+    def __init__(
+            self,
+            maps_client: "GoogleMapsClient",
+            min_rating: float,
+            exclude_websites: bool,
+            max_results: int,
+            group_of: Optional[Callable[[dict[str, Any]], Any]] = None,
+            max_results_per_group: Optional[int] = None
+    ) -> None:
+        self.maps_client = maps_client
+        self.min_rating = min_rating
+        self.exclude_websites = exclude_websites
+        self.max_results = max_results
+        self.group_of = group_of
+        self.max_results_per_group = max_results_per_group
+
+        self.processed_ids: set[str] = set()
+        # Heap of (-promise, arrival order, place), so the most promising candidate pops first.
+        self.candidates: list[tuple[float, int, dict[str, Any]]] = []
+        self._arrival = count()
+        self.cached_details: dict[str, Any] = {}
+        self.cache_outcomes: Counter[str] = Counter()
+        self.cache_writes: list[tuple[str, dict[str, Any], datetime, datetime]] = []
+
+        self.found = 0
+        self.group_found: Counter[Any] = Counter()
+        self.prefiltered = 0
+        self.known = 0
+        # Candidates whose qualification was decided, and those that passed every filter
+        self.examined = 0
+        self.qualified = 0
+        self.details_requested = 0
+        self.details_used = 0
+
+    @property
+    def full(self) -> bool:
+        return self.found >= self.max_results
+
+    def _group_full(self, place: dict[str, Any]) -> bool:
+        if self.group_of is None or self.max_results_per_group is None:
+            return False
+        return self.group_found[self.group_of(place)] >= self.max_results_per_group
+
+    def _take_result(self, place: dict[str, Any]) -> bool:
+        if self.full or self._group_full(place):
+            return False
+        self.found += 1
+        if self.group_of is not None:
+            self.group_found[self.group_of(place)] += 1
+        return True
+
+    def _record_qualification(self, business_data: Optional[PlaceResult]) -> None:
+        self.examined += 1
+        if business_data:
+            self.qualified += 1
+
+    def admit(self, page: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Returns the places of a page not seen before and passing the pre-filter, most promising first."""
+        new_places = []
+        for place in page:
+            place_id = place.get('place_id')
+            if not place_id or place_id in self.processed_ids:
+                continue
+            self.processed_ids.add(place_id)
+            if not self.maps_client._passes_prefilter(place, self.min_rating):
+                self.prefiltered += 1
+                self.examined += 1
+                continue
+            new_places.append(place)
+
+        new_places.sort(key=self.maps_client._candidate_promise, reverse=True)
+        return new_places
+
+    def drop_known(self, places: list[dict[str, Any]], known_ids: set[str]) -> list[dict[str, Any]]:
+        """Removes the places stored as leads recently."""
+        self.known += len(known_ids)
+        self.examined += len(known_ids)
+        return [place for place in places if place['place_id'] not in known_ids]
+
+    def take_inline(self, places: list[dict[str, Any]]) -> Iterator[PlaceResult]:
+        """Qualifies places whose search result already carries their details."""
+        detail_fields = {**self.maps_client._STABLE_DETAIL_FIELDS, **self.maps_client._VOLATILE_DETAIL_FIELDS}
+        now = datetime.now(timezone.utc)
+        for place in places:
+            self.cache_writes.append((place['place_id'], self.maps_client._project_details(place, detail_fields), now, now))
+            business_data = self.maps_client._qualify_business(place, place, self.min_rating, self.exclude_websites)
+            self._record_qualification(business_data)
+            if business_data and self._take_result(place):
+                yield business_data
+
+    def add_candidates(self, places: list[dict[str, Any]], cached_details: dict[str, Any]) -> None:
+        """Queues places for a details lookup, along with their cache entries."""
+        self.cached_details.update(cached_details)
+        for place in places:
+            heapq.heappush(self.candidates, (-self.maps_client._candidate_promise(place), next(self._arrival), place))
+
+    def pop_candidate(self) -> Optional[dict[str, Any]]:
+        """Returns the most promising candidate still worth a details lookup, if any."""
+        while self.candidates:
+            _, _, candidate = heapq.heappop(self.candidates)
+            if not self._group_full(candidate):
+                self.details_requested += 1
+                return candidate
+        return None
+
+    def take_details(self, place: dict[str, Any], details: Optional[dict[str, Any]], outcome: str) -> Optional[PlaceResult]:
+        """Records a completed details lookup and qualifies its place."""
+        self.cache_outcomes[outcome] += 1
+        if details and outcome in ("miss", "refresh"):
+            now = datetime.now(timezone.utc)
+            stable_fetched_at = now if outcome == "miss" else self.cached_details[place['place_id']].stable_fetched_at
+            self.cache_writes.append((place['place_id'], details, stable_fetched_at, now))
+
+        business_data = self.maps_client._qualify_business(place, details, self.min_rating, self.exclude_websites)
+        self._record_qualification(business_data)
+        if business_data and self._take_result(place):
+            self.details_used += 1
+            return business_data
+        return None
+
+    def report(self, stats: Optional[SearchStats]) -> None:
+        """Logs the outcome of the stream and adds it to the search statistics."""
+        logger.info(
+            f"Found {self.found} businesses from {len(self.processed_ids)} unique candidates, after dropping "
+            f"{self.prefiltered} by rating and {self.known} known leads. Used {self.details_used} of "
+            f"{self.details_requested} place details lookups. Cache outcomes: {dict(self.cache_outcomes)}"
+        )
+        if stats is not None:
+            stats.candidates_prefiltered += self.prefiltered
+            stats.candidates_known += self.known
+            stats.candidates_examined += self.examined
+            stats.candidates_qualified += self.qualified
+            stats.details_requested += self.details_requested
+            stats.details_used += self.details_used
+            stats.cache_hits += self.cache_outcomes["hit"]
+            stats.cache_refreshes += self.cache_outcomes["refresh"]
+            stats.cache_misses += self.cache_outcomes["miss"] + self.cache_outcomes["unavailable"]
+            stats.cache_stale_hits += self.cache_outcomes["stale"]
+
+
 class GoogleMapsClient:
     """
     A client for interacting with the Google Maps API to search for businesses.
@@ -59,111 +230,985 @@ class GoogleMapsClient:
         "university", "veterinary_care", "zoo"
     }
 
-    def __init__(self, api_key: Optional[str]) -> None:
+    # Place details fields grouped by how quickly they go stale, mapping the
+    # `fields` names accepted by the details endpoint to the response keys.
+    _STABLE_DETAIL_FIELDS = {
+        "name": "name",
+        "formatted_address": "formatted_address",
+        "formatted_phone_number": "formatted_phone_number",
+        "website": "website",
+        "type": "types",
+        "price_level": "price_level",
+    }
+    _VOLATILE_DETAIL_FIELDS = {
+        "rating": "rating",
+        "user_ratings_total": "user_ratings_total",
+        "opening_hours": "opening_hours",
+    }
+
+    # Search strategies:
+    # - "details": legacy Text/Nearby Search, then one Place Details request per
+    #   candidate, restricted to the fields PlaceResult needs.
+    # - "inline": Places API (New) Text/Nearby Search with a field mask that
+    #   carries every PlaceResult field, so no per-place details requests are made.
+    #   It is limited to 60 text results plus 20 nearby results per search, and
+    #   the phone and website fields bill the search at the Enterprise SKU.
+    STRATEGY_DETAILS = "details"
+    STRATEGY_INLINE = "inline"
+
+    # A legacy next_page_token becomes valid roughly two seconds after it is
+    # issued. Pages are polled for instead of sleeping a fixed delay.
+    _PAGE_TOKEN_DELAY = 1.0
+    _PAGE_TOKEN_RETRY_DELAY = 0.5
+    _PAGE_TOKEN_MAX_WAIT = 6.0
+
+    # A single search returns at most 60 results (three pages of 20), and an
+    # inline Nearby Search at most 20. Tiles returning that many are subdivided.
+    _SEARCH_RESULT_CAP = 60
+    _INLINE_NEARBY_RESULT_CAP = 20
+    _METERS_PER_DEGREE = 111320.0
+
+    # Quota errors of the legacy APIs and the Places API (New). They are retried
+    # with jittered exponential backoff instead of failing the search.
+    _QUOTA_ERROR_STATUSES = {"OVER_QUERY_LIMIT", "RESOURCE_EXHAUSTED"}
+    _QUOTA_RETRY_BASE_DELAY = 0.5
+    _QUOTA_RETRY_MAX_DELAY = 16.0
+
+    _PLACES_API_BASE_URL = "https://places.googleapis.com"
+    _INLINE_PLACE_FIELDS = [
+        "places.id", "places.displayName", "places.formattedAddress", "places.nationalPhoneNumber",
+        "places.websiteUri", "places.rating", "places.userRatingCount", "places.types",
+        "places.priceLevel", "places.currentOpeningHours.openNow", "places.location",
+    ]
+    _INLINE_PRICE_LEVELS = {
+        "PRICE_LEVEL_FREE": 0,
+        "PRICE_LEVEL_INEXPENSIVE": 1,
+        "PRICE_LEVEL_MODERATE": 2,
+        "PRICE_LEVEL_EXPENSIVE": 3,
+        "PRICE_LEVEL_VERY_EXPENSIVE": 4,
+    }
+
+    def __init__(
+            self,
+            api_key: Optional[str],
+            max_concurrent_details: int = 8,
+            session_factory: Optional[Callable[[], Session]] = None,
+            geocode_cache_ttl: int = 30 * 24 * 60 * 60,
+            details_stable_ttl: int = 30 * 24 * 60 * 60,
+            details_volatile_ttl: int = 24 * 60 * 60,
+            tile_radius: int = 5000,
+            min_tile_radius: int = 500,
+            max_concurrent_tiles: int = 4,
+            known_lead_ttl: int = 30 * 24 * 60 * 60,
+            client: Optional[Any] = None,
+            rate_limiter: Optional[TokenBucketRateLimiter] = None,
+            max_quota_retries: int = 6,
+            requests_session: Optional[requests.Session] = None,
+            planner: Optional[SearchPlanner] = None
+    ) -> None:
         """
         Initializes the GoogleMapsClient.
 
+        The API key is not checked with a test request here. It is validated by
+        the first real request, which raises `APIKeyError` if Google rejects it,
+        so creating the client costs no API round trip. A ready-made client,
+        such as the offline `benchmarks.google_maps_fake.FakeGoogleMapsClient`, can be
+        passed instead of a key.
+
         Args:
             api_key: The Google Maps API key for authentication.
+            max_concurrent_details: The maximum number of place details requests
+                                    allowed in flight at the same time.
+            session_factory: Optional factory for database sessions backing the
+                             persistent caches. Caching is disabled when omitted.
+            geocode_cache_ttl: How long, in seconds, a cached geocode result stays valid.
+            details_stable_ttl: How long, in seconds, cached stable place details
+                                (name, address, website...) stay valid.
+            details_volatile_ttl: How long, in seconds, cached volatile place details
+                                  (rating, opening hours...) stay valid.
+            tile_radius: The radius in meters of the initial tiles of a tiled search.
+            min_tile_radius: The radius in meters below which tiles are no longer subdivided.
+            max_concurrent_tiles: The maximum number of tiles searched at the same time.
+            known_lead_ttl: How long, in seconds, a stored lead is skipped by searches
+                            that skip known places.
+            client: Optional googlemaps.Client compatible object to send the requests
+                    through. Created from `api_key` when omitted.
+            rate_limiter: Optional rate limiter every request waits on, per endpoint.
+            max_quota_retries: How many times a request failing on a quota error is retried.
+            requests_session: Optional session the googlemaps client sends its
+                              requests through, e.g. one with a connection pool
+                              sized for the concurrent requests of a search.
+            planner: Optional planner choosing the searches to run and how many
+                     candidates to fetch. Defaults to one without pass rate history.
 
         Raises:
-            APIKeyError: If the API key is not provided or is invalid,
+            APIKeyError: If the API key is not provided or is malformed,
                          preventing client initialization.
         """
-        if not api_key:
+        if client is None and not api_key:
             logger.error("Google Maps API key not provided.")
             raise APIKeyError("Google Maps API key is required.")
 
+        self.max_concurrent_details = max(1, max_concurrent_details)
+        self.session_factory = session_factory
+        self.geocode_cache_ttl = timedelta(seconds=geocode_cache_ttl)
+        self.details_stable_ttl = timedelta(seconds=details_stable_ttl)
+        self.details_volatile_ttl = timedelta(seconds=details_volatile_ttl)
+        self.tile_radius = max(1, tile_radius)
+        self.min_tile_radius = max(1, min_tile_radius)
+        self.max_concurrent_tiles = max(1, max_concurrent_tiles)
+        self.known_lead_ttl = timedelta(seconds=known_lead_ttl)
+        self.rate_limiter = rate_limiter
+        self.max_quota_retries = max(0, max_quota_retries)
+        self.planner = planner or SearchPlanner()
+
+        if client is not None:
+            self.client = client
+            return
+
         try:
-            self.client = googlemaps.Client(key=api_key)
-            # Perform a test query to validate the key immediately.
-            self.client.geocode("USA")
-            logger.info("Google Maps client initialized and validated successfully.")
-        except (ApiError, HTTPError, TransportError) as e:
+            # Quota errors are retried by `_call`, after waiting on the shared rate limiter.
+            self.client = googlemaps.Client(
+                key=api_key, retry_over_query_limit=False, requests_session=requests_session
+            )
+            logger.info("Google Maps client initialized successfully.")
+        except ValueError as e:
             logger.error(f"Failed to initialize Google Maps client: {e}")
             raise APIKeyError(f"API key is invalid or client failed to initialize: {e}") from e
 
-    def _get_city_location(self, city: str) -> dict[str, float]:
+    def _call(
+            self,
+            endpoint: str,
+            func: Callable[..., Any],
+            stats: Optional[SearchStats],
+            **kwargs: Any
+    ) -> Any:
+        """
+        Performs a single API request and records it in the search statistics.
+
+        Every request to Google goes through this method, so the call count and
+        the approximate response size of a search can be compared across
+        search strategies. Each attempt first waits on the rate limiter of the
+        endpoint, and quota errors are retried with jittered exponential
+        backoff, up to `max_quota_retries` times, before they are raised.
+
+        Args:
+            endpoint: The name of the endpoint, used as the statistics key.
+            func: The client method performing the request.
+            stats: Optional statistics object to record the request in.
+            **kwargs: Arguments to pass to the client method.
+
+        Returns:
+            The decoded API response.
+
+        Raises:
+            ApiError: If the request fails, or still hits the quota after the last retry.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire(endpoint)
+                if waited and stats is not None:
+                    stats.record_rate_limit_wait(waited)
+
+            try:
+                response = func(**kwargs)
+                break
+            except ApiError as e:
+                if e.status not in self._QUOTA_ERROR_STATUSES or attempt >= self.max_quota_retries:
+                    raise
+                delay = random.uniform(0, min(self._QUOTA_RETRY_MAX_DELAY, self._QUOTA_RETRY_BASE_DELAY * 2 ** attempt))
+                logger.warning(f"{endpoint} hit the quota ({e.status}), retrying in {delay:.2f}s.")
+                if stats is not None:
+                    stats.record_quota_retry()
+                time.sleep(delay)
+                attempt += 1
+
+        if stats is not None:
+            stats.record_api_call(endpoint, len(json.dumps(response, separators=(",", ":"))))
+        return response
+
+    @staticmethod
+    def _raise_for_key_error(error: Exception) -> None:
+        """
+        Converts an API rejection of the key into an `APIKeyError`.
+
+        Args:
+            error: The exception raised by the googlemaps client.
+
+        Raises:
+            APIKeyError: If the request was denied because of the API key.
+        """
+        if isinstance(error, ApiError) and error.status in ("REQUEST_DENIED", "PERMISSION_DENIED"):
+            logger.error(f"Google Maps API rejected the request: {error}")
+            raise APIKeyError(f"API key is invalid or not authorized: {error}") from error
+
+    @staticmethod
+    def _normalize_city(city: str) -> str:
+        """
+        Normalizes a city string so equivalent spellings share a cache entry.
+
+        Args:
+            city: The city name as provided by the caller.
+
+        Returns:
+            The lowercased city with consistent comma spacing and whitespace.
+        """
+        return " ".join(re.sub(r"\s*,\s*", ", ", city).split()).strip(" ,").lower()
+
+    def _read_cached_location(self, cache_key: str) -> Optional[dict[str, float]]:
+        """
+        Looks up a fresh geocode result in the persistent cache.
+
+        Cache failures are logged and treated as misses so that a database
+        outage never blocks a search.
+
+        Args:
+            cache_key: The normalized city string.
+
+        Returns:
+            A dictionary containing the 'lat' and 'lng', or None on a miss.
+        """
+        if self.session_factory is None:
+            return None
+
+        try:
+            with self.session_factory() as db:
+                entry = crud.read_geocode_cache(db, cache_key, self.geocode_cache_ttl)
+                if entry:
+                    return {"lat": entry.lat, "lng": entry.lng}
+        except SQLAlchemyError as e:
+            logger.warning(f"Geocode cache lookup failed for {cache_key}: {e}")
+        return None
+
+    def _store_cached_location(self, cache_key: str, location: dict[str, float]) -> None:
+        """
+        Stores a geocode result in the persistent cache.
+
+        Args:
+            cache_key: The normalized city string.
+            location: A dictionary containing the 'lat' and 'lng'.
+        """
+        if self.session_factory is None:
+            return
+
+        try:
+            with self.session_factory() as db:
+                crud.upsert_geocode_cache(db, cache_key, location['lat'], location['lng'])
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not cache geocode result for {cache_key}: {e}")
+
+    def _get_city_location(self, city: str, stats: Optional[SearchStats] = None) -> dict[str, float]:
         """
         Geocodes a city name to get its latitude and longitude.
 
+        Results are served from the shared geocode cache when a fresh entry
+        exists, and stored there after a successful lookup.
+
         Args:
             city: The name of the city to locate.
+            stats: Optional statistics object to record the API request in.
 
         Returns:
             A dictionary containing the 'lat' and 'lng' of the city.
 
         Raises:
             LocationNotFoundError: If the city cannot be found.
+            APIKeyError: If the API key is rejected.
             GoogleMapsClientError: For other API-related errors.
         """
+        cache_key = self._normalize_city(city)
+        cached_location = self._read_cached_location(cache_key)
+        if cached_location:
+            logger.info(f"Using cached location for {city}: {cached_location}")
+            return cached_location
+
         try:
-            geocode_result = self.client.geocode(city)
+            geocode_result = self._call("geocode", self.client.geocode, stats, address=city)
             if not geocode_result:
                 raise LocationNotFoundError(f"Could not find location for city: {city}")
 
             location = geocode_result[0]['geometry']['location']
             logger.info(f"Found location for {city}: {location}")
-            return location
         except (ApiError, HTTPError, Timeout) as e:
+            self._raise_for_key_error(e)
             logger.error(f"API error while geocoding {city}: {e}")
             raise GoogleMapsClientError(f"An API error occurred while finding {city}") from e
 
-    @staticmethod
-    def _perform_paginated_search(
+        self._store_cached_location(cache_key, location)
+        return location
+
+    def _fetch_next_page(
+            self,
+            search_func: Callable[..., dict],
+            next_page_token: str,
+            stop_event: threading.Event,
+            stats: Optional[SearchStats] = None,
+            **kwargs: Any
+    ) -> Optional[dict[str, Any]]:
+        """
+        Fetches the next page of a legacy search as soon as its token is valid.
+
+        A `next_page_token` only becomes usable a short while after it is
+        issued, and requesting it too early fails with INVALID_REQUEST. Rather
+        than sleeping a fixed two seconds, the page is requested after a short
+        delay and retried until the token is accepted.
+
+        Args:
+            search_func: The googlemaps client method to call.
+            next_page_token: The token returned with the previous page.
+            stop_event: Event set when the search no longer needs more pages.
+            stats: Optional statistics object to record the API requests in.
+            **kwargs: Arguments to pass to the search function.
+
+        Returns:
+            The API response, or None if the search was stopped while waiting.
+
+        Raises:
+            ApiError: If the token is still rejected after `_PAGE_TOKEN_MAX_WAIT`
+                      seconds, or for any other API error.
+        """
+        waited = self._PAGE_TOKEN_DELAY
+        if stop_event.wait(self._PAGE_TOKEN_DELAY):
+            return None
+
+        while True:
+            try:
+                return self._call(search_func.__name__, search_func, stats, page_token=next_page_token, **kwargs)
+            except ApiError as e:
+                if e.status != "INVALID_REQUEST" or waited >= self._PAGE_TOKEN_MAX_WAIT:
+                    raise
+
+            if stop_event.wait(self._PAGE_TOKEN_RETRY_DELAY):
+                return None
+            waited += self._PAGE_TOKEN_RETRY_DELAY
+
+    def _iter_paginated_search(
+            self,
             search_func: Callable[..., dict],
             max_results: int,
+            stop_event: threading.Event,
+            stats: Optional[SearchStats] = None,
             **kwargs: Any
-    ) -> list[dict[str, Any]]:
+    ) -> Iterator[list[dict[str, Any]]]:
         """
-        Performs a search using a given client method and handles pagination.
+        Performs a search using a given client method, yielding each page as it arrives.
 
         Args:
             search_func: The googlemaps client method to call (e.g., self.client.places).
             max_results: The maximum number of results to fetch.
+            stop_event: Event set when the search no longer needs more pages.
+            stats: Optional statistics object to record the API requests in.
             **kwargs: Arguments to pass to the search function.
 
-        Returns:
-            A list of raw place results from the API.
+        Yields:
+            Lists of raw place results from the API, one per page.
 
         Raises:
             GoogleMapsClientError: For API-related errors during the search.
         """
-        all_results = []
+        fetched = 0
         try:
-            response = search_func(**kwargs)
-            all_results.extend(response.get('results', []))
-            next_page_token = response.get('next_page_token')
+            response = self._call(search_func.__name__, search_func, stats, **kwargs)
+            while response is not None:
+                page = response.get('results', [])
+                fetched += len(page)
+                yield page
 
-            while next_page_token and len(all_results) < max_results:
-                time.sleep(2)  # Required delay before fetching the next page.
-                logger.info(f"Fetching next page of results for query: {kwargs.get('query')}")
-                response = search_func(page_token=next_page_token, **kwargs)
-                all_results.extend(response.get('results', []))
                 next_page_token = response.get('next_page_token')
+                if not next_page_token or fetched >= max_results or stop_event.is_set():
+                    break
+
+                logger.info(f"Fetching next page of results for query: {kwargs.get('query')}")
+                response = self._fetch_next_page(search_func, next_page_token, stop_event, stats, **kwargs)
 
         except (ApiError, HTTPError, Timeout) as e:
+            self._raise_for_key_error(e)
             logger.error(f"API error during paginated search: {e}")
-            raise GoogleMapsClientError(f"An API error occurred during search.") from e
+            raise GoogleMapsClientError("An API error occurred during search.") from e
+
+    @staticmethod
+    def _extract_places_api_body(response: Any) -> dict[str, Any]:
+        """
+        Decodes a Places API (New) response, raising googlemaps exceptions on errors.
+
+        Args:
+            response: The `requests` response object.
+
+        Returns:
+            The decoded JSON body.
+
+        Raises:
+            ApiError: If the API returned a structured error.
+            HTTPError: If the request failed without a structured error.
+        """
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+
+        if response.status_code != 200:
+            error = body.get("error") if isinstance(body, dict) else None
+            if error:
+                raise ApiError(error.get("status", str(response.status_code)), error.get("message"))
+            raise HTTPError(response.status_code)
+
+        return body
+
+    def _places_api_request(self, path: str, body: dict[str, Any], field_mask: str) -> dict[str, Any]:
+        """
+        Sends a request to the Places API (New) through the googlemaps transport.
+
+        Args:
+            path: The endpoint path, e.g. "/v1/places:searchText".
+            body: The JSON request body.
+            field_mask: The comma separated list of response fields to return.
+
+        Returns:
+            The decoded JSON response.
+        """
+        headers = {**self.client.requests_kwargs.get("headers", {}), "X-Goog-FieldMask": field_mask}
+        return self.client._request(
+            path,
+            {},
+            base_url=self._PLACES_API_BASE_URL,
+            extract_body=self._extract_places_api_body,
+            requests_kwargs={"headers": headers},
+            post_json=body
+        )
+
+    @classmethod
+    def _convert_inline_place(cls, place: dict[str, Any]) -> dict[str, Any]:
+        """
+        Converts a Places API (New) place into the legacy search/details shape.
+
+        The returned dictionary can be used both as the search result and as
+        the details argument of `_format_business_data`.
+
+        Args:
+            place: A place from a Places API (New) response.
+
+        Returns:
+            A dictionary with legacy keys, omitting fields the API did not return.
+        """
+        location = place.get("location", {})
+        converted = {
+            "place_id": place.get("id"),
+            "name": place.get("displayName", {}).get("text"),
+            "formatted_address": place.get("formattedAddress"),
+            "formatted_phone_number": place.get("nationalPhoneNumber"),
+            "website": place.get("websiteUri"),
+            "rating": place.get("rating"),
+            "user_ratings_total": place.get("userRatingCount"),
+            "types": place.get("types"),
+            "price_level": cls._INLINE_PRICE_LEVELS.get(place.get("priceLevel")),
+            "geometry": {"location": {"lat": location.get("latitude"), "lng": location.get("longitude")}},
+        }
+        if "currentOpeningHours" in place:
+            converted["opening_hours"] = {"open_now": place["currentOpeningHours"].get("openNow")}
+        return {key: value for key, value in converted.items() if value is not None}
+
+    @staticmethod
+    def _inline_circle(location: dict[str, float], radius: int) -> dict[str, Any]:
+        """
+        Builds the Places API (New) circle for a search area.
+
+        Args:
+            location: The 'lat' and 'lng' of the centre.
+            radius: The radius in meters, capped at the API maximum of 50 km.
+
+        Returns:
+            The circle object for a location bias or restriction.
+        """
+        return {
+            "center": {"latitude": location['lat'], "longitude": location['lng']},
+            "radius": float(min(radius, 50000)),
+        }
+
+    def _iter_inline_text_search(
+            self,
+            query: str,
+            location: dict[str, float],
+            radius: int,
+            max_results: int,
+            stop_event: threading.Event,
+            stats: Optional[SearchStats] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Performs a Places API (New) Text Search, yielding each page as it arrives.
+
+        Args:
+            query: The text query to search for.
+            location: The 'lat' and 'lng' to centre the search on.
+            radius: The search radius in meters.
+            max_results: The maximum number of results to fetch.
+            stop_event: Event set when the search no longer needs more pages.
+            stats: Optional statistics object to record the API requests in.
+
+        Yields:
+            Lists of places converted to the legacy search/details shape.
+
+        Raises:
+            GoogleMapsClientError: For API-related errors during the search.
+        """
+        body = {"textQuery": query, "pageSize": 20, "locationBias": {"circle": self._inline_circle(location, radius)}}
+        field_mask = ",".join(self._INLINE_PLACE_FIELDS + ["nextPageToken"])
+        fetched = 0
+        try:
+            while True:
+                response = self._call(
+                    "places:searchText", self._places_api_request, stats,
+                    path="/v1/places:searchText", body=body, field_mask=field_mask
+                )
+                page = [self._convert_inline_place(place) for place in response.get("places", [])]
+                fetched += len(page)
+                yield page
+
+                next_page_token = response.get("nextPageToken")
+                if not next_page_token or fetched >= max_results or stop_event.is_set():
+                    break
+                logger.info(f"Fetching next page of inline results for query: {query}")
+                body = {**body, "pageToken": next_page_token}
+
+        except (ApiError, HTTPError, Timeout) as e:
+            self._raise_for_key_error(e)
+            logger.error(f"API error during inline search: {e}")
+            raise GoogleMapsClientError("An API error occurred during search.") from e
+
+    def _iter_inline_nearby_search(
+            self,
+            business_type: str,
+            location: dict[str, float],
+            radius: int,
+            stats: Optional[SearchStats] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Performs a single Places API (New) Nearby Search for a place type.
+
+        Args:
+            business_type: A supported place type.
+            location: The 'lat' and 'lng' to centre the search on.
+            radius: The search radius in meters.
+            stats: Optional statistics object to record the API request in.
+
+        Yields:
+            One list of places converted to the legacy search/details shape.
+
+        Raises:
+            GoogleMapsClientError: For API-related errors during the search.
+        """
+        try:
+            response = self._call(
+                "places:searchNearby", self._places_api_request, stats,
+                path="/v1/places:searchNearby",
+                body={"includedTypes": [business_type], "maxResultCount": 20,
+                      "locationRestriction": {"circle": self._inline_circle(location, radius)}},
+                field_mask=",".join(self._INLINE_PLACE_FIELDS)
+            )
+        except (ApiError, HTTPError, Timeout) as e:
+            self._raise_for_key_error(e)
+            logger.error(f"API error during inline nearby search: {e}")
+            raise GoogleMapsClientError("An API error occurred during search.") from e
+
+        yield [self._convert_inline_place(place) for place in response.get("places", [])]
+
+    @classmethod
+    def _offset_location(cls, location: dict[str, float], dx: float, dy: float) -> dict[str, float]:
+        """
+        Moves a location by a distance in meters, using a local flat-earth approximation.
+
+        Args:
+            location: The 'lat' and 'lng' to start from.
+            dx: The distance to move east, in meters.
+            dy: The distance to move north, in meters.
+
+        Returns:
+            The 'lat' and 'lng' of the moved location.
+        """
+        return {
+            'lat': location['lat'] + dy / cls._METERS_PER_DEGREE,
+            'lng': location['lng'] + dx / (cls._METERS_PER_DEGREE * math.cos(math.radians(location['lat']))),
+        }
+
+    @classmethod
+    def _distance_meters(cls, a: dict[str, float], b: dict[str, float]) -> float:
+        """
+        Approximates the distance between two nearby locations in meters.
+
+        Args:
+            a: The first 'lat' and 'lng'.
+            b: The second 'lat' and 'lng'.
+
+        Returns:
+            The distance in meters.
+        """
+        dy = (b['lat'] - a['lat']) * cls._METERS_PER_DEGREE
+        dx = (b['lng'] - a['lng']) * cls._METERS_PER_DEGREE * math.cos(math.radians((a['lat'] + b['lat']) / 2))
+        return math.hypot(dx, dy)
+
+    @classmethod
+    def _hex_tiles(cls, location: dict[str, float], radius: float, tile_radius: float) -> list[dict[str, float]]:
+        """
+        Covers a search circle with a hexagonal grid of smaller circles.
+
+        Circles of radius `tile_radius` centred on a hexagonal lattice with a
+        spacing of `sqrt(3) * tile_radius` cover the plane, so keeping every
+        tile whose hexagon can touch the search circle covers it entirely.
+
+        Args:
+            location: The 'lat' and 'lng' of the centre of the search circle.
+            radius: The radius of the search circle in meters.
+            tile_radius: The radius of each tile in meters.
+
+        Returns:
+            The centres of the tiles, nearest to the centre first.
+        """
+        if tile_radius >= radius:
+            return [location]
+
+        column_spacing = math.sqrt(3) * tile_radius
+        row_spacing = 1.5 * tile_radius
+        rows = int(radius // row_spacing) + 1
+        columns = int(radius // column_spacing) + 1
+
+        offsets = []
+        for row in range(-rows, rows + 1):
+            shift = column_spacing / 2 if row % 2 else 0.0
+            for column in range(-columns - 1, columns + 2):
+                dx, dy = column * column_spacing + shift, row * row_spacing
+                if math.hypot(dx, dy) < radius + tile_radius:
+                    offsets.append((dx, dy))
+
+        offsets.sort(key=lambda offset: math.hypot(*offset))
+        return [cls._offset_location(location, dx, dy) for dx, dy in offsets]
+
+    @classmethod
+    def _subdivide_tile(cls, location: dict[str, float], radius: float) -> list[dict[str, float]]:
+        """
+        Splits a tile into seven tiles of half its radius that cover it.
+
+        The children are the tile centre and six points at `sqrt(3) / 2 * radius`
+        around it, which is the smallest covering of a circle by seven circles.
+
+        Args:
+            location: The 'lat' and 'lng' of the tile centre.
+            radius: The tile radius in meters.
+
+        Returns:
+            The centres of the child tiles.
+        """
+        distance = math.sqrt(3) / 2 * radius
+        children = [location]
+        for step in range(6):
+            angle = math.radians(60 * step)
+            children.append(cls._offset_location(location, distance * math.cos(angle), distance * math.sin(angle)))
+        return children
+
+    def _iter_tiled_search(
+            self,
+            tile_search: Callable[[dict[str, float], float], Iterable[list[dict[str, Any]]]],
+            location: dict[str, float],
+            radius: int,
+            result_cap: int,
+            stop_event: threading.Event,
+            stats: Optional[SearchStats] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Runs a search over hexagonal tiles of the search circle, yielding pages as they arrive.
+
+        A single search stops at `result_cap` results however large the area,
+        so the circle is split into tiles of `tile_radius` that are searched
+        concurrently. A tile that returns the full cap, mostly from inside its
+        own circle, probably holds more places than it could return, and is
+        replaced by seven tiles of half its radius, down to `min_tile_radius`.
+        Tiles that return fewer results are not split further, so dense areas
+        are searched at a finer grain than sparse ones. Duplicates between
+        overlapping tiles are removed downstream by place_id.
+
+        Args:
+            tile_search: Callable running the search for a tile centre and radius.
+            location: The 'lat' and 'lng' of the centre of the search circle.
+            radius: The radius of the search circle in meters.
+            result_cap: The most results a single search can return.
+            stop_event: Event set when no more pages are needed.
+            stats: Optional statistics object to record the searched tiles in.
+
+        Yields:
+            Lists of raw place results, one per page of any tile.
+
+        Raises:
+            GoogleMapsClientError: If the search of any tile fails.
+        """
+        events: queue.Queue[tuple[str, Any]] = queue.Queue()
+
+        def run_tile(center: dict[str, float], tile_radius: float) -> None:
+            if stop_event.is_set():
+                events.put(("tile", None))
+                return
+            returned = inside = 0
+            try:
+                for tile_page in tile_search(center, tile_radius):
+                    returned += len(tile_page)
+                    inside += sum(
+                        1 for place in tile_page
+                        if 'location' in place.get('geometry', {})
+                        and self._distance_meters(center, place['geometry']['location']) <= tile_radius
+                    )
+                    events.put(("page", tile_page))
+                events.put(("tile", (center, tile_radius, returned, inside)))
+            except Exception as tile_error:
+                events.put(("error", tile_error))
+
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent_tiles, thread_name_prefix="place-tiles")
+        pending = 0
+
+        def submit(center: dict[str, float], tile_radius: float) -> None:
+            nonlocal pending
+            executor.submit(run_tile, center, tile_radius)
+            pending += 1
+
+        tiles = self._hex_tiles(location, radius, self.tile_radius)
+        logger.info(f"Searching {len(tiles)} tiles of {min(self.tile_radius, radius)}m radius.")
+        for tile in tiles:
+            submit(tile, min(self.tile_radius, radius))
+
+        try:
+            while pending and not stop_event.is_set():
+                kind, payload = events.get()
+                if kind == "error":
+                    raise payload
+                if kind == "page":
+                    yield payload
+                    continue
+
+                pending -= 1
+                if payload is None:
+                    continue
+                center, tile_radius, returned, inside = payload
+                # Biased searches fill up with places from outside the tile once
+                # it runs out of its own, so only mostly-inside full tiles are split.
+                subdivide = returned >= result_cap and inside * 2 >= returned and tile_radius / 2 >= self.min_tile_radius
+                if stats is not None:
+                    stats.record_tile(subdivide)
+                if subdivide:
+                    logger.info(f"Tile at {center} hit the result cap, subdividing to {tile_radius / 2:.0f}m.")
+                    for child in self._subdivide_tile(center, tile_radius):
+                        submit(child, tile_radius / 2)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_place_details(
+            self,
+            place_id: str,
+            fields: Optional[list[str]] = None,
+            stats: Optional[SearchStats] = None
+    ) -> Optional[dict[str, Any]]:
+        """
+        Fetches detailed information for a specific place ID.
+
+        Args:
+            place_id: The unique identifier for the place.
+            fields: Optional list of details fields to request. All fields are
+                    returned when omitted.
+            stats: Optional statistics object to record the API request in.
+
+        Returns:
+            A dictionary containing the place details, or None on error.
+        """
+        try:
+            place_details = self._call("place", self.client.place, stats, place_id=place_id, fields=fields)
+            return place_details.get('result', None)
+        except (ApiError, HTTPError, Timeout) as e:
+            logger.warning(f"Could not get details for place_id {place_id}: {e}")
+            return None
+
+    @staticmethod
+    def _project_details(details: dict[str, Any], fields: dict[str, str]) -> dict[str, Any]:
+        """
+        Keeps only the response keys of the given field group.
+
+        Args:
+            details: A place details response.
+            fields: A mapping of request field names to response keys.
+
+        Returns:
+            A dictionary with the response keys present in `details`.
+        """
+        return {key: details[key] for key in fields.values() if key in details}
+
+    def _read_cached_details(self, place_ids: list[str]) -> dict[str, Any]:
+        """
+        Loads the cached details for a batch of places in a single query.
+
+        Args:
+            place_ids: The place IDs about to be processed.
+
+        Returns:
+            A mapping of place ID to its PlaceDetailsCache entry. Empty when
+            caching is disabled or the cache cannot be read.
+        """
+        if self.session_factory is None or not place_ids:
+            return {}
+
+        try:
+            with self.session_factory() as db:
+                entries = crud.read_place_details_cache_many(db, place_ids)
+                for entry in entries:
+                    db.expunge(entry)
+                return {entry.place_id: entry for entry in entries}
+        except SQLAlchemyError as e:
+            logger.warning(f"Place details cache lookup failed: {e}")
+            return {}
+
+    def _store_cached_details(self, entries: list[tuple[str, dict[str, Any], datetime, datetime]]) -> None:
+        """
+        Writes fetched place details back to the shared cache.
+
+        Args:
+            entries: Tuples of (place_id, details, stable_fetched_at, volatile_fetched_at).
+        """
+        if self.session_factory is None or not entries:
+            return
+
+        try:
+            with self.session_factory() as db:
+                crud.upsert_place_details_cache_many(db, entries)
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not cache place details: {e}")
+
+    def _plan_place_details(
+            self,
+            cached: Optional[Any],
+            cache_only: bool
+    ) -> Generator[list[str], Optional[dict[str, Any]], tuple[Optional[dict[str, Any]], str]]:
+        """
+        Applies the details cache policy, leaving the API requests to the caller.
+
+        Fresh entries are served as-is. When only the volatile fields have
+        expired, just those fields are refetched and merged into the cached
+        stable fields. Otherwise the full details are fetched. In cache-only
+        mode any cached entry is served regardless of age and the API is
+        never called. Only the fields that PlaceResult needs are requested.
+
+        The generator yields the list of fields to fetch whenever the API is
+        needed, and expects the fetched details (or None) to be sent back, so
+        the policy stays separate from the requests.
+
+        Args:
+            cached: The PlaceDetailsCache entry for the place, if any.
+            cache_only: If True, never call the API.
+
+        Returns:
+            A tuple of the details (or None) and the cache outcome: "hit",
+            "refresh", "stale", "miss" or "unavailable".
+        """
+        if cached is not None:
+            now = datetime.now(timezone.utc)
+            stable_fresh = now - cached.stable_fetched_at < self.details_stable_ttl
+            volatile_fresh = now - cached.volatile_fetched_at < self.details_volatile_ttl
+
+            if stable_fresh and volatile_fresh:
+                return dict(cached.details), "hit"
+            if cache_only:
+                return dict(cached.details), "stale"
+            if stable_fresh:
+                volatile_details = yield list(self._VOLATILE_DETAIL_FIELDS)
+                if volatile_details is not None:
+                    volatile_keys = self._VOLATILE_DETAIL_FIELDS.values()
+                    details = {key: value for key, value in cached.details.items() if key not in volatile_keys}
+                    details.update(self._project_details(volatile_details, self._VOLATILE_DETAIL_FIELDS))
+                    return details, "refresh"
+
+        if cache_only:
+            return None, "unavailable"
+
+        detail_fields = {**self._STABLE_DETAIL_FIELDS, **self._VOLATILE_DETAIL_FIELDS}
+        details = yield list(detail_fields)
+        if details is None:
+            return None, "miss"
+        return self._project_details(details, detail_fields), "miss"
+
+    def _resolve_place_details(
+            self,
+            place_id: str,
+            cached: Optional[Any],
+            cache_only: bool,
+            stats: Optional[SearchStats] = None
+    ) -> tuple[Optional[dict[str, Any]], str]:
+        """
+        Returns the details for a place, using the cache where it is fresh enough.
+
+        See `_plan_place_details` for the cache policy.
+
+        Args:
+            place_id: The unique identifier for the place.
+            cached: The PlaceDetailsCache entry for the place, if any.
+            cache_only: If True, never call the API.
+            stats: Optional statistics object to record the API requests in.
+
+        Returns:
+            A tuple of the details (or None) and the cache outcome: "hit",
+            "refresh", "stale", "miss" or "unavailable".
+        """
+        plan = self._plan_place_details(cached, cache_only)
+        try:
+            fields = next(plan)
+            while True:
+                fields = plan.send(self._get_place_details(place_id, fields=fields, stats=stats))
+        except StopIteration as resolved:
+            return resolved.value
+
+    def _read_known_place_ids(self, place_ids: list[str]) -> set[str]:
+        """
+        Finds which places of a batch were already stored as leads recently.
+
+        Args:
+            place_ids: The place IDs about to be processed.
+
+        Returns:
+            The place IDs with a lead younger than `known_lead_ttl`. Empty when
+            no database is configured or the lookup fails.
+        """
+        if self.session_factory is None or not place_ids:
+            return set()
+
+        try:
+            with self.session_factory() as db:
+                return crud.read_recent_lead_place_ids(db, place_ids, self.known_lead_ttl)
+        except SQLAlchemyError as e:
+            logger.warning(f"Known lead lookup failed: {e}")
+            return set()
+
+    @staticmethod
+    def _passes_prefilter(place: dict[str, Any], min_rating: float) -> bool:
+        """
+        Applies the filters that the search response alone can decide.
+
+        The search response already carries the rating, so places rated below
+        `min_rating` are dropped before paying for their details. A missing
+        rating counts as 0, as it does in `_qualify_business`.
+
+        Args:
+            place: The place data from a search result.
+            min_rating: The minimum rating for a business to be included.
 
-        return all_results
+        Returns:
+            True if the place may still qualify.
+        """
+        return (place.get('rating', 0) or 0) >= min_rating
 
-    def _get_place_details(self, place_id: str) -> Optional[dict[str, Any]]:
+    @staticmethod
+    def _candidate_promise(place: dict[str, Any]) -> float:
         """
-        Fetches detailed information for a specific place ID.
+        Scores how promising a candidate is from its search result.
 
         Args:
-            place_id: The unique identifier for the place.
+            place: The place data from a search result.
 
         Returns:
-            A dictionary containing the place details, or None on error.
+            The rating multiplied by the number of ratings.
         """
-        try:
-            place_details = self.client.place(place_id=place_id)
-            return place_details.get('result', None)
-        except (ApiError, HTTPError, Timeout) as e:
-            logger.warning(f"Could not get details for place_id {place_id}: {e}")
-            return None
+        return (place.get('rating', 0) or 0) * (place.get('user_ratings_total', 0) or 0)
 
     @staticmethod
     def _is_valid_website(website: str) -> bool:
@@ -233,58 +1278,595 @@ class GoogleMapsClient:
             lng=place.get("geometry", {}).get("location", {}).get("lng")
         )
 
-    def _process_place_results(
+    def _qualify_business(
             self,
-            places: list[dict[str, Any]],
+            place: dict[str, Any],
+            details: Optional[dict[str, Any]],
             min_rating: float,
-            exclude_websites: bool,
-            max_results: int
-    ) -> list[PlaceResult]:
+            exclude_websites: bool
+    ) -> Optional[PlaceResult]:
+        """
+        Applies the search filters to a place and formats it if it passes.
+
+        Args:
+            place: The initial place data from a search result.
+            details: The detailed place data, or None if it could not be fetched.
+            min_rating: The minimum rating for a business to be included.
+            exclude_websites: If True, only include businesses without a valid website.
+
+        Returns:
+            The formatted business, or None if it was filtered out.
         """
-        Processes raw search results into a final list of formatted businesses.
+        if not details:
+            return None
+
+        rating = details.get('rating', 0) or 0
+        if rating < min_rating:
+            return None
+
+        website = details.get('website', '')
+        if exclude_websites and self._is_valid_website(website):
+            return None
+
+        business_data = self._format_business_data(place, details)
+        if business_data.name and business_data.address:
+            return business_data
+        return None
 
-        This method fetches details for each place, applies filters, and formats
-        the data into the final structure.
+    def _iter_place_results(
+            self,
+            sources: list[Callable[[], Iterable[list[dict[str, Any]]]]],
+            stop_event: threading.Event,
+            min_rating: float,
+            exclude_websites: bool,
+            max_results: int,
+            stats: Optional[SearchStats] = None,
+            cache_only: bool = False,
+            inline: bool = False,
+            skip_known: bool = False,
+            group_of: Optional[Callable[[dict[str, Any]], Any]] = None,
+            max_results_per_group: Optional[int] = None,
+            pass_rate_category: Optional[str] = None,
+            max_concurrent_sources: Optional[int] = None
+    ) -> Iterator[PlaceResult]:
+        """
+        Streams qualified businesses out of one or more concurrent searches.
+
+        Each source runs in a worker thread and pushes result pages onto a
+        shared event queue. With `max_concurrent_sources`, the next source is
+        only started once a running one is done. Place details lookups start as soon as the first
+        page arrives, with at most `max_concurrent_details` in flight, while
+        the sources keep waiting for their next page tokens. Businesses are
+        yielded in the order their details complete.
+
+        Places are deduplicated by place_id across all sources, and dropped
+        before any details lookup if their search result already fails
+        `min_rating` or, with `skip_known`, if they were stored as leads
+        recently. The remaining candidates wait in a priority queue and the
+        most promising ones (rating times number of ratings) are looked up
+        first, so the best leads fill `max_results`. Details are looked up in
+        the shared place details cache first, with one query per page, and
+        newly fetched details are written back in one statement when the
+        stream ends. Once `max_results` businesses have been yielded, or the
+        consumer stops iterating, the sources are told to stop and any queued
+        details requests are cancelled. With `group_of`, no group yields more
+        than `max_results_per_group` businesses, and candidates of a full group
+        are dropped without a details lookup. With `pass_rate_category`, the
+        share of examined candidates that qualified is recorded with the
+        planner when the stream completes; a stream that fails or that the
+        consumer closes early is not recorded, as its share would be skewed.
 
         Args:
-            places: A list of raw place results from the API.
+            sources: Callables returning iterables of raw place pages.
+            stop_event: Event set when no more pages are needed.
             min_rating: The minimum rating for a business to be included.
             exclude_websites: If True, only include businesses without a valid website.
-            max_results: The maximum number of final results to return.
+            max_results: The maximum number of businesses to yield.
+            stats: Optional statistics object updated with the number of details
+                   calls made and used and the cache hit/miss counters.
+            cache_only: If True, serve details from the cache only, even if stale.
+            inline: If True, the source pages already carry the place details,
+                    as produced by the inline strategy.
+            skip_known: If True, skip places stored as leads within `known_lead_ttl`.
+            group_of: Optional callable returning the group of a raw place.
+            max_results_per_group: The maximum number of businesses to yield per group.
+            pass_rate_category: Optional business type to record the filter pass rate under.
+            max_concurrent_sources: The maximum number of sources running at once. All at once when omitted.
+
+        Yields:
+            Processed and filtered businesses.
+
+        Raises:
+            GoogleMapsClientError: If any of the searches fails.
+        """
+        events: queue.Queue[tuple[str, Any]] = queue.Queue()
+
+        def run_source(source: Callable[[], Iterable[list[dict[str, Any]]]]) -> None:
+            try:
+                for source_page in source():
+                    events.put(("page", source_page))
+                events.put(("done", None))
+            except Exception as source_error:
+                events.put(("done", source_error))
+
+        pending_sources = iter(sources)
+        search_workers = max(1, min(max_concurrent_sources or len(sources), len(sources)))
+        search_executor = ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix="place-search")
+
+        def start_source() -> None:
+            search_source = next(pending_sources, None)
+            if search_source is not None:
+                search_executor.submit(run_source, search_source)
+
+        for _ in range(search_workers):
+            start_source()
+
+        pool = _CandidatePool(self, min_rating, exclude_websites, max_results, group_of, max_results_per_group)
+        active_sources = len(sources)
+        in_flight = 0
+
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent_details, thread_name_prefix="place-details")
+        completed = False
+
+        def dispatch() -> None:
+            nonlocal in_flight
+            while in_flight < self.max_concurrent_details and (candidate := pool.pop_candidate()) is not None:
+                future = executor.submit(
+                    self._resolve_place_details, candidate['place_id'],
+                    pool.cached_details.get(candidate['place_id']), cache_only, stats
+                )
+                future.add_done_callback(lambda done, place=candidate: events.put(("details", (place, done))))
+                in_flight += 1
+
+        try:
+            while not pool.full and (active_sources or in_flight or pool.candidates):
+                kind, payload = events.get()
+
+                if kind == "done":
+                    active_sources -= 1
+                    if payload is not None:
+                        raise payload
+                    start_source()
+
+                elif kind == "page":
+                    new_places = pool.admit(payload)
+                    if skip_known and new_places:
+                        known_ids = self._read_known_place_ids([place['place_id'] for place in new_places])
+                        new_places = pool.drop_known(new_places, known_ids)
+
+                    if inline:
+                        yield from pool.take_inline(new_places)
+                    else:
+                        pool.add_candidates(
+                            new_places, self._read_cached_details([place['place_id'] for place in new_places])
+                        )
+
+                else:
+                    place, future = payload
+                    in_flight -= 1
+                    business_data = pool.take_details(place, *future.result())
+                    if business_data:
+                        yield business_data
+
+                dispatch()
+            completed = True
+        finally:
+            # Stop the searches and drop queued requests; requests already running finish in the background.
+            stop_event.set()
+            search_executor.shutdown(wait=False, cancel_futures=True)
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._store_cached_details(pool.cache_writes)
+            pool.report(stats)
+            if completed and pass_rate_category is not None:
+                self.planner.record(pass_rate_category, exclude_websites, pool.examined, pool.qualified)
+
+    def _tile_paginated_search(
+            self,
+            search_func: Callable[..., dict],
+            stop_event: threading.Event,
+            stats: Optional[SearchStats],
+            location: dict[str, float],
+            radius: float,
+            **kwargs: Any
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Runs a legacy search over one tile, fetching up to the result cap."""
+        return self._iter_paginated_search(
+            search_func, self._SEARCH_RESULT_CAP, stop_event, stats, location=location, radius=round(radius), **kwargs
+        )
+
+    def _tile_inline_text_search(
+            self,
+            query: str,
+            location: dict[str, float],
+            radius: float,
+            stop_event: threading.Event,
+            stats: Optional[SearchStats] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Runs an inline Text Search over one tile, fetching up to the result cap."""
+        return self._iter_inline_text_search(query, location, round(radius), self._SEARCH_RESULT_CAP, stop_event, stats)
+
+    def _tile_inline_nearby_search(
+            self,
+            business_type: str,
+            location: dict[str, float],
+            radius: float,
+            stats: Optional[SearchStats] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Runs an inline Nearby Search over one tile."""
+        return self._iter_inline_nearby_search(business_type, location, round(radius), stats)
+
+    def plan_search(
+            self,
+            business_type: Optional[str] = None,
+            radius: int = 50000,
+            max_results: int = 100,
+            exclude_websites: bool = True,
+            strategy: Optional[str] = None,
+            tiled: bool = False
+    ) -> SearchPlan:
+        """
+        Plans a search without making any request.
+
+        The planner picks the cheapest of a Text Search, a Nearby Search (for
+        supported place types), both, or, when `tiled` allows it and the
+        search circle is larger than a tile, a tiled search, and sizes the
+        searches after the filter pass rate recorded for the business type.
+
+        Args:
+            business_type: An optional specific type of business to search for.
+            radius: The search radius in meters.
+            max_results: The maximum number of businesses requested.
+            exclude_websites: If True, businesses that have a website are filtered out.
+            strategy: The search strategy, `STRATEGY_DETAILS` (default) or `STRATEGY_INLINE`.
+            tiled: If True, allow splitting the search circle into tiles.
 
         Returns:
-            A list of processed and filtered business dictionaries.
+            The search plan, with the estimated requests, cost and wall time.
+
+        Raises:
+            ValueError: If the strategy is unknown.
         """
-        businesses = []
-        processed_ids = set()
+        strategy = strategy or self.STRATEGY_DETAILS
+        if strategy not in (self.STRATEGY_DETAILS, self.STRATEGY_INLINE):
+            raise ValueError(f"Unknown search strategy: {strategy}")
 
-        for place in places:
-            if len(businesses) >= max_results:
-                break
+        # The number of tiles only depends on the radii, so any centre will do.
+        tiles = len(self._hex_tiles({"lat": 0.0, "lng": 0.0}, radius, self.tile_radius)) if tiled else 0
+        return self.planner.plan(
+            business_type=business_type,
+            max_results=max_results,
+            exclude_websites=exclude_websites,
+            strategy=strategy,
+            with_nearby=bool(business_type and business_type in self._VALID_NEARBY_SEARCH_TYPES),
+            tiles=tiles,
+            result_cap=self._SEARCH_RESULT_CAP,
+            nearby_result_cap=(
+                self._INLINE_NEARBY_RESULT_CAP if strategy == self.STRATEGY_INLINE else self._SEARCH_RESULT_CAP
+            ),
+            max_concurrent_details=self.max_concurrent_details,
+            max_concurrent_tiles=self.max_concurrent_tiles,
+            page_token_delay=self._PAGE_TOKEN_DELAY
+        )
 
-            place_id = place.get('place_id')
-            if not place_id or place_id in processed_ids:
-                continue
+    def _build_search_sources(
+            self,
+            strategy: str,
+            query: str,
+            location: dict[str, float],
+            radius: int,
+            business_type: Optional[str],
+            plan: SearchPlan,
+            stop_event: threading.Event,
+            stats: Optional[SearchStats] = None
+    ) -> list[Callable[[], Iterable[list[dict[str, Any]]]]]:
+        """
+        Creates the searches of a plan, to run concurrently.
 
-            processed_ids.add(place_id)
+        The plan decides whether a Text Search, a Nearby Search or both are
+        run, and how many candidates each one fetches. In tiled mode, each of
+        them is run over the tiles of the search circle and fetches every page
+        of each tile.
 
-            details = self._get_place_details(place_id)
-            if not details:
-                continue
+        Args:
+            strategy: `STRATEGY_DETAILS` or `STRATEGY_INLINE`.
+            query: The text query to search for.
+            location: The 'lat' and 'lng' to centre the search on.
+            radius: The search radius in meters.
+            business_type: An optional place type for the Nearby Search.
+            plan: The plan of the search, from `plan_search`.
+            stop_event: Event set when no more pages are needed.
+            stats: Optional statistics object to record the API requests in.
 
-            rating = details.get('rating', 0) or 0
-            if rating < min_rating:
-                continue
+        Returns:
+            A list of callables, each returning an iterable of result pages.
+        """
+        text_fetch_limit, nearby_fetch_limit = plan.estimate.text_fetch_limit, plan.estimate.nearby_fetch_limit
+        if nearby_fetch_limit:
+            logger.info(f"Performing Nearby Search for type: {business_type}")
+
+        if plan.mode == SearchPlanner.MODE_TILED:
+            if strategy == self.STRATEGY_INLINE:
+                text_search = partial(self._tile_inline_text_search, query, stop_event=stop_event, stats=stats)
+                nearby_search = partial(self._tile_inline_nearby_search, business_type, stats=stats)
+            else:
+                text_search = partial(self._tile_paginated_search, self.client.places, stop_event, stats, query=query)
+                nearby_search = partial(
+                    self._tile_paginated_search, self.client.places_nearby, stop_event, stats, type=business_type
+                )
+
+            sources = [partial(
+                self._iter_tiled_search, text_search, location, radius, text_fetch_limit, stop_event, stats
+            )]
+            if nearby_fetch_limit:
+                sources.append(partial(
+                    self._iter_tiled_search, nearby_search, location, radius, nearby_fetch_limit, stop_event, stats
+                ))
+            return sources
+
+        sources = []
+        if strategy == self.STRATEGY_INLINE:
+            if text_fetch_limit:
+                sources.append(partial(
+                    self._iter_inline_text_search, query, location, radius, text_fetch_limit, stop_event, stats
+                ))
+            if nearby_fetch_limit:
+                sources.append(partial(self._iter_inline_nearby_search, business_type, location, radius, stats))
+            return sources
+
+        if text_fetch_limit:
+            sources.append(partial(
+                self._iter_paginated_search, self.client.places, text_fetch_limit, stop_event, stats,
+                query=query, location=location, radius=radius
+            ))
+        if nearby_fetch_limit:
+            sources.append(partial(
+                self._iter_paginated_search, self.client.places_nearby, nearby_fetch_limit, stop_event, stats,
+                location=location, radius=radius, type=business_type
+            ))
+        return sources
+
+    def stream_businesses(
+            self,
+            city: str,
+            business_type: Optional[str] = None,
+            radius: int = 50000,
+            min_rating: float = 0.0,
+            max_results: int = 100,
+            exclude_websites: bool = True,
+            stats: Optional[SearchStats] = None,
+            cache_only: bool = False,
+            strategy: Optional[str] = None,
+            tiled: bool = False,
+            skip_known: bool = False,
+            plan: Optional[SearchPlan] = None
+    ) -> Iterator[PlaceResult]:
+        """
+        Searches for businesses in a city, yielding each one as soon as it qualifies.
 
-            website = details.get('website', '')
-            if exclude_websites and self._is_valid_website(website):
-                continue
+        This is the streaming counterpart of `search_businesses`. The Text and
+        Nearby searches run concurrently and place details are fetched while
+        further result pages are still loading. Closing the iterator early
+        stops the searches and cancels queued details requests.
+
+        The searches to run, and how many candidates they fetch, come from
+        `plan_search`, which sizes them after the share of candidates of the
+        business type that passed the filters in past searches. That share is
+        updated when the stream ends.
+
+        A single search returns at most 60 results, which leaves most of a
+        large city uncovered. With `tiled`, the plan may run the searches over
+        tiles of the search circle instead; see `_iter_tiled_search`.
+
+        Args:
+            city: The name of the city to search within.
+            business_type: An optional specific type of business to search for (e.g., "restaurant").
+            radius: The search radius in meters from the city center.
+            min_rating: The minimum review rating for businesses to be included.
+            max_results: The maximum number of businesses to yield.
+            exclude_websites: If True, filters out businesses that have a website.
+            stats: Optional statistics object updated with the API usage of the search.
+            cache_only: If True, place details are served from the cache only.
+            strategy: The search strategy, `STRATEGY_DETAILS` (default) or `STRATEGY_INLINE`.
+            tiled: If True, allow splitting the search circle into tiles searched in
+                   parallel, subdividing the tiles that hit the per-query result cap.
+                   Tiles are only used when a single query cannot return enough candidates.
+            skip_known: If True, skip places that were stored as leads recently.
+            plan: Optional plan of the search. Made with `plan_search` when omitted.
+
+        Yields:
+            Businesses in the order they qualify.
+
+        Raises:
+            ValueError: If the strategy is unknown.
+            LocationNotFoundError: If the specified city cannot be found.
+            GoogleMapsClientError: For other API or processing errors.
+        """
+        strategy = strategy or self.STRATEGY_DETAILS
+        if strategy not in (self.STRATEGY_DETAILS, self.STRATEGY_INLINE):
+            raise ValueError(f"Unknown search strategy: {strategy}")
+
+        plan = plan or self.plan_search(business_type, radius, max_results, exclude_websites, strategy, tiled)
+        location = self._get_city_location(city, stats)
+        query = f"{business_type or 'business'} in {city}"
+        stop_event = threading.Event()
+
+        sources = self._build_search_sources(strategy, query, location, radius, business_type, plan, stop_event, stats)
+        yield from self._iter_place_results(
+            sources=sources,
+            stop_event=stop_event,
+            min_rating=min_rating,
+            exclude_websites=exclude_websites,
+            max_results=max_results,
+            stats=stats,
+            cache_only=cache_only,
+            inline=strategy == self.STRATEGY_INLINE,
+            skip_known=skip_known,
+            pass_rate_category=business_type or ""
+        )
+
+    def _iter_batch_source(
+            self,
+            source: Callable[[], Iterable[list[dict[str, Any]]]],
+            search: tuple[str, str],
+            origins: dict[str, tuple[str, str]],
+            stop_event: threading.Event
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        Runs one search of a batch, recording which search found each place.
+
+        The search is skipped if the batch is already complete. A failing
+        search is logged and ends without failing the rest of the batch,
+        unless the API key was rejected.
+
+        Args:
+            source: The search to run.
+            search: The (city, business_type) the search belongs to.
+            origins: Mapping of place ID to the search that found it first.
+            stop_event: Event set when no more pages are needed.
+
+        Yields:
+            The pages of the search.
+        """
+        if stop_event.is_set():
+            return
+        try:
+            for page in source():
+                for place in page:
+                    if place.get('place_id'):
+                        origins.setdefault(place['place_id'], search)
+                yield page
+        except APIKeyError:
+            raise
+        except GoogleMapsClientError as e:
+            logger.warning(f"Search for '{search[1]}' in {search[0]} failed, continuing the batch: {e}")
+
+    @classmethod
+    def plan_batch(cls, cities: list[str], business_types: list[str]) -> tuple[list[str], list[str]]:
+        """
+        Drops the duplicate cities and business types of a batch, keeping the first spelling.
+
+        Args:
+            cities: The cities to search in.
+            business_types: The business types to search for in every city.
+
+        Returns:
+            The unique cities and business types, in their original order.
+        """
+        planned_cities: dict[str, str] = {}
+        for city in cities:
+            planned_cities.setdefault(cls._normalize_city(city), city)
+        return list(planned_cities.values()), list(dict.fromkeys(business_types))
+
+    def stream_batch_businesses(
+            self,
+            cities: list[str],
+            business_types: list[str],
+            radius: int = 50000,
+            min_rating: float = 0.0,
+            max_results: int = 10,
+            max_total_results: Optional[int] = None,
+            exclude_websites: bool = True,
+            stats: Optional[SearchStats] = None,
+            cache_only: bool = False,
+            strategy: Optional[str] = None,
+            tiled: bool = False,
+            skip_known: bool = False,
+            max_concurrent_searches: int = 4
+    ) -> Iterator[tuple[tuple[str, str], PlaceResult]]:
+        """
+        Searches every combination of cities and business types as one batch.
+
+        The batch is planned first: duplicate cities and business types are
+        dropped (see `plan_batch`), and every city is geocoded once,
+        concurrently. All the searches then feed a single pipeline, so places
+        found by overlapping searches are deduplicated across the whole batch
+        and share the place details lookups, the cache and the
+        `max_total_results` budget, while no search yields more than
+        `max_results` businesses. At most `max_concurrent_searches` searches
+        run at once. Cities that cannot be found and searches that fail are
+        skipped.
+
+        Args:
+            cities: The cities to search in.
+            business_types: The business types to search for in every city.
+            radius: The search radius in meters from each city center.
+            min_rating: The minimum review rating for businesses to be included.
+            max_results: The maximum number of businesses to yield per search.
+            max_total_results: The maximum number of businesses to yield for the
+                               whole batch. Defaults to `max_results` per search.
+            exclude_websites: If True, filters out businesses that have a website.
+            stats: Optional statistics object updated with the API usage of the batch.
+            cache_only: If True, place details are served from the cache only.
+            strategy: The search strategy, `STRATEGY_DETAILS` (default) or `STRATEGY_INLINE`.
+            tiled: If True, allow splitting each search circle into tiles.
+            skip_known: If True, skip places that were stored as leads recently.
+            max_concurrent_searches: The maximum number of searches running at once.
 
-            business_data = self._format_business_data(place, details)
-            if business_data.name and business_data.address:
-                businesses.append(business_data)
+        Yields:
+            Tuples of the (city, business_type) search that found a business and
+            the business, in the order they qualify.
 
-        return businesses
+        Raises:
+            ValueError: If the strategy is unknown.
+            LocationNotFoundError: If none of the cities can be found.
+            APIKeyError: If the API key is rejected.
+        """
+        strategy = strategy or self.STRATEGY_DETAILS
+        if strategy not in (self.STRATEGY_DETAILS, self.STRATEGY_INLINE):
+            raise ValueError(f"Unknown search strategy: {strategy}")
+
+        unique_cities, unique_types = self.plan_batch(cities, business_types)
+
+        def locate(city: str) -> Optional[dict[str, float]]:
+            try:
+                return self._get_city_location(city, stats)
+            except APIKeyError:
+                raise
+            except GoogleMapsClientError as e:
+                logger.warning(f"Skipping {city} in batch search: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrent_searches), thread_name_prefix="batch-geocode") as executor:
+            locations = dict(zip(unique_cities, executor.map(locate, unique_cities)))
+
+        searches = [
+            (city, business_type)
+            for city in unique_cities if locations[city] is not None
+            for business_type in unique_types
+        ]
+        if not searches:
+            raise LocationNotFoundError(f"None of the cities could be found: {', '.join(cities)}")
+        logger.info(f"Planned {len(searches)} searches over {len(unique_cities)} cities and {len(unique_types)} types.")
+
+        plans = {
+            business_type: self.plan_search(business_type, radius, max_results, exclude_websites, strategy, tiled)
+            for business_type in unique_types
+        }
+        stop_event = threading.Event()
+        origins: dict[str, tuple[str, str]] = {}
+        sources = []
+        for city, business_type in searches:
+            for source in self._build_search_sources(
+                    strategy, f"{business_type} in {city}", locations[city], radius, business_type,
+                    plans[business_type], stop_event, stats
+            ):
+                sources.append(partial(self._iter_batch_source, source, (city, business_type), origins, stop_event))
+
+        for business in self._iter_place_results(
+                sources=sources,
+                stop_event=stop_event,
+                min_rating=min_rating,
+                exclude_websites=exclude_websites,
+                max_results=max_total_results or max_results * len(searches),
+                stats=stats,
+                cache_only=cache_only,
+                inline=strategy == self.STRATEGY_INLINE,
+                skip_known=skip_known,
+                group_of=lambda place: origins.get(place['place_id']),
+                max_results_per_group=max_results,
+                max_concurrent_sources=max_concurrent_searches
+        ):
+            yield origins.get(business.place_id, searches[0]), business
 
     def search_businesses(
             self,
@@ -293,13 +1875,19 @@ class GoogleMapsClient:
             radius: int = 50000,
             min_rating: float = 0.0,
             max_results: int = 100,
-            exclude_websites: bool = True
+            exclude_websites: bool = True,
+            stats: Optional[SearchStats] = None,
+            cache_only: bool = False,
+            strategy: Optional[str] = None,
+            tiled: bool = False,
+            skip_known: bool = False
     ) -> list[PlaceResult]:
         """
         Searches for businesses in a city, applying filters and formatting results.
 
         This method orchestrates the entire search process, from finding the city's
-        location to fetching and processing business data.
+        location to fetching and processing business data. It collects the
+        results of `stream_businesses`.
 
         Args:
             city: The name of the city to search within.
@@ -308,54 +1896,58 @@ class GoogleMapsClient:
             min_rating: The minimum review rating for businesses to be included.
             max_results: The maximum number of businesses to return.
             exclude_websites: If True, filters out businesses that have a website.
+            stats: Optional statistics object updated with the API usage of the search.
+            cache_only: If True, place details are served from the cache only.
+            strategy: The search strategy, `STRATEGY_DETAILS` (default) or `STRATEGY_INLINE`.
+            tiled: If True, allow splitting the search circle into tiles searched in
+                   parallel, subdividing the tiles that hit the per-query result cap.
+            skip_known: If True, skip places that were stored as leads recently.
 
         Returns:
             A list of dictionaries, where each dictionary represents a business.
 
         Raises:
+            ValueError: If the strategy is unknown.
             LocationNotFoundError: If the specified city cannot be found.
             GoogleMapsClientError: For other API or processing errors.
         """
-        location = self._get_city_location(city)
-        query = f"{business_type or 'business'} in {city}"
+        return list(self.stream_businesses(
+            city=city,
+            business_type=business_type,
+            radius=radius,
+            min_rating=min_rating,
+            max_results=max_results,
+            exclude_websites=exclude_websites,
+            stats=stats,
+            cache_only=cache_only,
+            strategy=strategy,
+            tiled=tiled,
+            skip_known=skip_known
+        ))
 
-        # Perform a Text Search first, as it's generally broader
-        raw_results = self._perform_paginated_search(
-            search_func=self.client.places,
-            max_results=max_results * 5,  # Fetch more to have enough for filtering
-            query=query,
-            location=location,
-            radius=radius
-        )
+# --- Public API Function ---
 
-        # If a valid business_type is provided, also do a Nearby Search
-        if business_type and business_type in self._VALID_NEARBY_SEARCH_TYPES:
-            logger.info(f"Performing additional Nearby Search for type: {business_type}")
-            nearby_results = self._perform_paginated_search(
-                search_func=self.client.places_nearby,
-                max_results=max_results * 3,
-                location=location,
-                radius=radius,
-                type=business_type
-            )
-            # Combine and deduplicate results
-            places_by_id = {p['place_id']: p for p in raw_results}
-            places_by_id.update({p['place_id']: p for p in nearby_results})
-            raw_results = list(places_by_id.values())
+_maps_client_instance: Optional[GoogleMapsClient] = None
 
-        logger.info(f"Found {len(raw_results)} total raw results for {city}.")
 
-        return self._process_place_results(
-            places=raw_results,
-            min_rating=min_rating,
-            exclude_websites=exclude_websites,
-            max_results=max_results
-        )
+def _pooled_session(pool_size: int) -> requests.Session:
+    """
+    Creates a requests session keeping up to `pool_size` connections alive per host.
 
+    The default pool of a session keeps 10 connections per host. The details,
+    tile and batch worker threads of the searches share one client and
+    together send more concurrent requests than that, so the connections
+    past the pool would be opened for a single request and discarded.
 
-# --- Public API Function ---
+    Args:
+        pool_size: The number of connections kept alive per host.
 
-_maps_client_instance: Optional[GoogleMapsClient] = None
+    Returns:
+        The session.
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=max(1, pool_size)))
+    return session
 
 
 def get_maps_client() -> GoogleMapsClient:
@@ -374,31 +1966,166 @@ def get_maps_client() -> GoogleMapsClient:
     global _maps_client_instance
     if _maps_client_instance is None:
         logger.info("Initializing global GoogleMapsClient instance...")
-        _maps_client_instance = GoogleMapsClient(api_key=Config.GOOGLE_MAPS_API_KEY)
+        fake_client = None
+        if Config.GOOGLE_MAPS_FAKE_FIXTURE:
+            # Imported here, so the benchmark support code is only needed when a fixture is served
+            from benchmarks.google_maps_fake import FakeGoogleMapsClient
+
+            logger.warning(f"Serving Google Maps requests from the fixture {Config.GOOGLE_MAPS_FAKE_FIXTURE}.")
+            fake_client = FakeGoogleMapsClient.from_fixture(Config.GOOGLE_MAPS_FAKE_FIXTURE)
+        _maps_client_instance = GoogleMapsClient(
+            api_key=Config.GOOGLE_MAPS_API_KEY,
+            max_concurrent_details=Config.GOOGLE_MAPS_DETAILS_CONCURRENCY,
+            session_factory=SessionLocal,
+            geocode_cache_ttl=Config.GEOCODE_CACHE_TTL_SECONDS,
+            details_stable_ttl=Config.PLACE_DETAILS_STABLE_TTL_SECONDS,
+            details_volatile_ttl=Config.PLACE_DETAILS_VOLATILE_TTL_SECONDS,
+            tile_radius=Config.GOOGLE_MAPS_TILE_RADIUS,
+            min_tile_radius=Config.GOOGLE_MAPS_MIN_TILE_RADIUS,
+            max_concurrent_tiles=Config.GOOGLE_MAPS_TILE_CONCURRENCY,
+            known_lead_ttl=Config.KNOWN_LEAD_TTL_SECONDS,
+            client=fake_client,
+            rate_limiter=TokenBucketRateLimiter(
+                parse_rate_limits(Config.GOOGLE_MAPS_RATE_LIMITS),
+                session_factory=SessionLocal,
+                lease_size=Config.GOOGLE_MAPS_RATE_LIMIT_LEASE
+            ),
+            max_quota_retries=Config.GOOGLE_MAPS_QUOTA_RETRIES,
+            requests_session=None if fake_client else _pooled_session(Config.GOOGLE_MAPS_HTTP_MAX_CONNECTIONS),
+            planner=SearchPlanner(
+                session_factory=SessionLocal,
+                prior_pass_rate=Config.SEARCH_PASS_RATE_PRIOR,
+                max_over_fetch=Config.SEARCH_MAX_OVER_FETCH
+            )
+        )
     return _maps_client_instance
 
 
+_search_cache = SearchCache(
+    session_factory=SessionLocal,
+    ttl=Config.SEARCH_RESULT_CACHE_TTL_SECONDS,
+    lock_timeout=Config.SEARCH_LOCK_TIMEOUT_SECONDS
+)
+
+
+def _search_params(
+        city: str,
+        business_type: Optional[str],
+        radius: int,
+        min_rating: float,
+        max_results: int,
+        exclude_websites: bool,
+        cache_only: bool,
+        strategy: Optional[str],
+        tiled: Optional[bool],
+        skip_known: Optional[bool]
+) -> dict[str, Any]:
+    """
+    Normalizes the parameters of a search, applying the configured defaults.
+
+    Equivalent searches get the same parameters, so they share a search cache entry.
+
+    Returns:
+        The normalized parameters.
+    """
+    return {
+        "city": GoogleMapsClient._normalize_city(city),
+        "business_type": (business_type or "").strip().lower() or None,
+        "radius": radius,
+        "min_rating": float(min_rating),
+        "max_results": max_results,
+        "exclude_websites": exclude_websites,
+        "cache_only": cache_only,
+        "strategy": strategy or Config.GOOGLE_MAPS_SEARCH_STRATEGY,
+        "tiled": Config.GOOGLE_MAPS_TILED_SEARCH if tiled is None else tiled,
+        "skip_known": Config.GOOGLE_MAPS_SKIP_KNOWN_LEADS if skip_known is None else skip_known,
+    }
+
+
 def _google_maps_search(
         city: str,
         business_type: Optional[str] = None,
         radius: int = 50000,
         min_rating: float = 0.0,
         max_results: int = 100,
-        exclude_websites: bool = True
+        exclude_websites: bool = True,
+        cache_only: bool = False,
+        strategy: Optional[str] = None,
+        tiled: Optional[bool] = None,
+        skip_known: Optional[bool] = None,
+        refresh: bool = False
 ) -> GoogleMapsSearchOutput:
     """
     High-level function to search for businesses using Google Maps.
 
     This function provides a safe and simple interface for the search,
     handling client initialization and all potential errors, and returning
-    a standardized dictionary response.
+    a standardized dictionary response. Successful results are cached by
+    their normalized parameters for `SEARCH_RESULT_CACHE_TTL_SECONDS`, and
+    concurrent identical searches share a single execution.
+
+    Args:
+        city: The name of the city to search in.
+        business_type: Optional business type filter (e.g., "cafe").
+        radius: Radius in meters for the search.
+        min_rating: Minimum rating filter.
+        max_results: Maximum number of results to return.
+        exclude_websites: If True, only return businesses without websites.
+        cache_only: If True, serve place details from the cache without calling the API.
+        strategy: The search strategy ("details" or "inline"). Defaults to the configured strategy.
+        tiled: If True, allow splitting the search area into tiles to get past the per-query result cap.
+               Defaults to the configured setting.
+        skip_known: If True, skip places already stored as leads recently. Defaults to the configured setting.
+        refresh: If True, run the search again instead of serving cached results.
+
+    Returns:
+        A dictionary with search status, results, and metadata.
+    """
+    params = _search_params(
+        city, business_type, radius, min_rating, max_results, exclude_websites, cache_only, strategy, tiled, skip_known
+    )
+    return _search_cache.get_or_run(params, partial(
+        _run_google_maps_search,
+        city=city,
+        business_type=business_type,
+        radius=radius,
+        min_rating=min_rating,
+        max_results=max_results,
+        exclude_websites=exclude_websites,
+        cache_only=cache_only,
+        strategy=params["strategy"],
+        tiled=params["tiled"],
+        skip_known=params["skip_known"]
+    ), refresh=refresh)
+
+
+def _run_google_maps_search(
+        city: str,
+        business_type: Optional[str] = None,
+        radius: int = 50000,
+        min_rating: float = 0.0,
+        max_results: int = 100,
+        exclude_websites: bool = True,
+        cache_only: bool = False,
+        strategy: Optional[str] = None,
+        tiled: Optional[bool] = None,
+        skip_known: Optional[bool] = None
+) -> GoogleMapsSearchOutput:
+    """
+    Runs a Google Maps search for `_google_maps_search`, bypassing the search cache.
 
     Args:
         city: The name of the city to search in.
         business_type: Optional business type filter (e.g., "cafe").
+        radius: Radius in meters for the search.
         min_rating: Minimum rating filter.
         max_results: Maximum number of results to return.
         exclude_websites: If True, only return businesses without websites.
+        cache_only: If True, serve place details from the cache without calling the API.
+        strategy: The search strategy ("details" or "inline"). Defaults to the configured strategy.
+        tiled: If True, allow splitting the search area into tiles to get past the per-query result cap.
+               Defaults to the configured setting.
+        skip_known: If True, skip places already stored as leads recently. Defaults to the configured setting.
 
     Returns:
         A dictionary with search status, results, and metadata.
@@ -411,6 +2138,7 @@ def _google_maps_search(
         "max_results": max_results,
         "exclude_websites": exclude_websites,
     }
+    stats = SearchStats()
 
     try:
         maps_client = get_maps_client()
@@ -420,7 +2148,12 @@ def _google_maps_search(
             radius=radius,
             min_rating=min_rating,
             max_results=max_results,
-            exclude_websites=exclude_websites
+            exclude_websites=exclude_websites,
+            stats=stats,
+            cache_only=cache_only,
+            strategy=strategy or Config.GOOGLE_MAPS_SEARCH_STRATEGY,
+            tiled=Config.GOOGLE_MAPS_TILED_SEARCH if tiled is None else tiled,
+            skip_known=Config.GOOGLE_MAPS_SKIP_KNOWN_LEADS if skip_known is None else skip_known
         )
 
         return GoogleMapsSearchOutput(
@@ -428,7 +2161,7 @@ def _google_maps_search(
             message=None,
             total_results=len(businesses),
             results=businesses,
-            search_metadata=SearchMetadata(**response_metadata, api_available=True)
+            search_metadata=SearchMetadata(**response_metadata, api_available=True, stats=stats)
         )
         #
         # return {
@@ -438,7 +2171,7 @@ def _google_maps_search(
         #     "search_metadata": {**response_metadata, "api_available": True}
         # }
 
-    except (APIKeyError, LocationNotFoundError, GoogleMapsClientError) as e:
+    except (APIKeyError, LocationNotFoundError, GoogleMapsClientError, ValueError) as e:
         logger.error(f"Failed to complete Google Maps search for '{city}': {e}")
         # return {
         #     "status": "error",
@@ -472,6 +2205,197 @@ def _google_maps_search(
         )
 
 
+def stream_google_maps_search(
+        city: str,
+        business_type: Optional[str] = None,
+        radius: int = 50000,
+        min_rating: float = 0.0,
+        max_results: int = 100,
+        exclude_websites: bool = True,
+        cache_only: bool = False,
+        strategy: Optional[str] = None,
+        tiled: Optional[bool] = None,
+        skip_known: Optional[bool] = None,
+        stats: Optional[SearchStats] = None,
+        refresh: bool = False
+) -> Iterator[PlaceResult]:
+    """
+    Streaming variant of the Google Maps business search.
+
+    Yields each business as soon as it passes the filters, so callers can
+    start working on the first leads while the search is still running.
+    Unlike `_google_maps_search`, errors are not converted into an error
+    response and propagate to the caller. Results cached by an identical
+    search are replayed instead, and a search streamed to the end is
+    cached; identical streams are not coalesced.
+
+    Args:
+        city: The name of the city to search in.
+        business_type: Optional business type filter (e.g., "cafe").
+        radius: Radius in meters for the search.
+        min_rating: Minimum rating filter.
+        max_results: Maximum number of results to yield.
+        exclude_websites: If True, only yield businesses without websites.
+        cache_only: If True, serve place details from the cache without calling the API.
+        strategy: The search strategy ("details" or "inline"). Defaults to the configured strategy.
+        tiled: If True, allow splitting the search area into tiles to get past the per-query result cap.
+               Defaults to the configured setting.
+        skip_known: If True, skip places already stored as leads recently. Defaults to the configured setting.
+        stats: Optional statistics object updated with the API usage of the search.
+        refresh: If True, run the search again instead of replaying cached results.
+
+    Yields:
+        Businesses in the order they qualify.
+
+    Raises:
+        APIKeyError: If the client cannot be initialized or the key is rejected.
+        LocationNotFoundError: If the city cannot be found.
+        GoogleMapsClientError: For other API errors.
+    """
+    params = _search_params(
+        city, business_type, radius, min_rating, max_results, exclude_websites, cache_only, strategy, tiled, skip_known
+    )
+    cached = None if refresh else _search_cache.read(params)
+    if cached is not None:
+        logger.info(f"Replaying {cached.total_results} cached results for '{city}'.")
+        yield from cached.results
+        return
+
+    stats = stats if stats is not None else SearchStats()
+    businesses = []
+    maps_client = get_maps_client()
+    for business in maps_client.stream_businesses(
+            city=city,
+            business_type=business_type,
+            radius=radius,
+            min_rating=min_rating,
+            max_results=max_results,
+            exclude_websites=exclude_websites,
+            stats=stats,
+            cache_only=cache_only,
+            strategy=params["strategy"],
+            tiled=params["tiled"],
+            skip_known=params["skip_known"]
+    ):
+        businesses.append(business)
+        yield business
+
+    _search_cache.store(params, GoogleMapsSearchOutput(
+        status="success",
+        message=None,
+        total_results=len(businesses),
+        results=businesses,
+        search_metadata=SearchMetadata(
+            city=city,
+            business_type=business_type,
+            radius=radius,
+            min_rating=min_rating,
+            max_results=max_results,
+            exclude_websites=exclude_websites,
+            api_available=True,
+            stats=stats
+        )
+    ))
+
+
+def stream_google_maps_batch_search(
+        cities: list[str],
+        business_types: list[str],
+        radius: int = 50000,
+        min_rating: float = 0.0,
+        max_results: int = 10,
+        max_total_results: Optional[int] = None,
+        exclude_websites: bool = True,
+        cache_only: bool = False,
+        strategy: Optional[str] = None,
+        tiled: Optional[bool] = None,
+        skip_known: Optional[bool] = None,
+        stats: Optional[SearchStats] = None
+) -> Iterator[tuple[tuple[str, str], PlaceResult]]:
+    """
+    Streaming batch search over every combination of cities and business types.
+
+    Args:
+        cities: The cities to search in.
+        business_types: The business types to search for in every city.
+        radius: Radius in meters for each search.
+        min_rating: Minimum rating filter.
+        max_results: Number of results each search is sized for.
+        max_total_results: Maximum number of results across the batch.
+        exclude_websites: If True, only yield businesses without websites.
+        cache_only: If True, serve place details from the cache without calling the API.
+        strategy: The search strategy ("details" or "inline"). Defaults to the configured strategy.
+        tiled: If True, allow splitting each search area into tiles. Defaults to the configured setting.
+        skip_known: If True, skip places already stored as leads recently. Defaults to the configured setting.
+        stats: Optional statistics object updated with the API usage of the batch.
+
+    Yields:
+        Tuples of the (city, business_type) search that found a business and the business.
+
+    Raises:
+        APIKeyError: If the client cannot be initialized or the key is rejected.
+        LocationNotFoundError: If none of the cities can be found.
+    """
+    maps_client = get_maps_client()
+    yield from maps_client.stream_batch_businesses(
+        cities=cities,
+        business_types=business_types,
+        radius=radius,
+        min_rating=min_rating,
+        max_results=max_results,
+        max_total_results=max_total_results,
+        exclude_websites=exclude_websites,
+        stats=stats,
+        cache_only=cache_only,
+        strategy=strategy or Config.GOOGLE_MAPS_SEARCH_STRATEGY,
+        tiled=Config.GOOGLE_MAPS_TILED_SEARCH if tiled is None else tiled,
+        skip_known=Config.GOOGLE_MAPS_SKIP_KNOWN_LEADS if skip_known is None else skip_known,
+        max_concurrent_searches=Config.GOOGLE_MAPS_BATCH_CONCURRENCY
+    )
+
+
+def plan_google_maps_search(
+        city: str,
+        business_type: Optional[str] = None,
+        radius: int = 50000,
+        max_results: int = 100,
+        exclude_websites: bool = True,
+        strategy: Optional[str] = None,
+        tiled: Optional[bool] = None
+) -> SearchPlan:
+    """
+    Dry run of a Google Maps search: plans it and estimates its cost without any request.
+
+    Args:
+        city: The name of the city to search in.
+        business_type: Optional business type filter (e.g., "cafe").
+        radius: Radius in meters for the search.
+        max_results: Maximum number of results to return.
+        exclude_websites: If True, only return businesses without websites.
+        strategy: The search strategy ("details" or "inline"). Defaults to the configured strategy.
+        tiled: If True, allow splitting the search area into tiles to get past the per-query result cap.
+               Defaults to the configured setting.
+
+    Returns:
+        The plan of the search, with the estimated requests, cost and wall time of every feasible mode.
+
+    Raises:
+        APIKeyError: If the client cannot be initialized.
+        ValueError: If the strategy is unknown.
+    """
+    maps_client = get_maps_client()
+    plan = maps_client.plan_search(
+        business_type=business_type,
+        radius=radius,
+        max_results=max_results,
+        exclude_websites=exclude_websites,
+        strategy=strategy or Config.GOOGLE_MAPS_SEARCH_STRATEGY,
+        tiled=Config.GOOGLE_MAPS_TILED_SEARCH if tiled is None else tiled
+    )
+    plan.city = city
+    return plan
+
+
 @tool(args_schema=GoogleMapsSearchInput)
 def google_maps_search(
         city: str,
@@ -479,7 +2403,12 @@ def google_maps_search(
         radius: int = 50000,
         min_rating: float = 0.0,
         max_results: int = 10,
-        exclude_websites: bool = False
+        exclude_websites: bool = False,
+        cache_only: bool = False,
+        strategy: Optional[str] = None,
+        tiled: Optional[bool] = None,
+        skip_known: Optional[bool] = None,
+        refresh: bool = False
 ) -> GoogleMapsSearchOutput:
     """
     High-level function to search for businesses using Google Maps.
@@ -494,6 +2423,12 @@ def google_maps_search(
         min_rating: Minimum rating filter.
         max_results: Maximum number of results to return.
         exclude_websites: If True, only return businesses without websites.
+        cache_only: If True, serve place details from the cache without calling the API.
+        strategy: The search strategy ("details" or "inline"). Defaults to the configured strategy.
+        tiled: If True, allow splitting the search area into tiles to get past the per-query result cap.
+               Defaults to the configured setting.
+        skip_known: If True, skip places already stored as leads recently. Defaults to the configured setting.
+        refresh: If True, run the search again instead of serving cached results.
 
     Returns:
         A dictionary with search status, results, and metadata.
@@ -502,9 +2437,15 @@ def google_maps_search(
     return _google_maps_search(
         city=city,
         business_type=business_type,
+        radius=radius,
         min_rating=min_rating,
         max_results=max_results,
-        exclude_websites=exclude_websites
+        exclude_websites=exclude_websites,
+        cache_only=cache_only,
+        strategy=strategy,
+        tiled=tiled,
+        skip_known=skip_known,
+        refresh=refresh
     )
 
 
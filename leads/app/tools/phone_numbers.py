@@ -0,0 +1,207 @@
+import re
+from typing import Iterator, NamedTuple
+
+
+class PhoneRegion(NamedTuple):
+    """Numbering plan of a region, as needed to normalize its phone numbers to E.164."""
+    country_code: str
+    # Prefix of national numbers dialed within the country, e.g. the 0 of "020 7946 0958"
+    trunk_prefix: str
+    # Lengths of national significant numbers, i.e. without the trunk prefix
+    lengths: tuple[int, ...]
+    # Prefix dialed before the country code of an international number, besides "+"
+    international_prefix: str
+
+
+REGIONS = {
+    'US': PhoneRegion('1', '1', (10,), '011'),
+    'CA': PhoneRegion('1', '1', (10,), '011'),
+    'GB': PhoneRegion('44', '0', (9, 10), '00'),
+    'IE': PhoneRegion('353', '0', (7, 8, 9), '00'),
+    'AU': PhoneRegion('61', '0', (9,), '0011'),
+    'NZ': PhoneRegion('64', '0', (8, 9, 10), '00'),
+    'DE': PhoneRegion('49', '0', tuple(range(6, 12)), '00'),
+    'AT': PhoneRegion('43', '0', tuple(range(7, 14)), '00'),
+    'CH': PhoneRegion('41', '0', (9,), '00'),
+    'FR': PhoneRegion('33', '0', (9,), '00'),
+    'BE': PhoneRegion('32', '0', (8, 9), '00'),
+    'NL': PhoneRegion('31', '0', (9,), '00'),
+    # Italian numbers keep their leading 0 after the country code
+    'IT': PhoneRegion('39', '', tuple(range(6, 12)), '00'),
+    'ES': PhoneRegion('34', '', (9,), '00'),
+    'PT': PhoneRegion('351', '', (9,), '00'),
+    'MX': PhoneRegion('52', '', (10,), '00'),
+    'BR': PhoneRegion('55', '0', (10, 11), '00'),
+    'IN': PhoneRegion('91', '0', (10,), '00'),
+}
+
+# Runs of digits, each preceded by at most 3 separators or by a lone dot, so the end of a sentence is not a separator.
+# Newlines are not separators either: numbers never span lines. Possessive, so a failed match never backtracks.
+_CANDIDATE_REGEX = re.compile(r'(?<![\w+])\+?\(?\d(?:(?:[ \t \-()]{1,3}+|\.)?+\d)*+')
+_NON_DIGIT_REGEX = re.compile(r'\D')
+# Dates (2023-10-15, 15.10.2023) and prices (1249.99) share the shape of phone numbers
+_DATE_REGEX = re.compile(r'\d{4}([-.])\d{1,2}\1\d{1,2}|\d{1,2}([-.])\d{1,2}\2\d{2,4}')
+_PRICE_REGEX = re.compile(r'\(?\d+\.\d{2}\)?')
+# E.164 numbers have at most 15 digits, country code included; national numbers at least 6
+_MIN_DIGITS, _MAX_DIGITS = 6, 15
+# Longest international dialing prefix, e.g. 0011 from Australia
+_MAX_PREFIX_DIGITS = 4
+# Most groups of a written number, e.g. "+33 6 12 34 56 78"
+_MAX_GROUPS = 6
+
+
+def phone_region(region: str) -> PhoneRegion:
+    """
+    Looks up the numbering plan of a region.
+
+    Args:
+        region: An ISO 3166-1 alpha-2 region code, e.g. "US", case insensitive.
+
+    Returns:
+        The numbering plan of the region.
+
+    Raises:
+        ValueError: If the region is not supported.
+    """
+    try:
+        return REGIONS[region.upper()]
+    except KeyError:
+        raise ValueError(f"Unsupported phone region {region!r}, expected one of {', '.join(REGIONS)}") from None
+
+
+def _valid_national(region: PhoneRegion, national: str) -> bool:
+    if len(national) not in region.lengths:
+        return False
+    if region.country_code == '1':
+        # North American area codes and exchanges never start with 0 or 1
+        return national[0] not in '01' and national[3] not in '01'
+    return True
+
+
+def _normalize_international(digits: str) -> str | None:
+    if not _MIN_DIGITS < len(digits) <= _MAX_DIGITS:
+        return None
+    for region in REGIONS.values():
+        if not digits.startswith(region.country_code):
+            continue
+        national = digits[len(region.country_code):]
+        # Written with the trunk prefix, e.g. "+44 020 7946 0958"
+        if region.trunk_prefix and national.startswith(region.trunk_prefix) and not _valid_national(region, national):
+            national = national[len(region.trunk_prefix):]
+        return f"+{region.country_code}{national}" if _valid_national(region, national) else None
+    # A country without a numbering plan here: trusted as written
+    return f"+{digits}"
+
+
+def normalize_phone_number(raw: str, default_region: str = 'US') -> str | None:
+    """
+    Normalizes a phone number to E.164, e.g. "(512) 555-0134" to "+15125550134".
+
+    Args:
+        raw: The phone number as written, with or without its country code.
+        default_region: The region of numbers written without a country code.
+
+    Returns:
+        The E.164 form of the number, or None if it is not a valid number.
+
+    Raises:
+        ValueError: If the region is not supported.
+    """
+    region = phone_region(default_region)
+    # "+44 (0)20 7946 0958": the trunk prefix in parentheses is not dialed from abroad
+    text = raw.strip().replace('(0)', '')
+    digits = _NON_DIGIT_REGEX.sub('', text)
+    if not digits:
+        return None
+
+    if text.startswith('+'):
+        return _normalize_international(digits)
+    for prefix in {'00', region.international_prefix}:
+        if digits.startswith(prefix) and len(digits) - len(prefix) > _MIN_DIGITS:
+            return _normalize_international(digits[len(prefix):])
+
+    national = digits
+    if region.trunk_prefix and national.startswith(region.trunk_prefix) and not _valid_national(region, national):
+        national = national[len(region.trunk_prefix):]
+    return f"+{region.country_code}{national}" if _valid_national(region, national) else None
+
+
+def _digit_count(text: str) -> int:
+    return sum(char.isdigit() for char in text)
+
+
+def iter_phone_numbers(text: str, default_region: str = 'US') -> Iterator[str]:
+    """
+    Scans a text for phone numbers, in time linear in its length.
+
+    Candidates are runs of digits and separators, matched without any
+    backtracking. As a run may join a number with its neighbours, e.g.
+    "Pizza 12.50 (512) 555-0134", the longest valid number is looked for
+    among the consecutive space separated groups of each run, within a
+    window bounded by the maximum length of a number. Groups that are
+    prices never take part in a number, and dates are not numbers.
+
+    Args:
+        text: The text to scan, e.g. the text content of a page.
+        default_region: The region of numbers written without a country code.
+
+    Yields:
+        The E.164 form of every phone number found, in order, with duplicates.
+
+    Raises:
+        ValueError: If the region is not supported.
+    """
+    region = phone_region(default_region)
+    # Digit counts of national numbers, with or without the trunk prefix. Numbers starting with
+    # + or 0, i.e. international or dialed with a prefix, are always checked.
+    national_digit_counts = {*region.lengths, *(length + len(region.trunk_prefix) for length in region.lengths)}
+    for match in _CANDIDATE_REGEX.finditer(text):
+        # Part of a longer word, e.g. a reference number like "12345678AB"
+        if match.end() < len(text) and text[match.end()].isalnum():
+            continue
+        candidate = match.group()
+        if _digit_count(candidate) < _MIN_DIGITS:
+            continue
+
+        groups = candidate.split()
+        # Computed once per group, as every group takes part in up to _MAX_GROUPS windows
+        group_digits = [_digit_count(group) for group in groups]
+        prices = [bool(_PRICE_REGEX.fullmatch(group)) for group in groups]
+        start = 0
+        while start < len(groups):
+            found, end, digit_count = None, start, 0
+            prefixed = groups[start].lstrip('(').startswith(('+', '0'))
+            while end < min(len(groups), start + _MAX_GROUPS) and not prices[end]:
+                digit_count += group_digits[end]
+                if digit_count > _MAX_DIGITS + _MAX_PREFIX_DIGITS:
+                    break
+                end += 1
+                if prefixed or digit_count in national_digit_counts:
+                    number = ' '.join(groups[start:end])
+                    normalized = None if _DATE_REGEX.fullmatch(number) else normalize_phone_number(
+                        number, default_region
+                    )
+                    if normalized:
+                        found = (end, normalized)
+            if found:
+                yield found[1]
+                start = found[0]
+            else:
+                start += 1
+
+
+def find_phone_numbers(text: str, default_region: str = 'US') -> set[str]:
+    """
+    Finds the phone numbers of a text, deduplicated on their E.164 form.
+
+    Args:
+        text: The text to scan, e.g. the text content of a page.
+        default_region: The region of numbers written without a country code.
+
+    Returns:
+        The E.164 form of every phone number found.
+
+    Raises:
+        ValueError: If the region is not supported.
+    """
+    return set(iter_phone_numbers(text, default_region))
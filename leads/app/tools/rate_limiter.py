@@ -0,0 +1,146 @@
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import crud
+
+
+def parse_rate_limits(spec: str) -> dict[str, float]:
+    """
+    Parses per-endpoint rate limits of the form "geocode=50,place=20,*=10".
+
+    Args:
+        spec: Comma separated `endpoint=requests_per_second` pairs. The `*`
+              endpoint applies to every endpoint without its own limit.
+
+    Returns:
+        A mapping of endpoint to requests per second.
+
+    Raises:
+        ValueError: If a pair is malformed or a rate is not positive.
+    """
+    limits = {}
+    for pair in filter(None, (part.strip() for part in (spec or "").split(","))):
+        endpoint, separator, rate = pair.partition("=")
+        if not separator or float(rate) <= 0:
+            raise ValueError(f"Invalid rate limit: {pair!r}")
+        limits[endpoint.strip()] = float(rate)
+    return limits
+
+
+class TokenBucketRateLimiter:
+    """
+    A token bucket rate limiter with one bucket per API endpoint.
+
+    With a session factory, the buckets live in the `api_rate_limit` table
+    and are shared by every worker process, so the workers together stay
+    under the quota instead of each assuming it has it to itself. Tokens are
+    leased from the table several at a time and spent from process memory,
+    so only one request in a lease pays for the database round trip.
+    Without a session factory, or while the database cannot be reached,
+    buckets are kept in process memory.
+    """
+
+    def __init__(
+            self,
+            limits: dict[str, float],
+            session_factory: Optional[Callable[[], Session]] = None,
+            burst_seconds: float = 1.0,
+            lease_size: int = 5
+    ) -> None:
+        """
+        Initializes the rate limiter.
+
+        Args:
+            limits: Requests per second allowed per endpoint. The `*` entry
+                    applies to endpoints without their own limit; endpoints
+                    matching neither are not limited.
+            session_factory: Optional factory for database sessions holding the
+                             shared buckets. Buckets are local when omitted.
+            burst_seconds: How many seconds worth of requests a full bucket holds.
+                           Leased tokens not spent within this time expire.
+            lease_size: The maximum number of tokens taken from a shared bucket at once.
+        """
+        self.limits = dict(limits)
+        self.session_factory = session_factory
+        self.burst_seconds = burst_seconds
+        self.lease_size = max(1, lease_size)
+
+        self._lock = threading.Lock()
+        self._local_buckets: dict[str, tuple[float, float]] = {}
+        self._leases: dict[str, tuple[int, float]] = {}
+
+    def _take_leased(self, endpoint: str) -> bool:
+        with self._lock:
+            tokens, expires_at = self._leases.get(endpoint, (0, 0.0))
+            if tokens <= 0 or time.monotonic() >= expires_at:
+                return False
+            self._leases[endpoint] = (tokens - 1, expires_at)
+            return True
+
+    def _lease(self, endpoint: str, rate: float, burst: float) -> float:
+        with self.session_factory() as db:
+            taken, wait = crud.take_rate_limit_tokens(
+                db, endpoint, rate, burst, min(self.lease_size, int(burst))
+            )
+        if taken > 1:
+            # One token pays for this request, the rest for the next ones of this process.
+            with self._lock:
+                tokens, _ = self._leases.get(endpoint, (0, 0.0))
+                self._leases[endpoint] = (tokens + taken - 1, time.monotonic() + self.burst_seconds)
+        return wait
+
+    def _take_local(self, endpoint: str, rate: float, burst: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated_at = self._local_buckets.get(endpoint, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+
+            self._local_buckets[endpoint] = (tokens, now)
+            return wait
+
+    def _take(self, endpoint: str, rate: float, burst: float) -> float:
+        if self.session_factory is not None:
+            if self._take_leased(endpoint):
+                return 0.0
+            try:
+                return self._lease(endpoint, rate, burst)
+            except SQLAlchemyError as e:
+                logger.warning(f"Shared rate limiter unavailable, limiting {endpoint} per process: {e}")
+        return self._take_local(endpoint, rate, burst)
+
+    def acquire(self, endpoint: str) -> float:
+        """
+        Blocks until a request to the endpoint is allowed.
+
+        Args:
+            endpoint: The name of the endpoint about to be called.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        rate = self.limits.get(endpoint, self.limits.get("*"))
+        if rate is None:
+            return 0.0
+
+        burst = max(1.0, rate * self.burst_seconds)
+        waited = 0.0
+        while True:
+            wait = self._take(endpoint, rate, burst)
+            if wait <= 0:
+                return waited
+            # A little jitter keeps waiting workers from all retrying at the same instant.
+            wait *= random.uniform(1.0, 1.2)
+            time.sleep(wait)
+            waited += wait
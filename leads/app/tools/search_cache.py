@@ -0,0 +1,228 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from loguru import logger
+from sqlalchemy import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.schemas import GoogleMapsSearchOutput
+
+
+def search_cache_key(params: dict[str, Any]) -> str:
+    """
+    Hashes normalized search parameters into a cache key.
+
+    Args:
+        params: The normalized search parameters. Values must be JSON serializable.
+
+    Returns:
+        The hex SHA-256 digest of the parameters.
+    """
+    return hashlib.sha256(json.dumps(params, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+class SearchCache:
+    """
+    A result-level cache of Google Maps searches, with single-flight coalescing.
+
+    Successful search outputs are stored in the `search_result_cache` table
+    under a hash of their normalized parameters and served until they are
+    older than the TTL, or the caller asks for a refresh.
+
+    Concurrent identical searches share one execution: within a process,
+    later callers wait for the running search instead of starting their
+    own, and across processes the search holds a Postgres advisory lock,
+    so other workers wait for it and then read its result from the cache.
+    They wait at most `lock_timeout` seconds, then run the search anyway,
+    so a hung worker cannot block the others.
+    """
+    _LOCK_POLL_INTERVAL = 0.5
+
+    def __init__(
+            self,
+            session_factory: Optional[Callable[[], Session]],
+            ttl: int,
+            lock_timeout: float = 60.0
+    ) -> None:
+        """
+        Initializes the search cache.
+
+        Args:
+            session_factory: Optional factory for database sessions holding the
+                             cache and the locks. Only in-process coalescing is
+                             done when omitted.
+            ttl: How long, in seconds, a cached search stays valid. Caching is
+                 disabled when 0.
+            lock_timeout: How long, in seconds, to wait for the lock of a search
+                          another worker is running.
+        """
+        self.session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl)
+        self.lock_timeout = lock_timeout
+
+        self._lock = threading.Lock()
+        self._flights: dict[str, Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.session_factory is not None and self.ttl > timedelta(0)
+
+    def read(self, params: dict[str, Any], max_age: Optional[timedelta] = None) -> Optional[GoogleMapsSearchOutput]:
+        """
+        Returns the cached output of a search, if a fresh one exists.
+
+        Cache failures are logged and treated as misses.
+
+        Args:
+            params: The normalized search parameters.
+            max_age: The maximum age of the entry. Defaults to the TTL.
+
+        Returns:
+            The cached output, with `search_metadata.cached_at` set, or None on a miss.
+        """
+        if not self.enabled:
+            return None
+
+        key = search_cache_key(params)
+        try:
+            with self.session_factory() as db:
+                entry = crud.read_search_result_cache(db, key, self.ttl if max_age is None else max_age)
+                if entry is None:
+                    return None
+                output = GoogleMapsSearchOutput.model_validate(entry.output)
+                output.search_metadata.cached_at = entry.fetched_at
+                return output
+        except SQLAlchemyError as e:
+            logger.warning(f"Search result cache lookup failed for {key}: {e}")
+            return None
+
+    def store(self, params: dict[str, Any], output: GoogleMapsSearchOutput) -> None:
+        """
+        Stores the output of a successful search.
+
+        Args:
+            params: The normalized search parameters.
+            output: The search output. Failed searches are not stored.
+        """
+        if not self.enabled or output.status != "success":
+            return
+
+        key = search_cache_key(params)
+        try:
+            with self.session_factory() as db:
+                crud.upsert_search_result_cache(db, key, params, output.model_dump(mode="json"))
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not cache search results for {key}: {e}")
+
+    def _lock_search(self, key: str) -> Optional[Connection]:
+        """
+        Takes the advisory lock of a search, returning the dedicated connection holding it.
+
+        The lock is polled for, and the connection goes back to the pool
+        between attempts, so waiting workers do not hold connections.
+
+        Returns:
+            The connection holding the lock, or None if the lock could not be
+            taken within `lock_timeout` seconds and the search runs without it.
+        """
+        if not self.enabled:
+            return None
+
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            connection = None
+            try:
+                with self.session_factory() as db:
+                    connection = db.get_bind().connect()
+                if crud.try_lock_search(connection, key):
+                    return connection
+                connection.close()
+            except SQLAlchemyError as e:
+                logger.warning(f"Could not lock search {key}, running it without coordination: {e}")
+                if connection is not None:
+                    connection.close()
+                return None
+
+            if time.monotonic() >= deadline:
+                logger.warning(f"Search {key} still locked after {self.lock_timeout}s, running it without the lock.")
+                return None
+            logger.debug(f"Waiting for the search lock of: {key}")
+            time.sleep(self._LOCK_POLL_INTERVAL)
+
+    @staticmethod
+    def _unlock_search(connection: Optional[Connection], key: str) -> None:
+        if connection is None:
+            return
+        try:
+            crud.unlock_search(connection, key)
+        except SQLAlchemyError as e:
+            # A pooled connection would keep the lock: the connection is discarded, which releases it.
+            logger.warning(f"Could not unlock search {key}, discarding its connection: {e}")
+            connection.invalidate()
+        finally:
+            connection.close()
+
+    def _join_flight(self, key: str) -> tuple[Future, bool]:
+        """Returns the future of the running search with the key, and whether the caller must run it."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = Future()
+            return flight, True
+
+    def _land_flight(self, key: str) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def get_or_run(
+            self,
+            params: dict[str, Any],
+            run: Callable[[], GoogleMapsSearchOutput],
+            refresh: bool = False
+    ) -> GoogleMapsSearchOutput:
+        """
+        Returns the cached output of a search, or runs it once for all concurrent callers.
+
+        Args:
+            params: The normalized search parameters.
+            run: Runs the search. Called at most once per concurrent group of callers.
+            refresh: If True, ignore cached outputs older than this call.
+
+        Returns:
+            The search output.
+        """
+        if not refresh:
+            cached = self.read(params)
+            if cached is not None:
+                return cached
+
+        key = search_cache_key(params)
+        flight, leader = self._join_flight(key)
+        if not leader:
+            logger.info(f"Joining the identical search already running for {key}.")
+            return flight.result()
+
+        started_at = datetime.now(timezone.utc)
+        lock = self._lock_search(key)
+        try:
+            # Another worker may have completed the search while we waited for the lock.
+            cached = self.read(params, datetime.now(timezone.utc) - started_at if refresh else None)
+            output = cached if cached is not None else run()
+            if cached is None:
+                self.store(params, output)
+            flight.set_result(output)
+            return output
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            self._unlock_search(lock, key)
+            self._land_flight(key)
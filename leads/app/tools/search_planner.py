@@ -0,0 +1,303 @@
+import math
+from typing import Callable, Optional
+
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.schemas import SearchPlan, SearchPlanEstimate
+
+
+class SearchPlanner:
+    """
+    Estimates the API cost of a search and picks the cheapest way to run it.
+
+    A search must fetch more candidates than the results it returns, since
+    many fail the filters. How many more is learned per category: every
+    search records how many candidates it examined and how many qualified in
+    the `search_pass_rate` table, and the over-fetch factor of the next
+    search of that category is derived from the decayed pass rate, smoothed
+    towards a prior while little history exists.
+
+    Planning makes no API or geocoding request, so it also serves dry runs.
+    """
+    MODE_TEXT = "text"
+    MODE_NEARBY = "nearby"
+    MODE_BOTH = "both"
+    MODE_TILED = "tiled"
+
+    # List prices in USD per request, e.g. $32 per 1000 legacy Text Searches.
+    # Details requests include the Contact and Atmosphere fields.
+    DEFAULT_CALL_COSTS = {
+        "geocode": 0.005,
+        "places": 0.032,
+        "places_nearby": 0.032,
+        "place": 0.025,
+        "places:searchText": 0.040,
+        "places:searchNearby": 0.040,
+    }
+    # Median and 95th percentile latency in seconds of each endpoint, roughly as
+    # observed against the real APIs.
+    DEFAULT_CALL_LATENCIES = {
+        "geocode": (0.08, 0.25),
+        "places": (0.35, 0.9),
+        "places_nearby": (0.3, 0.8),
+        "place": (0.12, 0.35),
+        "places:searchText": (0.4, 1.0),
+        "places:searchNearby": (0.3, 0.8),
+    }
+    _PAGE_SIZE = 20
+    # Share of the Nearby Search results not also returned by the Text Search
+    _NEARBY_NOVELTY = 0.5
+
+    def __init__(
+            self,
+            session_factory: Optional[Callable[[], Session]] = None,
+            prior_pass_rate: float = 0.25,
+            prior_weight: float = 20.0,
+            safety_margin: float = 1.25,
+            max_over_fetch: float = 10.0,
+            decay: float = 0.9,
+            call_costs: Optional[dict[str, float]] = None,
+            call_latencies: Optional[dict[str, float]] = None
+    ) -> None:
+        """
+        Initializes the search planner.
+
+        Args:
+            session_factory: Optional factory for database sessions holding the
+                             pass rate history. The prior is always used when omitted.
+            prior_pass_rate: The pass rate assumed for categories without history.
+            prior_weight: How many examined candidates the prior is worth.
+            safety_margin: Extra candidates fetched on top of the expected need.
+            max_over_fetch: The largest over-fetch factor, however low the pass rate.
+            decay: The weight kept by the recorded history each time a search is added.
+            call_costs: USD per request by endpoint, overriding the list prices.
+            call_latencies: Typical seconds per request by endpoint. Defaults
+                            to the middle of the observed latency ranges.
+        """
+        self.session_factory = session_factory
+        self.prior_pass_rate = min(1.0, max(0.01, prior_pass_rate))
+        self.prior_weight = max(0.0, prior_weight)
+        self.safety_margin = max(1.0, safety_margin)
+        self.max_over_fetch = max(1.0, max_over_fetch)
+        self.decay = min(1.0, max(0.0, decay))
+        self.call_costs = {**self.DEFAULT_CALL_COSTS, **(call_costs or {})}
+        self.call_latencies = {
+            **{endpoint: (low + high) / 2 for endpoint, (low, high) in self.DEFAULT_CALL_LATENCIES.items()},
+            **(call_latencies or {})
+        }
+
+    @staticmethod
+    def category(business_type: Optional[str]) -> str:
+        """Returns the category a business type's pass rate is recorded under."""
+        return (business_type or "").strip().lower()
+
+    def pass_rate(self, business_type: Optional[str], exclude_websites: bool) -> tuple[float, float]:
+        """
+        Returns the expected filter pass rate of a category.
+
+        Lookup failures are logged and the prior is used.
+
+        Args:
+            business_type: The business type searched for.
+            exclude_websites: Whether businesses with a website are filtered out.
+
+        Returns:
+            The smoothed pass rate and the decayed number of candidates behind it.
+        """
+        examined, qualified = 0.0, 0.0
+        if self.session_factory is not None:
+            try:
+                with self.session_factory() as db:
+                    entry = crud.read_search_pass_rate(db, self.category(business_type), exclude_websites)
+                    if entry is not None:
+                        examined, qualified = entry.examined, entry.qualified
+            except SQLAlchemyError as e:
+                logger.warning(f"Search pass rate lookup failed for {business_type!r}, using the prior: {e}")
+
+        rate = (qualified + self.prior_pass_rate * self.prior_weight) / (examined + self.prior_weight or 1.0)
+        return min(1.0, max(1.0 / self.max_over_fetch, rate)), examined
+
+    def record(self, business_type: Optional[str], exclude_websites: bool, examined: int, qualified: int) -> None:
+        """
+        Adds the outcome of a search to the pass rate history of its category.
+
+        Args:
+            business_type: The business type searched for.
+            exclude_websites: Whether businesses with a website were filtered out.
+            examined: The candidates whose qualification the search decided.
+            qualified: The examined candidates that passed every filter.
+        """
+        if self.session_factory is None or examined <= 0:
+            return
+        try:
+            with self.session_factory() as db:
+                crud.record_search_pass_rate(
+                    db, self.category(business_type), exclude_websites, examined, qualified, self.decay
+                )
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not record the search pass rate for {business_type!r}: {e}")
+
+    def _search_seconds(self, endpoint: str, pages: int, page_token_delay: float) -> float:
+        """Estimates the time to fetch `pages` consecutive pages of a search."""
+        # Legacy next page tokens only become valid after a delay; Places API (New) ones are valid at once.
+        delay = page_token_delay if endpoint in ("places", "places_nearby") else 0.0
+        return pages * self.call_latencies.get(endpoint, 0.0) + max(0, pages - 1) * delay
+
+    def _estimate(
+            self,
+            mode: str,
+            candidates_needed: int,
+            lookups_needed: int,
+            inline: bool,
+            with_nearby: bool,
+            tiles: int,
+            result_cap: int,
+            nearby_result_cap: int,
+            max_concurrent_details: int,
+            max_concurrent_tiles: int,
+            page_token_delay: float
+    ) -> SearchPlanEstimate:
+        """Estimates the requests, cost and wall time of one mode."""
+        text_endpoint, nearby_endpoint = ("places:searchText", "places:searchNearby") if inline else (
+            "places", "places_nearby"
+        )
+        run_text = mode in (self.MODE_TEXT, self.MODE_BOTH, self.MODE_TILED)
+        run_nearby = mode in (self.MODE_NEARBY, self.MODE_BOTH) or (mode == self.MODE_TILED and with_nearby)
+
+        if mode == self.MODE_TILED:
+            # Every tile fetches up to the result cap; the search stops once enough candidates qualified.
+            text_fetch_limit = result_cap
+            nearby_fetch_limit = nearby_result_cap if run_nearby else 0
+            per_tile = text_fetch_limit + self._NEARBY_NOVELTY * nearby_fetch_limit
+            tiles_searched = min(tiles, max(max_concurrent_tiles, math.ceil(candidates_needed / per_tile)))
+            capacity = int(tiles * per_tile)
+        else:
+            text_fetch_limit = min(candidates_needed, result_cap) if run_text else 0
+            nearby_fetch_limit = 0
+            if run_nearby:
+                # With a Text Search, the Nearby Search only has to make up for the Text Search's shortfall.
+                shortfall = candidates_needed - text_fetch_limit
+                novelty = self._NEARBY_NOVELTY if run_text else 1.0
+                nearby_fetch_limit = min(nearby_result_cap, max(self._PAGE_SIZE, math.ceil(shortfall / novelty)))
+            tiles_searched = 1
+            capacity = int(text_fetch_limit + (self._NEARBY_NOVELTY if run_text else 1.0) * nearby_fetch_limit)
+
+        text_pages = math.ceil(text_fetch_limit / self._PAGE_SIZE)
+        # An inline Nearby Search returns a single page.
+        nearby_pages = min(1, nearby_fetch_limit) if inline else math.ceil(nearby_fetch_limit / self._PAGE_SIZE)
+        search_calls = tiles_searched * (text_pages + nearby_pages)
+        details_calls = 0 if inline else min(capacity, lookups_needed)
+
+        tile_seconds = max(
+            self._search_seconds(text_endpoint, text_pages, page_token_delay),
+            self._search_seconds(nearby_endpoint, nearby_pages, page_token_delay)
+        )
+        search_seconds = math.ceil(tiles_searched / max_concurrent_tiles) * tile_seconds
+        first_page_seconds = min((
+            self.call_latencies.get(endpoint, 0.0)
+            for endpoint, pages in ((text_endpoint, text_pages), (nearby_endpoint, nearby_pages)) if pages
+        ), default=0.0)
+        details_seconds = math.ceil(details_calls / max_concurrent_details) * self.call_latencies.get("place", 0.0)
+
+        calls = {"geocode": 1, text_endpoint: tiles_searched * text_pages, "place": details_calls}
+        calls[nearby_endpoint] = tiles_searched * nearby_pages
+        return SearchPlanEstimate(
+            mode=mode,
+            text_fetch_limit=text_fetch_limit,
+            nearby_fetch_limit=nearby_fetch_limit,
+            tiles=tiles if mode == self.MODE_TILED else 1,
+            search_calls=search_calls,
+            details_calls=details_calls,
+            geocode_calls=1,
+            total_calls=sum(calls.values()),
+            estimated_cost_usd=round(sum(n * self.call_costs.get(endpoint, 0.0) for endpoint, n in calls.items()), 4),
+            estimated_seconds=round(
+                self.call_latencies.get("geocode", 0.0) + max(search_seconds, first_page_seconds + details_seconds), 2
+            ),
+            candidate_capacity=capacity,
+            sufficient=capacity >= candidates_needed,
+        )
+
+    def plan(
+            self,
+            business_type: Optional[str],
+            max_results: int,
+            exclude_websites: bool,
+            strategy: str,
+            with_nearby: bool,
+            tiles: int,
+            result_cap: int,
+            nearby_result_cap: int,
+            max_concurrent_details: int,
+            max_concurrent_tiles: int,
+            page_token_delay: float
+    ) -> SearchPlan:
+        """
+        Plans a search, choosing the cheapest mode able to fill `max_results`.
+
+        Every feasible mode is estimated: Text Search only, Nearby Search only
+        and both when `business_type` is a Nearby Search type, and tiled when
+        the circle splits into several tiles. The cheapest mode whose capacity
+        covers the candidates needed wins; when none does, the one with the
+        largest capacity. Tiled estimates assume no tile is subdivided.
+
+        Args:
+            business_type: The business type searched for.
+            max_results: The maximum number of businesses requested.
+            exclude_websites: Whether businesses with a website are filtered out.
+            strategy: "details" or "inline".
+            with_nearby: Whether a Nearby Search can be run for the business type.
+            tiles: The number of tiles of the search circle, 0 if tiling is not allowed.
+            result_cap: The most results a Text or legacy Nearby Search returns.
+            nearby_result_cap: The most results the strategy's Nearby Search returns.
+            max_concurrent_details: Place details requests allowed in flight at once.
+            max_concurrent_tiles: Tiles searched at the same time.
+            page_token_delay: Seconds before a legacy next page token becomes valid.
+
+        Returns:
+            The plan, with the estimate of the chosen mode and of every feasible one.
+        """
+        pass_rate, samples = self.pass_rate(business_type, exclude_websites)
+        over_fetch_factor = min(self.max_over_fetch, max(1.0, self.safety_margin / pass_rate))
+        candidates_needed = math.ceil(max_results * over_fetch_factor)
+        lookups_needed = math.ceil(max_results / pass_rate)
+
+        modes = [self.MODE_TEXT]
+        if with_nearby:
+            modes += [self.MODE_NEARBY, self.MODE_BOTH]
+        if tiles > 1:
+            modes.append(self.MODE_TILED)
+
+        options = [
+            self._estimate(
+                mode, candidates_needed, lookups_needed, strategy == "inline", with_nearby, tiles, result_cap,
+                nearby_result_cap, max(1, max_concurrent_details), max(1, max_concurrent_tiles), page_token_delay
+            )
+            for mode in modes
+        ]
+        sufficient = [option for option in options if option.sufficient]
+        if sufficient:
+            chosen = min(sufficient, key=lambda option: (option.estimated_cost_usd, option.estimated_seconds))
+        else:
+            chosen = max(options, key=lambda option: (option.candidate_capacity, -option.estimated_cost_usd))
+
+        logger.info(
+            f"Planned a '{chosen.mode}' search for {max_results} results of {business_type or 'any business'}: "
+            f"pass rate {pass_rate:.2f}, {candidates_needed} candidates, ~{chosen.total_calls} calls, "
+            f"~${chosen.estimated_cost_usd:.3f}, ~{chosen.estimated_seconds:.1f}s."
+        )
+        return SearchPlan(
+            business_type=business_type,
+            max_results=max_results,
+            strategy=strategy,
+            pass_rate=round(pass_rate, 4),
+            pass_rate_samples=round(samples, 1),
+            over_fetch_factor=round(over_fetch_factor, 2),
+            candidates_needed=candidates_needed,
+            mode=chosen.mode,
+            estimate=chosen,
+            options=options,
+        )
@@ -0,0 +1,73 @@
+import xml.etree.ElementTree as ET
+from urllib.robotparser import RobotFileParser
+
+
+class SitemapEntries:
+    """The URLs listed by a sitemap: pages for a urlset, other sitemaps for a sitemap index."""
+
+    def __init__(self) -> None:
+        self.pages: list[str] = []
+        self.sitemaps: list[str] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.pages or self.sitemaps)
+
+
+def parse_robots(text: str) -> RobotFileParser:
+    """
+    Parses a robots.txt file.
+
+    Args:
+        text: The content of the file. Empty for a website without one, which allows everything.
+
+    Returns:
+        The rules of the file, queried with `can_fetch`, `crawl_delay` and `site_maps`.
+        Only whole seconds are read as crawl delays.
+    """
+    robots = RobotFileParser()
+    robots.parse(text.splitlines())
+    return robots
+
+
+def _local_name(tag: str) -> str:
+    # Tags are namespaced, e.g. "{http://www.sitemaps.org/schemas/sitemap/0.9}loc"
+    return tag.rpartition('}')[2]
+
+
+def parse_sitemap(text: str) -> SitemapEntries:
+    """
+    Parses an XML sitemap or sitemap index, as specified by sitemaps.org.
+
+    The document is parsed incrementally, so the URLs of a sitemap cut at a
+    byte budget, or broken halfway, are kept up to the break.
+
+    Args:
+        text: The XML content of the sitemap.
+
+    Returns:
+        The page URLs of a urlset, or the sitemap URLs of a sitemap index,
+        in document order. Empty if the text is not a sitemap.
+    """
+    entries = SitemapEntries()
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+    try:
+        parser.feed(text)
+        parser.close()
+    except ET.ParseError:
+        pass
+
+    for event, element in parser.read_events():
+        name = _local_name(element.tag)
+        if event == 'start':
+            root = root or name
+            continue
+        if name == 'loc' and element.text and element.text.strip():
+            if root == 'urlset':
+                entries.pages.append(element.text.strip())
+            elif root == 'sitemapindex':
+                entries.sitemaps.append(element.text.strip())
+        elif name in ('url', 'sitemap'):
+            # Done with the entry, its elements are not needed anymore
+            element.clear()
+    return entries
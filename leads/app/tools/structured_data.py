@@ -0,0 +1,183 @@
+import json
+import re
+from typing import Any, Iterator
+
+from bs4 import BeautifulSoup, Tag
+
+EMAIL_REGEX = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# schema.org types describing the business itself rather than a page of its website
+ORGANIZATION_TYPES = ('Organization', 'LocalBusiness', 'Corporation', 'Store', 'Restaurant', 'ProfessionalService')
+# LocalBusiness has hundreds of subtypes (Dentist, Plumber, BeautySalon...), recognizable by their properties
+BUSINESS_PROPERTIES = ('address', 'geo', 'openingHours', 'openingHoursSpecification', 'priceRange')
+
+# Containers of hCard contact details, classic (vcard) and microformats2 (h-card)
+HCARD_CLASSES = ('vcard', 'h-card')
+HCARD_PROPERTIES = {
+    'tel': 'telephone', 'p-tel': 'telephone',
+    'email': 'email', 'u-email': 'email',
+    'url': 'sameAs', 'u-url': 'sameAs',
+}
+
+
+class StructuredContacts:
+    """
+    Contact details a page declares as structured data, i.e. schema.org
+    JSON-LD or microdata, or hCard microformats.
+
+    Unlike contacts matched in the page text, these are the details the
+    business publishes about itself, so they are trusted as they are.
+    """
+
+    def __init__(self) -> None:
+        self.emails: set[str] = set()
+        self.phone_numbers: set[str] = set()
+        # Every sameAs or hCard URL; social media profiles are picked by the scraper
+        self.links: set[str] = set()
+        # Whether the details belong to an organization or local business, not only to a page or a person
+        self.business = False
+
+    @property
+    def complete(self) -> bool:
+        """Whether a business declares both a phone number and an email, leaving nothing for the crawl to find."""
+        return self.business and bool(self.emails) and bool(self.phone_numbers)
+
+    def __bool__(self) -> bool:
+        return bool(self.emails or self.phone_numbers or self.links)
+
+    def add(self, prop: str, value: Any) -> None:
+        """
+        Adds the value of a schema.org contact property.
+
+        Args:
+            prop: `telephone`, `email` or `sameAs`; other properties are ignored.
+            value: A string or a list of strings, as found in the structured data.
+        """
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            if not isinstance(item, str) or not item.strip():
+                continue
+            item = item.strip()
+            if prop == 'telephone':
+                self.phone_numbers.add(item.removeprefix('tel:').strip())
+            elif prop == 'email':
+                email = item.removeprefix('mailto:').split('?')[0].strip()
+                if EMAIL_REGEX.fullmatch(email):
+                    self.emails.add(email)
+            elif prop == 'sameAs' and item.startswith(('http://', 'https://')):
+                self.links.add(item)
+
+
+def _types(node: dict) -> list[str]:
+    types = node.get('@type', [])
+    types = types if isinstance(types, list) else [types]
+    # Types may be full IRIs, e.g. "http://schema.org/LocalBusiness"
+    return [t.rsplit('/', 1)[-1] for t in types if isinstance(t, str)]
+
+
+def _is_business(types: list[str], properties: Any) -> bool:
+    return any(t in ORGANIZATION_TYPES for t in types) or any(p in properties for p in BUSINESS_PROPERTIES)
+
+
+def _json_ld_nodes(data: Any) -> Iterator[dict]:
+    """Yields every node of a JSON-LD document, including those nested in @graph, lists and properties."""
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            yield item
+            stack.extend(value for value in item.values() if isinstance(value, (dict, list)))
+
+
+def _extract_json_ld(script: Tag, contacts: StructuredContacts) -> None:
+    try:
+        data = json.loads(script.string or '')
+    except ValueError:
+        # Hand-written JSON-LD is often invalid, e.g. with trailing commas
+        return
+    for node in _json_ld_nodes(data):
+        if not any(prop in node for prop in ('telephone', 'email', 'sameAs')):
+            continue
+        for prop in ('telephone', 'email', 'sameAs'):
+            contacts.add(prop, node.get(prop))
+        contacts.business |= _is_business(_types(node), node)
+
+
+def _itemprop_value(tag: Tag) -> str | None:
+    if tag.has_attr('content'):
+        return tag['content']
+    if tag.name in ('a', 'link') and tag.has_attr('href'):
+        return tag['href']
+    return tag.get_text(' ', strip=True)
+
+
+def _extract_microdata(scope: Tag, contacts: StructuredContacts) -> None:
+    types = [itemtype.rstrip('/').rsplit('/', 1)[-1] for itemtype in scope['itemtype'].split()]
+    properties = set()
+    found = False
+    for tag in scope.find_all(attrs={'itemprop': True}):
+        # Properties of nested items belong to them, not to this one
+        if tag.find_parent(attrs={'itemscope': True}) is not scope:
+            continue
+        for prop in tag['itemprop'].split():
+            properties.add(prop)
+            if prop in ('telephone', 'email', 'sameAs'):
+                contacts.add(prop, _itemprop_value(tag))
+                found = True
+    if found:
+        contacts.business |= _is_business(types, properties)
+
+
+def _extract_hcard(card: Tag, contacts: StructuredContacts) -> None:
+    classes = set(card.get('class', []))
+    found = False
+    for tag in card.find_all(class_=list(HCARD_PROPERTIES)):
+        for class_name in tag.get('class', []):
+            prop = HCARD_PROPERTIES.get(class_name)
+            if prop:
+                contacts.add(prop, _itemprop_value(tag))
+                found = True
+    # An hCard is a business when it names an organization (org, p-org) or is one ("fn org")
+    if found and (card.find(class_=('org', 'p-org')) or {'fn', 'org'} <= classes):
+        contacts.business = True
+
+
+def _structured_data_kind(tag: Tag) -> str | None:
+    """Tells which kind of structured data an element holds, if any."""
+    attrs = tag.attrs
+    if not attrs:
+        return None
+    if tag.name == 'script':
+        return 'json-ld' if attrs.get('type') == 'application/ld+json' else None
+    if 'itemscope' in attrs and 'schema.org' in attrs.get('itemtype', '').lower():
+        return 'microdata'
+    if any(class_name in HCARD_CLASSES for class_name in attrs.get('class', ())):
+        return 'hcard'
+    return None
+
+
+def extract_structured_contacts(soup: BeautifulSoup) -> StructuredContacts:
+    """
+    Extracts the contact details declared as structured data in a page:
+    schema.org JSON-LD (e.g. the LocalBusiness blocks of Wix, Squarespace
+    and WordPress sites) and microdata, and hCard microformats.
+
+    Args:
+        soup: The BeautifulSoup object of the page.
+
+    Returns:
+        The emails, phone numbers and links found, and whether they belong to a business.
+    """
+    contacts = StructuredContacts()
+    # One walk over the page finds the roots of every kind of structured data
+    for tag in soup.find_all(_structured_data_kind):
+        kind = _structured_data_kind(tag)
+        if kind == 'json-ld':
+            _extract_json_ld(tag, contacts)
+        elif kind == 'microdata':
+            _extract_microdata(tag, contacts)
+        else:
+            _extract_hcard(tag, contacts)
+    return contacts
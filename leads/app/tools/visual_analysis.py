@@ -7,6 +7,7 @@ from loguru import logger
 from playwright.async_api import async_playwright, Error as PlaywrightError, Browser
 
 from app.schemas import VisualAnalysisOutput, CapturedScreenshot, VisualAnalysisInput
+from app.tools.domain_cache import NegativeDomainCache, classify_connection_error, get_negative_domain_cache
 
 
 # --- Custom Exceptions ---
@@ -29,6 +30,19 @@ class WebsiteScreenshotter:
     }
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
+    def __init__(self, domain_cache: Optional[NegativeDomainCache] = None) -> None:
+        """
+        Initializes the screenshotter.
+
+        Args:
+            domain_cache: The cache of dead websites. Websites it knows, e.g. parked
+                          domains, are skipped without launching a browser, and
+                          websites the browser cannot resolve or connect to are
+                          recorded in it.
+        """
+        self.domain_cache = domain_cache
+        self._recorded_urls: set[str] = set()
+
     def run(self, url: str) -> VisualAnalysisOutput:
         """
         Executes the screenshot capture workflow.
@@ -41,6 +55,10 @@ class WebsiteScreenshotter:
             logger.error("Validation failed: URL is empty or None.")
             raise ValueError("Error: A valid URL must be provided.")
 
+        known_failure = self.domain_cache.read(url) if self.domain_cache is not None else None
+        if known_failure:
+            raise ScreenshotCaptureError(f"Skipping {url}: its domain is known to be dead ({known_failure[0]}).")
+
         try:
             return asyncio.run(self._capture_screenshots_async(url))
         except Exception as e:
@@ -88,6 +106,7 @@ class WebsiteScreenshotter:
 
         except PlaywrightError as e:
             logger.error(f"[{task_name}] FAILED. Playwright error: {e}")
+            await self._record_dead_domain(url, e)
             return None  # Return None on failure, don't stop other tasks
         except Exception as e:
             logger.error(f"[{task_name}] FAILED. Unexpected error: {e}", exc_info=True)
@@ -100,6 +119,19 @@ class WebsiteScreenshotter:
                 await context.close()
             logger.debug(f"[{task_name}] Context/Page closed.")
 
+    async def _record_dead_domain(self, url: str, error: PlaywrightError) -> None:
+        """
+        Records the website in the domain cache when its domain does not
+        resolve or its server refuses connections.
+
+        Every viewport fails the same way on a dead website, so it is recorded once.
+        """
+        failure = classify_connection_error(error)
+        if failure is None or self.domain_cache is None or url in self._recorded_urls:
+            return
+        self._recorded_urls.add(url)
+        await asyncio.to_thread(self.domain_cache.record, url, failure, str(error).splitlines()[0])
+
     async def _capture_screenshots_async(self, url: str) -> VisualAnalysisOutput:
         """
         Runs all viewport screenshot captures in parallel.
@@ -160,7 +192,7 @@ def visual_analysis(url: str) -> VisualAnalysisOutput | str:
     """
     logger.info(f"Executing website_screenshotter tool for URL: {url}")
     try:
-        screenshotter = WebsiteScreenshotter()
+        screenshotter = WebsiteScreenshotter(domain_cache=get_negative_domain_cache())
         result = screenshotter.run(url)
         logger.info("Tool execution completed successfully.")
         return result
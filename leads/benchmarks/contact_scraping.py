@@ -0,0 +1,279 @@
+"""
+Benchmarks contact scraping against local fixture websites.
+
+Serves synthetic small-business sites from local HTTP servers, one per site
+so that each site is its own host, with a simulated latency per request, and
+scrapes all of them in parallel the way `analyze_leads_node` does. Each
+scenario reports the wall time of the batch, the p50/p95 crawl time per
+lead, the pages fetched and the contacts found, so changes to the scraper
+can be compared without touching real websites.
+
+The `sequential` scenario fetches one page at a time per site, as the
+scraper did before the crawl engine; the `concurrent` one uses the
+engine's per-host concurrency. All the sites are served from 127.0.0.1,
+like sites of one hosting provider, so the per address limit applies to
+them together.
+
+Usage, from the `leads` directory (the app package expects its database settings):
+
+    python -m benchmarks.contact_scraping --sites 8 --pages 40 --latency 0.1
+
+    # Add a site answering every request after 30 seconds, to see the crawl deadline at work
+    python -m benchmarks.contact_scraping --tarpit --deadline 5
+
+    # End each crawl once an email and a phone number are found. The fixture sites are
+    # served from 127.0.0.1, so their emails never count towards the own_email goal.
+    python -m benchmarks.contact_scraping --goals email,phone
+
+    # Be polite: 250ms between requests to a site, at most 8 concurrent requests to the shared server
+    python -m benchmarks.contact_scraping --host-delay 0.25 --per-address 8
+
+    # Declare every site's contacts as schema.org LocalBusiness JSON-LD on its homepage
+    python -m benchmarks.contact_scraping --structured
+
+    # Give every site a robots.txt and a sitemap index, with a sitemap of its pages and one of its posts;
+    # compare with --no-sitemaps, which ignores them and follows links
+    python -m benchmarks.contact_scraping --sitemaps
+    python -m benchmarks.contact_scraping --sitemaps --no-sitemaps
+"""
+import argparse
+import json
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from app.tools.contact_scraper import ContactScraper, parse_crawl_goals
+from app.tools.crawl_engine import CrawlEngine
+
+_TARPIT_DELAY = 30.0
+# Replaced by the scheme and host of the request in the files served, for sitemaps listing absolute URLs
+_ORIGIN = "{origin}"
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percentile) - 1]
+
+
+def _page(title: str, body: str, footer: str = '<a href="/contact">Contact us</a> <a href="/about">About</a>') -> str:
+    return (
+        f"<html><head><title>{title}</title></head><body>"
+        f'<header><nav><a href="/">Home</a> <a href="/services">Services</a> <a href="/blog">Blog</a></nav></header>'
+        f"<main>{body}</main><footer>{footer}</footer></body></html>"
+    )
+
+
+def _json_ld(domain: str, phone: str) -> str:
+    data = {
+        "@context": "https://schema.org",
+        "@type": "Dentist",
+        "name": domain,
+        "telephone": phone,
+        "email": f"hello@{domain}",
+        "address": {"@type": "PostalAddress", "addressLocality": "Austin"},
+        "sameAs": [f"https://www.facebook.com/{domain}", f"https://www.instagram.com/{domain}"],
+    }
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+
+def _sitemap(root: str, entry: str, paths: list[str]) -> str:
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><{root} xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        + "".join(f"<{entry}><loc>{_ORIGIN}{path}</loc></{entry}>" for path in paths)
+        + f"</{root}>"
+    )
+
+
+def synthesize_site(
+        index: int, pages: int, seed: int = 0, structured: bool = False, sitemaps: bool = False
+) -> dict[str, str]:
+    """
+    Generates a small-business website with a blog and a contact page.
+
+    Args:
+        index: The number of the site, used in its contact details.
+        pages: The number of blog posts.
+        seed: The seed of the random generator.
+        structured: Whether the homepage declares the contacts as schema.org JSON-LD.
+        sitemaps: Whether the site has a robots.txt, disallowing its services page, pointing to
+                  a sitemap index of two sitemaps: one of its pages and one of its blog posts.
+
+    Returns:
+        A mapping of path to HTML page, or to robots.txt and sitemap files.
+    """
+    rng = random.Random(seed * 1000 + index)
+    domain = f"site{index}.test"
+    phone = f"+1 512 555 {rng.randint(1000, 9999)}"
+    posts = [f"/blog/{2015 + i % 8}/{1 + i % 12:02d}/post-{i}" for i in range(pages)]
+
+    site = {
+        "/": _page("Home", "<p>Welcome to our family business since 1987.</p>"
+                           + "".join(f'<a href="{post}">Read more</a>' for post in posts[:5])
+                           + (_json_ld(domain, phone) if structured else "")),
+        "/services": _page("Services", "<p>We offer many services at fair prices: $19.99, $249.00.</p>"),
+        "/blog": _page("Blog", "".join(f'<a href="{post}">Post {i}</a>' for i, post in enumerate(posts))),
+        "/about": _page("About", '<p>Meet <a href="/team">our team</a>.</p>'),
+        "/team": _page("Team", f"<p>Call our manager on {phone}.</p>"),
+        "/contact": _page(
+            "Contact",
+            f'<a href="mailto:hello@{domain}">hello@{domain}</a> <a href="tel:{phone.replace(" ", "")}">Call</a>'
+            f'<a href="https://www.facebook.com/{domain}">Facebook</a>'
+        ),
+    }
+    for i, post in enumerate(posts):
+        related = "".join(f'<a href="{posts[(i + step) % len(posts)]}">Related</a>' for step in (1, 2, 3))
+        site[post] = _page(f"Post {i}", f"<p>{'Lorem ipsum dolor sit amet. ' * 50}</p>{related}")
+    if sitemaps:
+        site["/robots.txt"] = f"User-agent: *\nDisallow: /services\n\nSitemap: {_ORIGIN}/sitemap_index.xml\n"
+        site["/sitemap_index.xml"] = _sitemap("sitemapindex", "sitemap", ["/post-sitemap.xml", "/page-sitemap.xml"])
+        site["/page-sitemap.xml"] = _sitemap("urlset", "url", [path for path in site if not path.startswith("/blog/")])
+        site["/post-sitemap.xml"] = _sitemap("urlset", "url", posts)
+    return site
+
+
+def serve_site(site: dict[str, str], latency: float) -> ThreadingHTTPServer:
+    """
+    Serves a site from a local HTTP server on a free port, in a background thread.
+
+    Args:
+        site: Mapping of path to HTML page. Paths ending in .txt and .xml are served as text and XML.
+        latency: Seconds to wait before answering each request.
+
+    Returns:
+        The running server. Its URL is `http://127.0.0.1:{server.server_port}`.
+    """
+
+    class SiteHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            path = self.path.split("?")[0].rstrip("/") or "/"
+            page = site.get(path)
+            body = (page or "<html><body>Not found</body></html>").replace(
+                _ORIGIN, f"http://{self.headers['Host']}"
+            ).encode()
+            content_type = {".txt": "text/plain", ".xml": "application/xml"}.get(path[-4:], "text/html")
+            self.send_response(200 if page else 404)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fixture-site", daemon=True).start()
+    return server
+
+
+def _engine(per_host: int, args: argparse.Namespace) -> CrawlEngine:
+    return CrawlEngine(
+        max_connections_per_host=per_host,
+        host_delay=args.host_delay,
+        max_connections_per_address=args.per_address
+    )
+
+
+def _benchmark(name: str, urls: list[str], engine: CrawlEngine, args: argparse.Namespace) -> dict[str, Any]:
+    def scrape(url: str) -> tuple[float, int, int, bool]:
+        scraper = ContactScraper(
+            url, args.max_links, deadline=args.deadline, engine=engine, goals=parse_crawl_goals(args.goals),
+            use_sitemaps=not args.no_sitemaps
+        )
+        start = time.perf_counter()
+        output = scraper.run()
+        contacts = len(output.emails) + len(output.phone_numbers) + len(output.social_media)
+        return time.perf_counter() - start, output.pages_crawled, contacts, output.deadline_reached
+
+    metrics_before = engine.metrics.snapshot()
+    wall_times, lead_times, pages, contacts, deadlines_reached = [], [], [], [], 0
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            results = list(executor.map(scrape, urls))
+        wall_times.append(time.perf_counter() - start)
+        for lead_time, lead_pages, lead_contacts, deadline_reached in results:
+            lead_times.append(lead_time)
+            pages.append(lead_pages)
+            contacts.append(lead_contacts)
+            deadlines_reached += deadline_reached
+
+    return {
+        "benchmark": name,
+        "runs": args.runs,
+        "leads": len(urls),
+        "wall_p50_s": _percentile(wall_times, 50),
+        "lead_p50_s": _percentile(lead_times, 50),
+        "lead_p95_s": _percentile(lead_times, 95),
+        "pages_per_lead": statistics.mean(pages),
+        "contacts_per_lead": statistics.mean(contacts),
+        # Crawls stopped at their deadline, with partial results
+        "deadlines_reached": deadlines_reached,
+        **{
+            name: value for name, value in engine.metrics.since(metrics_before).items()
+            if name in ("requests", "host_wait_seconds", "fetch_seconds")
+        },
+    }
+
+
+def _print_results(results: list[dict[str, Any]], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+
+    columns = list(results[0].keys())
+    print(" | ".join(f"{column:>18}" for column in columns))
+    for result in results:
+        print(" | ".join(
+            f"{value:>18.2f}" if isinstance(value, float) else f"{value:>18}" for value in result.values()
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", type=int, default=8, help="Number of fixture sites, i.e. leads.")
+    parser.add_argument("--pages", type=int, default=40, help="Blog posts per site.")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per request.")
+    parser.add_argument("--tarpit", action="store_true", help=f"Add a site taking {_TARPIT_DELAY:.0f}s per request.")
+    parser.add_argument("--max-links", type=int, default=10)
+    parser.add_argument("--deadline", type=float, default=60.0, help="Crawl deadline per lead in seconds.")
+    parser.add_argument("--goals", default="", help='Crawl completion goals, e.g. "own_email,phone".')
+    parser.add_argument("--structured", action="store_true", help="Declare contacts as JSON-LD on the homepages.")
+    parser.add_argument("--sitemaps", action="store_true", help="Serve a robots.txt and sitemaps for every site.")
+    parser.add_argument("--no-sitemaps", action="store_true", help="Ignore robots.txt and sitemaps, following links.")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests per host when concurrent.")
+    parser.add_argument("--host-delay", type=float, default=0.0, help="Seconds between requests to a site.")
+    parser.add_argument("--per-address", type=int, default=16, help="Concurrent requests to the shared server.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    servers = [
+        serve_site(synthesize_site(index, args.pages, args.seed, args.structured, args.sitemaps), args.latency)
+        for index in range(args.sites)
+    ]
+    if args.tarpit:
+        servers.append(serve_site(synthesize_site(args.sites, args.pages, args.seed), _TARPIT_DELAY))
+    urls = [f"http://127.0.0.1:{server.server_port}/" for server in servers]
+
+    try:
+        results = [
+            _benchmark("sequential", urls, _engine(1, args), args),
+            _benchmark("concurrent", urls, _engine(args.per_host, args), args),
+        ]
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    _print_results(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Any, Optional
+
+from googlemaps.exceptions import ApiError
+from loguru import logger
+
+from app.tools.search_planner import SearchPlanner
+
+
+_PRICE_LEVELS = [
+    "PRICE_LEVEL_FREE", "PRICE_LEVEL_INEXPENSIVE", "PRICE_LEVEL_MODERATE",
+    "PRICE_LEVEL_EXPENSIVE", "PRICE_LEVEL_VERY_EXPENSIVE",
+]
+
+# Keys of a place that the legacy search endpoints return; the rest (phone,
+# website...) is only available through place details.
+_SEARCH_RESULT_KEYS = (
+    "place_id", "name", "formatted_address", "geometry", "rating", "user_ratings_total",
+    "types", "price_level", "opening_hours", "business_status",
+)
+
+
+def _normalize_address(address: str) -> str:
+    return " ".join(address.lower().replace(",", " ").split())
+
+
+def _distance_meters(a: dict[str, float], b: dict[str, float]) -> float:
+    dy = (b['lat'] - a['lat']) * 111320.0
+    dx = (b['lng'] - a['lng']) * 111320.0 * math.cos(math.radians((a['lat'] + b['lat']) / 2))
+    return math.hypot(dx, dy)
+
+
+class FakeGoogleMapsClient:
+    """
+    An offline stand-in for the googlemaps.Client endpoints used by GoogleMapsClient.
+
+    It serves geocode, places, places_nearby and place requests, as well as the
+    Places API (New) text and nearby searches, from a fixture of recorded
+    places. Responses are delayed by a latency drawn from a log-normal
+    distribution per endpoint, legacy page tokens only become valid a while
+    after they are issued, and searches stop at 60 results, so the search path
+    can be load-tested without spending Maps quota.
+
+    Fixtures are JSON objects of the form:
+        {
+            "geocode": {"austin, tx": {"lat": 30.27, "lng": -97.74}},
+            "places": [<place details results, as returned by the place endpoint>]
+        }
+    """
+
+    def __init__(
+            self,
+            fixture: dict[str, Any],
+            latencies: Optional[dict[str, tuple[float, float]]] = None,
+            page_token_delay: float = 2.0,
+            latency_scale: float = 1.0,
+            seed: Optional[int] = None
+    ) -> None:
+        """
+        Initializes the fake client.
+
+        Args:
+            fixture: The recorded geocode results and places.
+            latencies: Optional (median, p95) latency overrides per endpoint, in seconds.
+            page_token_delay: Seconds before a legacy next_page_token is accepted.
+            latency_scale: Factor applied to every latency, 0 to disable them.
+            seed: Optional seed for the latency distribution.
+        """
+        self.geocodes = {_normalize_address(address): location for address, location in fixture.get("geocode", {}).items()}
+        self.places_by_id = {place['place_id']: place for place in fixture.get("places", [])}
+        self.latencies = {**SearchPlanner.DEFAULT_CALL_LATENCIES, **(latencies or {})}
+        self.page_token_delay = page_token_delay
+        self.latency_scale = latency_scale
+        self.requests_kwargs: dict[str, Any] = {}
+
+        self.calls: Counter[str] = Counter()
+        self.call_latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self._random = random.Random(seed)
+        self._tokens: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_fixture(cls, path: str, **kwargs: Any) -> "FakeGoogleMapsClient":
+        """
+        Creates a fake client from a fixture file.
+
+        Args:
+            path: The path to the JSON fixture.
+            **kwargs: Arguments to pass to the constructor.
+
+        Returns:
+            The fake client.
+        """
+        with open(path) as fixture_file:
+            fixture = json.load(fixture_file)
+        logger.info(f"Loaded Google Maps fixture with {len(fixture.get('places', []))} places from {path}.")
+        return cls(fixture, **kwargs)
+
+    def _simulate(self, endpoint: str) -> None:
+        """Records a request and sleeps for a latency drawn for its endpoint."""
+        median, p95 = self.latencies[endpoint]
+        sigma = math.log(p95 / median) / 1.645 if p95 > median else 0.0
+        with self._lock:
+            latency = median * math.exp(self._random.gauss(0.0, sigma)) * self.latency_scale
+            self.calls[endpoint] += 1
+            self.call_latencies[endpoint].append(latency)
+        if latency > 0:
+            time.sleep(latency)
+
+    def _issue_page(self, results: list[dict[str, Any]], page_size: int = 20) -> tuple[list[dict[str, Any]], Optional[str]]:
+        """Splits off the first page of results, keeping the rest behind a page token."""
+        page, remaining = results[:page_size], results[page_size:]
+        if not remaining:
+            return page, None
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = (time.monotonic() + self.page_token_delay * self.latency_scale, remaining)
+        return page, token
+
+    def _redeem_page_token(self, token: str, enforce_delay: bool = True) -> list[dict[str, Any]]:
+        """Returns the results behind a page token, failing like the API if it is not valid yet."""
+        with self._lock:
+            valid_from, remaining = self._tokens.get(token, (None, None))
+            if remaining is None or (enforce_delay and time.monotonic() < valid_from):
+                raise ApiError("INVALID_REQUEST")
+            del self._tokens[token]
+        return remaining
+
+    def _matching_places(self, query: Optional[str] = None, place_type: Optional[str] = None) -> list[dict[str, Any]]:
+        """Returns the places of the fixture matching a text query or a place type."""
+        if place_type:
+            return [place for place in self.places_by_id.values() if place_type in place.get("types", [])]
+
+        words = set(_normalize_address(query or "").split())
+        return [
+            place for place in self.places_by_id.values()
+            if "business" in words
+            or any(place_type.replace("_", " ") in (query or "").lower() for place_type in place.get("types", []))
+            or words & set(_normalize_address(place.get("name", "")).split())
+        ]
+
+    @staticmethod
+    def _search_result(place: dict[str, Any]) -> dict[str, Any]:
+        return {key: place[key] for key in _SEARCH_RESULT_KEYS if key in place}
+
+    # --- Legacy endpoints ---
+
+    def geocode(self, address: str, **kwargs: Any) -> list[dict[str, Any]]:
+        self._simulate("geocode")
+        location = self.geocodes.get(_normalize_address(address))
+        if location is None:
+            return []
+        return [{"formatted_address": address, "geometry": {"location": dict(location)}}]
+
+    def places(
+            self,
+            query: Optional[str] = None,
+            location: Optional[dict[str, float]] = None,
+            radius: Optional[int] = None,
+            page_token: Optional[str] = None,
+            **kwargs: Any
+    ) -> dict[str, Any]:
+        self._simulate("places")
+        if page_token:
+            results = self._redeem_page_token(page_token)
+        else:
+            # Text Search only biases towards the location, so the nearest matches come first.
+            results = self._matching_places(query=query)
+            if location:
+                results.sort(key=lambda place: _distance_meters(location, place['geometry']['location']))
+            results = [self._search_result(place) for place in results[:60]]
+
+        page, token = self._issue_page(results)
+        response = {"status": "OK" if page else "ZERO_RESULTS", "results": page}
+        if token:
+            response["next_page_token"] = token
+        return response
+
+    def places_nearby(
+            self,
+            location: Optional[dict[str, float]] = None,
+            radius: Optional[int] = None,
+            type: Optional[str] = None,
+            page_token: Optional[str] = None,
+            **kwargs: Any
+    ) -> dict[str, Any]:
+        self._simulate("places_nearby")
+        if page_token:
+            results = self._redeem_page_token(page_token)
+        else:
+            # Nearby Search is restricted to the circle and ranked by prominence.
+            results = [
+                place for place in self._matching_places(place_type=type)
+                if _distance_meters(location, place['geometry']['location']) <= radius
+            ]
+            results.sort(key=lambda place: place.get("user_ratings_total", 0), reverse=True)
+            results = [self._search_result(place) for place in results[:60]]
+
+        page, token = self._issue_page(results)
+        response = {"status": "OK" if page else "ZERO_RESULTS", "results": page}
+        if token:
+            response["next_page_token"] = token
+        return response
+
+    def place(self, place_id: str, fields: Optional[list[str]] = None, **kwargs: Any) -> dict[str, Any]:
+        self._simulate("place")
+        place = self.places_by_id.get(place_id)
+        if place is None:
+            raise ApiError("NOT_FOUND")
+        if fields is None:
+            return {"status": "OK", "result": dict(place)}
+
+        keys = {"types" if field == "type" else field for field in fields}
+        return {"status": "OK", "result": {key: value for key, value in place.items() if key in keys}}
+
+    # --- Places API (New), reached through Client._request ---
+
+    @staticmethod
+    def _new_api_place(place: dict[str, Any]) -> dict[str, Any]:
+        location = place['geometry']['location']
+        converted = {
+            "id": place['place_id'],
+            "displayName": {"text": place.get("name")},
+            "formattedAddress": place.get("formatted_address"),
+            "nationalPhoneNumber": place.get("formatted_phone_number"),
+            "websiteUri": place.get("website"),
+            "rating": place.get("rating"),
+            "userRatingCount": place.get("user_ratings_total"),
+            "types": place.get("types"),
+            "location": {"latitude": location['lat'], "longitude": location['lng']},
+        }
+        if place.get("price_level") is not None:
+            converted["priceLevel"] = _PRICE_LEVELS[place["price_level"]]
+        if "opening_hours" in place:
+            converted["currentOpeningHours"] = {"openNow": place["opening_hours"].get("open_now")}
+        return {key: value for key, value in converted.items() if value is not None}
+
+    def _request(self, url: str, params: dict[str, Any], post_json: Optional[dict[str, Any]] = None, **kwargs: Any) -> dict[str, Any]:
+        body = post_json or {}
+        if url.endswith(":searchText"):
+            self._simulate("places:searchText")
+            if body.get("pageToken"):
+                results = self._redeem_page_token(body["pageToken"], enforce_delay=False)
+            else:
+                circle = body.get("locationBias", {}).get("circle", {}).get("center")
+                results = self._matching_places(query=body.get("textQuery"))
+                if circle:
+                    center = {'lat': circle['latitude'], 'lng': circle['longitude']}
+                    results.sort(key=lambda place: _distance_meters(center, place['geometry']['location']))
+                results = [self._new_api_place(place) for place in results[:60]]
+
+            page, token = self._issue_page(results, body.get("pageSize", 20))
+            response = {"places": page}
+            if token:
+                response["nextPageToken"] = token
+            return response
+
+        if url.endswith(":searchNearby"):
+            self._simulate("places:searchNearby")
+            circle = body["locationRestriction"]["circle"]
+            center = {'lat': circle['center']['latitude'], 'lng': circle['center']['longitude']}
+            results = [
+                place for place_type in body.get("includedTypes", []) for place in self._matching_places(place_type=place_type)
+                if _distance_meters(center, place['geometry']['location']) <= circle['radius']
+            ]
+            results.sort(key=lambda place: place.get("user_ratings_total", 0), reverse=True)
+            return {"places": [self._new_api_place(place) for place in results[:body.get("maxResultCount", 20)]]}
+
+        raise ApiError("NOT_FOUND", f"The fake client does not serve {url}")
+
+
+class FixtureRecorder:
+    """
+    Wraps a real googlemaps.Client and records what it returns as a fixture.
+
+    Pass it as the `client` of a GoogleMapsClient and run a search with the
+    "details" strategy; afterwards `fixture()` holds the geocode results and
+    the union of the search results and place details of every place seen.
+    """
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+        self._lock = threading.Lock()
+        self._geocodes: dict[str, dict[str, float]] = {}
+        self._places: dict[str, dict[str, Any]] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def _record_places(self, places: list[dict[str, Any]]) -> None:
+        with self._lock:
+            for place in places:
+                if place.get("place_id"):
+                    self._places.setdefault(place["place_id"], {}).update(place)
+
+    def geocode(self, address: str, **kwargs: Any) -> list[dict[str, Any]]:
+        results = self._client.geocode(address, **kwargs)
+        if results:
+            with self._lock:
+                self._geocodes[address] = results[0]['geometry']['location']
+        return results
+
+    def places(self, **kwargs: Any) -> dict[str, Any]:
+        response = self._client.places(**kwargs)
+        self._record_places(response.get("results", []))
+        return response
+
+    def places_nearby(self, **kwargs: Any) -> dict[str, Any]:
+        response = self._client.places_nearby(**kwargs)
+        self._record_places(response.get("results", []))
+        return response
+
+    def place(self, place_id: str, **kwargs: Any) -> dict[str, Any]:
+        response = self._client.place(place_id, **kwargs)
+        if response.get("result"):
+            self._record_places([{**response["result"], "place_id": place_id}])
+        return response
+
+    def fixture(self) -> dict[str, Any]:
+        """Returns the recorded fixture, keeping only places with a location."""
+        with self._lock:
+            return {
+                "geocode": dict(self._geocodes),
+                "places": [place for place in self._places.values() if "geometry" in place],
+            }
+
+
+def synthesize_fixture(
+        city: str,
+        location: dict[str, float],
+        business_types: list[str],
+        count: int = 1000,
+        radius: int = 20000,
+        website_share: float = 0.5,
+        seed: int = 0
+) -> dict[str, Any]:
+    """
+    Generates a fixture of plausible places around a city.
+
+    Places are denser towards the centre, and a share of them have a
+    website, so the filters of the search see a realistic mix. Websites are
+    on the reserved ".test" domain: they pass the website checks of the
+    search like real ones, but never resolve to a real business.
+
+    Args:
+        city: The city name to register in the geocode results.
+        location: The 'lat' and 'lng' of the city centre.
+        business_types: The place types to spread the places over.
+        count: The number of places to generate.
+        radius: The radius in meters the places are spread over.
+        website_share: The share of places with a website, between 0 and 1.
+        seed: The seed of the generator.
+
+    Returns:
+        The fixture.
+    """
+    generator = random.Random(seed)
+    places = []
+    for index in range(count):
+        distance = radius * generator.random() ** 1.5
+        angle = generator.uniform(0, 2 * math.pi)
+        lat = location['lat'] + distance * math.sin(angle) / 111320.0
+        lng = location['lng'] + distance * math.cos(angle) / (111320.0 * math.cos(math.radians(location['lat'])))
+        business_type = generator.choice(business_types)
+        name = f"{business_type.replace('_', ' ').title()} {index}"
+        place = {
+            "place_id": f"fake-{seed}-{index}",
+            "name": name,
+            "formatted_address": f"{index} Main St, {city}",
+            "formatted_phone_number": f"(555) {index // 10000:03d}-{index % 10000:04d}",
+            "geometry": {"location": {"lat": lat, "lng": lng}},
+            "rating": round(generator.uniform(2.5, 5.0), 1),
+            "user_ratings_total": int(generator.paretovariate(1.2) * 5),
+            "types": [business_type, "point_of_interest", "establishment"],
+            "opening_hours": {"open_now": generator.random() < 0.6},
+            "business_status": "OPERATIONAL",
+        }
+        if generator.random() < website_share:
+            place["website"] = f"https://www.{business_type.replace('_', '-')}-{index}.test"
+        if generator.random() < 0.7:
+            place["price_level"] = generator.randint(1, 3)
+        places.append(place)
+
+    return {"geocode": {city: location}, "places": places}
@@ -0,0 +1,244 @@
+"""
+Benchmarks lead generation against the offline Google Maps stand-in.
+
+Runs `_google_maps_search` and `generate_leads_node` several times against a
+`FakeGoogleMapsClient` and reports the wall time, the API calls made per lead
+and the p50/p95 latencies, so changes to the search path can be compared
+without spending Maps quota.
+
+Usage, from the `leads` directory (the app package expects its database settings):
+
+    # Benchmark against a synthetic fixture generated on the fly
+    python -m benchmarks.lead_generation run --city "Austin, TX" --business-type restaurant
+
+    # Record a fixture with the real API once, then benchmark against it
+    python -m benchmarks.lead_generation record --city "Austin, TX" --business-type restaurant --out austin.json
+    python -m benchmarks.lead_generation run --fixture austin.json --city "Austin, TX" --business-type restaurant
+
+    # Write a synthetic fixture, e.g. for GOOGLE_MAPS_FAKE_FIXTURE
+    python -m benchmarks.lead_generation synthesize --city "Austin, TX" --out synthetic.json
+"""
+import argparse
+import importlib
+import json
+import statistics
+import time
+from datetime import timedelta
+from typing import Any, Callable
+
+from langgraph.graph import StateGraph
+from loguru import logger
+
+from app.agents.lead_generator_node import generate_leads_node
+from app.core import Config
+from app.schemas.state import State
+from benchmarks.google_maps_fake import FakeGoogleMapsClient, FixtureRecorder, synthesize_fixture
+from app.tools.google_maps_search import GoogleMapsClient
+
+# `app.tools` re-exports a tool under the module's own name, so the module is looked up explicitly.
+google_maps_search = importlib.import_module("app.tools.google_maps_search")
+
+_SYNTHETIC_LOCATION = {"lat": 30.2672, "lng": -97.7431}
+_SYNTHETIC_TYPES = ["restaurant", "cafe", "bar", "bakery", "gym", "hair_care", "dentist", "plumber"]
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percentile) - 1]
+
+
+def _install_client(fake: FakeGoogleMapsClient, args: argparse.Namespace) -> None:
+    """Makes the search functions use a fresh GoogleMapsClient backed by the fake."""
+    google_maps_search._maps_client_instance = GoogleMapsClient(
+        api_key=None,
+        client=fake,
+        max_concurrent_details=args.details_concurrency,
+        tile_radius=Config.GOOGLE_MAPS_TILE_RADIUS,
+        min_tile_radius=Config.GOOGLE_MAPS_MIN_TILE_RADIUS,
+        max_concurrent_tiles=Config.GOOGLE_MAPS_TILE_CONCURRENCY,
+    )
+
+
+def _run_search(args: argparse.Namespace) -> int:
+    output = google_maps_search._google_maps_search(
+        city=args.city,
+        business_type=args.business_type,
+        radius=args.radius,
+        min_rating=args.min_rating,
+        max_results=args.max_results,
+        exclude_websites=args.exclude_websites,
+        strategy=args.strategy,
+        tiled=args.tiled,
+    )
+    if output.status != "success":
+        raise RuntimeError(output.message)
+    return output.total_results
+
+
+def _run_node(args: argparse.Namespace) -> int:
+    # The node expects a graph context (for its stream writer), so it runs in a graph of its own.
+    graph = StateGraph(State)
+    graph.add_node("generate_leads", generate_leads_node)
+    graph.set_entry_point("generate_leads")
+    graph.set_finish_point("generate_leads")
+
+    state = State(
+        city=args.city,
+        business_type=args.business_type,
+        radius=args.radius,
+        min_rating=args.min_rating,
+        max_results=args.max_results,
+    )
+    return len(graph.compile().invoke(state)["leads"])
+
+
+def _benchmark(name: str, target: Callable[[argparse.Namespace], int], fixture: dict[str, Any], args: argparse.Namespace) -> dict[str, Any]:
+    wall_times, leads, calls = [], [], []
+    request_latencies: list[float] = []
+
+    for _ in range(args.runs):
+        fake = FakeGoogleMapsClient(
+            fixture,
+            page_token_delay=args.page_token_delay,
+            latency_scale=args.latency_scale,
+            seed=args.seed,
+        )
+        _install_client(fake, args)
+
+        start = time.perf_counter()
+        leads.append(target(args))
+        wall_times.append(time.perf_counter() - start)
+        calls.append(sum(fake.calls.values()))
+        request_latencies.extend(latency for values in fake.call_latencies.values() for latency in values)
+
+    total_leads = sum(leads)
+    return {
+        "benchmark": name,
+        "runs": args.runs,
+        "leads_per_run": statistics.mean(leads),
+        "wall_p50_s": _percentile(wall_times, 50),
+        "wall_p95_s": _percentile(wall_times, 95),
+        "api_calls_per_run": statistics.mean(calls),
+        "api_calls_per_lead": sum(calls) / total_leads if total_leads else float("inf"),
+        "request_p50_ms": _percentile(request_latencies, 50) * 1000,
+        "request_p95_ms": _percentile(request_latencies, 95) * 1000,
+    }
+
+
+def _load_fixture(args: argparse.Namespace) -> dict[str, Any]:
+    if args.fixture:
+        with open(args.fixture) as fixture_file:
+            return json.load(fixture_file)
+    return synthesize_fixture(
+        args.city, _SYNTHETIC_LOCATION, _SYNTHETIC_TYPES, count=args.places, website_share=args.website_share,
+        seed=args.seed
+    )
+
+
+def run(args: argparse.Namespace) -> None:
+    # The node reads the search mode from the configuration rather than its arguments.
+    Config.GOOGLE_MAPS_SEARCH_STRATEGY = args.strategy
+    Config.GOOGLE_MAPS_TILED_SEARCH = args.tiled
+    # Every run must go through the search pipeline rather than the search result cache.
+    google_maps_search._search_cache.ttl = timedelta(0)
+
+    fixture = _load_fixture(args)
+    results = [
+        _benchmark("_google_maps_search", _run_search, fixture, args),
+        _benchmark("generate_leads_node", _run_node, fixture, args),
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    columns = list(results[0].keys())
+    print(" | ".join(f"{column:>20}" for column in columns))
+    for result in results:
+        print(" | ".join(
+            f"{value:>20.2f}" if isinstance(value, float) else f"{value:>20}" for value in result.values()
+        ))
+
+
+def record(args: argparse.Namespace) -> None:
+    import googlemaps
+
+    recorder = FixtureRecorder(googlemaps.Client(key=Config.GOOGLE_MAPS_API_KEY))
+    maps_client = GoogleMapsClient(api_key=None, client=recorder)
+    businesses = maps_client.search_businesses(
+        city=args.city,
+        business_type=args.business_type,
+        radius=args.radius,
+        max_results=args.max_results,
+        exclude_websites=False,
+        strategy=GoogleMapsClient.STRATEGY_DETAILS,
+        tiled=args.tiled,
+    )
+
+    fixture = recorder.fixture()
+    with open(args.out, "w") as fixture_file:
+        json.dump(fixture, fixture_file)
+    logger.success(f"Recorded {len(fixture['places'])} places ({len(businesses)} with details) to {args.out}.")
+
+
+def synthesize(args: argparse.Namespace) -> None:
+    fixture = synthesize_fixture(
+        args.city, _SYNTHETIC_LOCATION, _SYNTHETIC_TYPES, count=args.places, website_share=args.website_share,
+        seed=args.seed
+    )
+    with open(args.out, "w") as fixture_file:
+        json.dump(fixture, fixture_file)
+    logger.success(f"Wrote {len(fixture['places'])} synthetic places to {args.out}.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_search_arguments(command: argparse.ArgumentParser) -> None:
+        command.add_argument("--city", default="Austin, TX")
+        command.add_argument("--business-type", default="restaurant")
+        command.add_argument("--radius", type=int, default=50000)
+        command.add_argument("--max-results", type=int, default=50)
+        command.add_argument("--tiled", action="store_true")
+
+    run_command = commands.add_parser("run", help="Benchmark the search path against the fake client.")
+    add_search_arguments(run_command)
+    run_command.add_argument("--fixture", help="Recorded fixture; a synthetic one is generated when omitted.")
+    run_command.add_argument("--places", type=int, default=2000, help="Size of the synthetic fixture.")
+    run_command.add_argument(
+        "--website-share", type=float, default=0.5, help="Share of synthetic places with a website."
+    )
+    run_command.add_argument("--min-rating", type=float, default=0.0)
+    run_command.add_argument("--exclude-websites", action="store_true")
+    run_command.add_argument("--strategy", choices=["details", "inline"], default="details")
+    run_command.add_argument("--details-concurrency", type=int, default=Config.GOOGLE_MAPS_DETAILS_CONCURRENCY)
+    run_command.add_argument("--runs", type=int, default=5)
+    run_command.add_argument("--page-token-delay", type=float, default=2.0)
+    run_command.add_argument("--latency-scale", type=float, default=1.0, help="Scale the simulated latencies.")
+    run_command.add_argument("--seed", type=int, default=0)
+    run_command.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    run_command.set_defaults(handler=run)
+
+    record_command = commands.add_parser("record", help="Record a fixture using the real API (spends quota).")
+    add_search_arguments(record_command)
+    record_command.add_argument("--out", required=True)
+    record_command.set_defaults(handler=record)
+
+    synthesize_command = commands.add_parser("synthesize", help="Write a synthetic fixture.")
+    synthesize_command.add_argument("--city", default="Austin, TX")
+    synthesize_command.add_argument("--places", type=int, default=2000)
+    synthesize_command.add_argument(
+        "--website-share", type=float, default=0.5, help="Share of synthetic places with a website."
+    )
+    synthesize_command.add_argument("--seed", type=int, default=0)
+    synthesize_command.add_argument("--out", required=True)
+    synthesize_command.set_defaults(handler=synthesize)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmarks the contact extraction of single pages, without any network.
+
+Runs `ContactScraper._scrape_page` over a corpus of saved HTML pages with
+every available BeautifulSoup parser, and reports the p50/p95 time per page,
+the pages per second and the contacts and links found, so changes to the
+extraction, and the parsers themselves, can be compared on the same pages.
+
+Usage, from the `leads` directory (the app package expects its database settings):
+
+    # Benchmark against pages synthesized on the fly, like the contact scraping benchmark's sites
+    python -m benchmarks.page_extraction
+
+    # Save pages once, e.g. with `curl -o corpus/joes-pizza.html https://joes-pizza.com`, then
+    python -m benchmarks.page_extraction --corpus corpus
+
+    # Write the synthetic corpus, to save alongside real pages
+    python -m benchmarks.page_extraction --write-corpus corpus
+"""
+import argparse
+import importlib.util
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmarks.contact_scraping import synthesize_site
+from app.tools.contact_scraper import ContactScraper
+from app.tools.crawl_engine import CrawlEngine
+
+# Pages of the corpus are scraped as if they were on this site
+_BASE_URL = "https://example.test"
+_PARSERS = ("html.parser", "lxml", "html5lib")
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percentile) - 1]
+
+
+def synthesize_corpus(sites: int, pages: int, seed: int = 0) -> dict[str, str]:
+    """
+    Generates a corpus from the fixture sites of the contact scraping benchmark,
+    every other site declaring its contacts as JSON-LD, plus one large page
+    with thousands of links, as found on directories and sitemaps.
+
+    Args:
+        sites: The number of sites.
+        pages: The number of blog posts per site.
+        seed: The seed of the random generator.
+
+    Returns:
+        A mapping of file name to HTML page.
+    """
+    corpus = {}
+    for index in range(sites):
+        for path, html in synthesize_site(index, pages, seed, structured=index % 2 == 1).items():
+            corpus[f"site{index}{path.replace('/', '_') or '_'}.html"] = html
+    corpus["directory.html"] = (
+        "<html><body><main>"
+        + "".join(f'<p><a href="/listing/{i}">Listing {i}</a> Call 512-555-{i % 10000:04d}</p>' for i in range(2000))
+        + '</main><footer><a href="/contact">Contact</a></footer></body></html>'
+    )
+    return corpus
+
+
+def _benchmark(parser: str, corpus: dict[str, str], runs: int) -> dict[str, Any]:
+    # Not started: the pages are parsed directly, nothing is fetched
+    engine = CrawlEngine()
+    page_times = []
+    for _ in range(runs):
+        scraper = ContactScraper(_BASE_URL, max_links=10, engine=engine, html_parser=parser)
+        for name, html in corpus.items():
+            start = time.perf_counter()
+            scraper._scrape_page(f"{_BASE_URL}/{name}", html, 0)
+            page_times.append(time.perf_counter() - start)
+
+    return {
+        "parser": parser,
+        "pages": len(corpus),
+        "page_p50_ms": _percentile(page_times, 50) * 1000,
+        "page_p95_ms": _percentile(page_times, 95) * 1000,
+        "pages_per_s": len(page_times) / sum(page_times),
+        "contacts": sum(len(values) for values in scraper.contacts.values()),
+        "links_queued": len(scraper.frontier_scores),
+    }
+
+
+def _print_results(results: list[dict[str, Any]], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+
+    columns = list(results[0].keys())
+    print(" | ".join(f"{column:>14}" for column in columns))
+    for result in results:
+        print(" | ".join(
+            f"{value:>14.2f}" if isinstance(value, float) else f"{value:>14}" for value in result.values()
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, help="Directory of saved .html pages. Synthesized if not set.")
+    parser.add_argument("--write-corpus", type=Path, help="Write the synthetic corpus to this directory and exit.")
+    parser.add_argument("--sites", type=int, default=8, help="Sites of the synthetic corpus.")
+    parser.add_argument("--pages", type=int, default=40, help="Blog posts per site of the synthetic corpus.")
+    parser.add_argument(
+        "--parsers", default=",".join(_PARSERS), help="Comma separated parsers; those not installed are skipped."
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = {path.name: path.read_text(errors="replace") for path in sorted(args.corpus.glob("*.html"))}
+    else:
+        corpus = synthesize_corpus(args.sites, args.pages, args.seed)
+
+    if args.write_corpus:
+        args.write_corpus.mkdir(parents=True, exist_ok=True)
+        for name, html in corpus.items():
+            (args.write_corpus / name).write_text(html)
+        print(f"Wrote {len(corpus)} pages to {args.write_corpus}")
+        return
+
+    parsers = [
+        name for name in args.parsers.split(",")
+        if name == "html.parser" or importlib.util.find_spec(name)
+    ]
+    _print_results([_benchmark(name, corpus, args.runs) for name in parsers], args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmarks phone number extraction on pathological page texts.
+
+Times the phone number scanner of `app.tools.phone_numbers` and the regex
+it replaced, on inputs of growing size that are hard on regex engines or
+full of false positives: long digit runs, digits and separators
+alternating, price lists, menus, dates, plus a contact page as a control.
+The time per KB of the scanner must stay flat as the inputs grow, i.e. the
+scan must stay linear, and it must find the numbers of the control page
+and nothing in the others.
+
+Usage, from the `leads` directory (the app package expects its database settings):
+
+    python -m benchmarks.phone_extraction --sizes 1000,10000,100000
+
+    # Time the scanner alone on 1 MB inputs
+    python -m benchmarks.phone_extraction --sizes 1000000 --legacy-max-size 0
+"""
+import argparse
+import json
+import re
+import time
+from typing import Any, Callable
+
+from app.tools.phone_numbers import find_phone_numbers
+
+# The regex and validation ContactScraper used before the scanner, for reference. It joined the groups
+# of `findall`, which leave out the main part of the pattern, so it dropped nearly every number it matched;
+# whole matches are counted here, as intended.
+_LEGACY_PHONE_REGEX = re.compile(r'(\+?\d{1,3}[-.\s]?)?(\(?\d{3}\)?[-.\s]?)?[\d\s.-]{7,10}')
+
+_CONTACT_PAGE = (
+    "Visit us at 1200 Congress Ave, Austin, TX 78701. Open Mon-Fri 9:00-17:00.\n"
+    "Call (512) 555-0134 or +1 512.555.0199, fax 1-800-555-0100. Since 1987.\n"
+)
+
+
+def _legacy_find_phone_numbers(text: str) -> set[str]:
+    phone_numbers = set()
+    for match in _LEGACY_PHONE_REGEX.finditer(text):
+        phone_number = match.group().strip()
+        if len(re.sub(r'\D', '', phone_number)) >= 7:
+            phone_numbers.add(phone_number)
+    return phone_numbers
+
+
+def _repeat(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+# Input name: text of the given size in characters
+INPUTS: dict[str, Callable[[int], str]] = {
+    "digit_run": lambda size: "9" * size,
+    "spaced_digits": lambda size: _repeat("1 ", size),
+    "dashed_digits": lambda size: _repeat("12-", size),
+    "dotted_digits": lambda size: _repeat("3.", size),
+    "price_list": lambda size: _repeat("Large pizza 12.50 19.99 24.99 1249.00 ", size),
+    "menu": lambda size: _repeat("No. 12 Pad Thai .... 13.50\nNo. 13 Green Curry .... 14.25\n", size),
+    "dates": lambda size: _repeat("2023-10-15 15.10.2023 10-15-2023 ", size),
+    "contact_page": lambda size: _repeat(_CONTACT_PAGE, size),
+}
+
+
+def _time(find: Callable[[str], set[str]], text: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    found = find(text)
+    return time.perf_counter() - start, len(found)
+
+
+def _benchmark(name: str, size: int, args: argparse.Namespace) -> dict[str, Any]:
+    text = INPUTS[name](size)
+    elapsed, found = min(_time(lambda t: find_phone_numbers(t, args.region), text) for _ in range(args.runs))
+    result = {
+        "input": name,
+        "size": size,
+        "scanner_ms": elapsed * 1000,
+        "scanner_us_per_kb": elapsed * 1e6 / (size / 1000),
+        "scanner_found": found,
+        "legacy_ms": None,
+        "legacy_found": None,
+    }
+    if size <= args.legacy_max_size:
+        legacy_elapsed, legacy_found = min(_time(_legacy_find_phone_numbers, text) for _ in range(args.runs))
+        result.update(legacy_ms=legacy_elapsed * 1000, legacy_found=legacy_found)
+    return result
+
+
+def _print_results(results: list[dict[str, Any]], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+
+    columns = list(results[0].keys())
+    print(" | ".join(f"{column:>17}" for column in columns))
+    for result in results:
+        print(" | ".join(
+            f"{value:>17.2f}" if isinstance(value, float) else f"{str(value):>17}" for value in result.values()
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma separated input sizes in characters.")
+    parser.add_argument("--inputs", default=",".join(INPUTS), help="Comma separated inputs to run.")
+    parser.add_argument("--region", default="US", help="Region of numbers written without a country code.")
+    parser.add_argument("--legacy-max-size", type=int, default=100_000, help="Largest input to run the legacy regex on.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    _print_results(
+        [_benchmark(name, size, args) for name in args.inputs.split(",") for size in sizes], args.json
+    )
+
+
+if __name__ == "__main__":
+    main()